@@ -1,27 +1,38 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
-from flask_migrate import Migrate
 from flask_mail import Mail
+from flask.cli import with_appcontext
 from config import config
+import click
 import os
 
 # Initialize extensions
-db = SQLAlchemy()
+# Sessions route eligible reads to the optional ``replica`` bind
+from app.utils.db_routing import RoutingSession
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
-migrate = Migrate()
 mail = Mail()
 
-def create_app(config_name='default'):
+def create_app(config_name='default', overrides=None):
     app = Flask(__name__)
     
-    # Load configuration
+    # Load configuration; ``overrides`` lets tests point at their own databases
     app.config.from_object(config[config_name])
+    app.config.update(overrides or {})
+    
+    # Pool sizing, recycling and pre-ping come from the DB_POOL_* settings
+    from app.utils.db_pool import engine_options, pool_monitor
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
     
     # Initialize extensions with app
     db.init_app(app)
+    pool_monitor.init_app(app)
+    
+    # Read-replica routing; a no-op unless REPLICA_DATABASE_URL is set
+    from app.utils.db_routing import replica_monitor
+    replica_monitor.init_app(app)
     login_manager.init_app(app)
-    migrate.init_app(app, db)
     mail.init_app(app)
     
     # Configure login manager
@@ -29,11 +40,23 @@ def create_app(config_name='default'):
     login_manager.login_message = 'Please log in to access this page.'
     login_manager.login_message_category = 'info'
     
+    # Cache user snapshots for the login loader
+    from app.utils.user_cache import user_cache
+    user_cache.init_app(app)
+    
+    # Rendered fragments of {% cache %} blocks
+    from app.utils.fragment_cache import fragment_cache
+    fragment_cache.init_app(app)
+    
+    # Opt-in request profiling (PROFILING_ENABLED)
+    from app.utils.profiling import profiler
+    profiler.init_app(app)
+    
     # Create upload directory if it doesn't exist
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
     
     # Register blueprints (import here to avoid circular imports)
-    from app.routes import auth, dashboard, inspections, templates, reports, facilities
+    from app.routes import auth, dashboard, inspections, templates, reports, facilities, sync, photos, search, admin
     
     app.register_blueprint(auth.bp)
     app.register_blueprint(dashboard.bp)
@@ -41,9 +64,52 @@ def create_app(config_name='default'):
     app.register_blueprint(templates.bp)
     app.register_blueprint(reports.bp)
     app.register_blueprint(facilities.bp)
+    app.register_blueprint(sync.bp)
+    app.register_blueprint(photos.bp)
+    app.register_blueprint(search.bp)
+    app.register_blueprint(admin.bp)
+    
+    # Pages link to small photo derivatives through this helper
+    from app.services.photos import photo_url
+    app.jinja_env.globals['photo_url'] = photo_url
+    
+    # Rollup maintenance (importing registers the session listeners)
+    from app.services.rollups import rollups_cli
+    app.cli.add_command(rollups_cli)
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    from app.services.query_plans import explain_cli
+    app.cli.add_command(explain_cli)
     
-    return app
\ No newline at end of file
+    from app.services.scoring import scoring_cli
+    app.cli.add_command(scoring_cli)
+    
+    # Importing registers the schedule maintenance listener
+    from app.services.schedule import schedule_cli
+    app.cli.add_command(schedule_cli)
+    
+    # Importing registers the search index listener
+    from app.services.search import search_cli
+    app.cli.add_command(search_cli)
+    
+    # Importing registers the issue alert listener
+    from app.services.outbox import outbox_cli
+    app.cli.add_command(outbox_cli)
+    
+    # Schema changes only happen through explicit commands, never at start-up.
+    # Alembic is only loaded when the app is created by the flask CLI.
+    if app.config.get('LOAD_MIGRATIONS') or click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
+    app.cli.add_command(init_db_command)
+    
+    return app
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create all tables in an empty database and mark it as migrated."""
+    from flask_migrate import stamp
+    db.create_all()
+    stamp()
+    click.echo('Database initialised; apply later changes with "flask db upgrade".')
\ No newline at end of file
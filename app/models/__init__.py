@@ -2,3 +2,8 @@ from app.models.user import User
 from app.models.facility import Facility, Area
 from app.models.inspection import InspectionTemplate, ChecklistItem, Inspection, InspectionResult
 from app.models.issue import Issue
+from app.models.rollup import DailyRollup
+from app.models.change_log import ChangeLog
+from app.models.outbox import OutboundEmail
+from app.models.schedule import InspectionSchedule
+from app.models.search import SearchDocument
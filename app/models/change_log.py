@@ -0,0 +1,19 @@
+from app import db
+from datetime import datetime
+
+class ChangeLog(db.Model):
+    """Append-only log of catalog changes; ``id`` doubles as the sync token."""
+    __tablename__ = 'change_log'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(32), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.Enum('upsert', 'delete'), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_change_log_entity', 'entity_type', 'entity_id', 'id'),
+    )
+
+    def __repr__(self):
+        return f'<ChangeLog {self.id} {self.operation} {self.entity_type}:{self.entity_id}>'
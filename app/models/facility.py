@@ -1,11 +1,12 @@
 from app import db
+from app.utils.fragment_cache import fragment_cache
 from datetime import datetime
 
 class Facility(db.Model):
     __tablename__ = 'facilities'
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(255), nullable=False)
+    name = db.Column(db.String(255), nullable=False, index=True)
     address = db.Column(db.Text)
     contact_person = db.Column(db.String(100))
     contact_phone = db.Column(db.String(20))
@@ -22,7 +23,7 @@ class Area(db.Model):
     __tablename__ = 'areas'
 
     id = db.Column(db.Integer, primary_key=True)
-    facility_id = db.Column(db.Integer, db.ForeignKey('facilities.id'), nullable=False)
+    facility_id = db.Column(db.Integer, db.ForeignKey('facilities.id'), nullable=False, index=True)
     name = db.Column(db.String(255), nullable=False)
     area_type = db.Column(db.String(50))
 
@@ -32,3 +33,6 @@ class Area(db.Model):
 
     def __repr__(self):
         return f'<Area {self.name}>'
+
+fragment_cache.watch(Facility)
+fragment_cache.watch(Area, lambda area: ('Facility', area.facility_id))
@@ -1,20 +1,26 @@
 from app import db
+from app.utils.fragment_cache import fragment_cache
 from datetime import datetime
 
 class InspectionTemplate(db.Model):
     __tablename__ = 'inspection_templates'
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(255), nullable=False)
+    name = db.Column(db.String(255), nullable=False, index=True)
     description = db.Column(db.Text)
     frequency = db.Column(db.Enum('daily', 'weekly', 'monthly', 'quarterly'))
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     # Relationships
     checklist_items = db.relationship('ChecklistItem', backref='template', lazy='dynamic', cascade='all, delete-orphan')
     inspections = db.relationship('Inspection', backref='template', lazy='dynamic')
 
+    def bump_version(self):
+        # Evaluated in SQL at flush so concurrent edits never reuse a version
+        self.version = InspectionTemplate.version + 1
+
     def __repr__(self):
         return f'<InspectionTemplate {self.name}>'
 
@@ -22,7 +28,7 @@ class ChecklistItem(db.Model):
     __tablename__ = 'checklist_items'
 
     id = db.Column(db.Integer, primary_key=True)
-    template_id = db.Column(db.Integer, db.ForeignKey('inspection_templates.id'), nullable=False)
+    template_id = db.Column(db.Integer, db.ForeignKey('inspection_templates.id'), nullable=False, index=True)
     category = db.Column(db.String(100))
     item_description = db.Column(db.Text, nullable=False)
     scoring_type = db.Column(db.Enum('pass_fail', 'rating_5', 'rating_10'))
@@ -40,20 +46,39 @@ class Inspection(db.Model):
     __tablename__ = 'inspections'
 
     id = db.Column(db.Integer, primary_key=True)
-    template_id = db.Column(db.Integer, db.ForeignKey('inspection_templates.id'), nullable=False)
-    facility_id = db.Column(db.Integer, db.ForeignKey('facilities.id'), nullable=False)
-    area_id = db.Column(db.Integer, db.ForeignKey('areas.id'))
-    inspector_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    inspection_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
-    overall_score = db.Column(db.Numeric(5, 2))
-    status = db.Column(db.Enum('in_progress', 'completed', 'flagged'), default='in_progress')
+    # Columns feeding the daily rollups use active history: the listeners in
+    # app.services.rollups subtract the previous value, which must be loaded
+    # before a set overwrites it, even on an instance expired by a commit
+    template_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('inspection_templates.id'), nullable=False), active_history=True)
+    facility_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('facilities.id'), nullable=False), active_history=True)
+    area_id = db.column_property(db.Column(db.Integer, db.ForeignKey('areas.id')), active_history=True)
+    inspector_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False), active_history=True)
+    inspection_date = db.column_property(
+        db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True), active_history=True)
+    overall_score = db.column_property(db.Column(db.Numeric(5, 2)), active_history=True)
+    status = db.column_property(
+        db.Column(db.Enum('in_progress', 'completed', 'flagged'), default='in_progress'), active_history=True)
     notes = db.Column(db.Text)
     completed_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Idempotency key supplied by mobile clients so retried submissions are not duplicated;
+    # each inspector's device picks its own keys, so they are unique per inspector
+    client_key = db.Column(db.String(64))
 
     # Relationships
     results = db.relationship('InspectionResult', backref='inspection', lazy='dynamic', cascade='all, delete-orphan')
     issues = db.relationship('Issue', backref='inspection', lazy='dynamic')
 
+    # Composite indexes matching the dashboard filters
+    __table_args__ = (
+        db.Index('ix_inspections_inspector_date', 'inspector_id', 'inspection_date'),
+        db.Index('ix_inspections_status_date', 'status', 'inspection_date'),
+        db.UniqueConstraint('inspector_id', 'client_key', name='uq_inspections_inspector_client_key'),
+    )
+
     def __repr__(self):
         return f'<Inspection {self.id} - {self.inspection_date}>'
 
@@ -70,3 +95,6 @@ class InspectionResult(db.Model):
 
     def __repr__(self):
         return f'<InspectionResult {self.id}>'
+
+fragment_cache.watch(InspectionTemplate)
+fragment_cache.watch(ChecklistItem, lambda item: ('InspectionTemplate', item.template_id))
@@ -5,14 +5,18 @@ class Issue(db.Model):
     __tablename__ = 'issues'
 
     id = db.Column(db.Integer, primary_key=True)
-    inspection_id = db.Column(db.Integer, db.ForeignKey('inspections.id'))
-    area_id = db.Column(db.Integer, db.ForeignKey('areas.id'), nullable=False)
+    # Columns feeding the daily rollups use active history so their previous
+    # value is loaded before a set overwrites it (see app.services.rollups)
+    inspection_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey('inspections.id'), index=True), active_history=True)
+    area_id = db.column_property(db.Column(db.Integer, db.ForeignKey('areas.id'), nullable=False), active_history=True)
     severity = db.Column(db.Enum('low', 'medium', 'high', 'critical'), nullable=False)
     description = db.Column(db.Text, nullable=False)
     photo_path = db.Column(db.String(255))
-    status = db.Column(db.Enum('open', 'in_progress', 'resolved'), default='open')
+    status = db.column_property(
+        db.Column(db.Enum('open', 'in_progress', 'resolved'), default='open', index=True), active_history=True)
     assigned_to = db.Column(db.Integer, db.ForeignKey('users.id'))
-    reported_at = db.Column(db.DateTime, default=datetime.utcnow)
+    reported_at = db.column_property(db.Column(db.DateTime, default=datetime.utcnow), active_history=True)
     resolved_at = db.Column(db.DateTime)
 
     def __repr__(self):
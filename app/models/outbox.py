@@ -0,0 +1,30 @@
+from app import db
+from datetime import datetime
+
+class OutboundEmail(db.Model):
+    """Transactional outbox: rows are written with the change that caused them
+    and delivered later by ``flask outbox`` commands."""
+    __tablename__ = 'outbound_emails'
+
+    id = db.Column(db.Integer, primary_key=True)
+    recipient = db.Column(db.String(255), nullable=False)
+    subject = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    kind = db.Column(db.String(50), nullable=False, default='notification')
+    issue_id = db.Column(db.Integer, db.ForeignKey('issues.id', ondelete='SET NULL'))
+    status = db.Column(db.Enum('pending', 'sent', 'failed'), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claim_token = db.Column(db.String(32))
+    locked_until = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.Index('ix_outbound_emails_due', 'status', 'next_attempt_at'),
+        db.Index('ix_outbound_emails_claim', 'claim_token'),
+    )
+
+    def __repr__(self):
+        return f'<OutboundEmail {self.id} to {self.recipient} ({self.status})>'
@@ -0,0 +1,34 @@
+from app import db
+
+class DailyRollup(db.Model):
+    """Per-day counters for inspections and issues.
+
+    Rows are derived data: they are maintained incrementally by
+    ``app.services.rollups`` and can be rebuilt with ``flask rollups rebuild``.
+    Missing dimensions (no area, issue without inspection) are stored as 0 so
+    the natural key stays unique.
+    """
+    __tablename__ = 'daily_rollups'
+
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    facility_id = db.Column(db.Integer, nullable=False, default=0)
+    area_id = db.Column(db.Integer, nullable=False, default=0)
+    inspector_id = db.Column(db.Integer, nullable=False, default=0)
+    template_id = db.Column(db.Integer, nullable=False, default=0)
+
+    inspection_count = db.Column(db.Integer, nullable=False, default=0)
+    completed_count = db.Column(db.Integer, nullable=False, default=0)
+    score_sum = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    score_count = db.Column(db.Integer, nullable=False, default=0)
+    open_issue_count = db.Column(db.Integer, nullable=False, default=0)
+    resolved_issue_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.UniqueConstraint('day', 'facility_id', 'area_id', 'inspector_id', 'template_id',
+                            name='uq_daily_rollups_key'),
+        db.Index('ix_daily_rollups_inspector_day', 'inspector_id', 'day'),
+    )
+
+    def __repr__(self):
+        return f'<DailyRollup {self.day} f={self.facility_id} a={self.area_id}>'
@@ -0,0 +1,39 @@
+from app import db
+
+class InspectionSchedule(db.Model):
+    """Latest completed inspection per (facility, area, template).
+
+    Rows are derived data maintained by ``app.services.schedule`` whenever an
+    inspection completes; ``next_due_at`` is precomputed from the template
+    frequency so due/overdue lookups are a single range scan. Inspections
+    without an area are stored with ``area_id`` 0. Rebuild with
+    ``flask schedule rebuild``.
+    """
+    __tablename__ = 'inspection_schedules'
+
+    id = db.Column(db.Integer, primary_key=True)
+    facility_id = db.Column(db.Integer, nullable=False)
+    area_id = db.Column(db.Integer, nullable=False, default=0)
+    template_id = db.Column(db.Integer, nullable=False)
+    last_inspection_id = db.Column(db.Integer, nullable=False)
+    last_inspector_id = db.Column(db.Integer, nullable=False)
+    last_completed_at = db.Column(db.DateTime, nullable=False)
+    next_due_at = db.Column(db.DateTime)
+
+    facility = db.relationship('Facility', viewonly=True,
+                               primaryjoin='foreign(InspectionSchedule.facility_id) == Facility.id')
+    area = db.relationship('Area', viewonly=True,
+                           primaryjoin='foreign(InspectionSchedule.area_id) == Area.id')
+    template = db.relationship('InspectionTemplate', viewonly=True,
+                               primaryjoin='foreign(InspectionSchedule.template_id) == InspectionTemplate.id')
+    last_inspector = db.relationship('User', viewonly=True,
+                                     primaryjoin='foreign(InspectionSchedule.last_inspector_id) == User.id')
+
+    __table_args__ = (
+        db.UniqueConstraint('facility_id', 'area_id', 'template_id', name='uq_inspection_schedules_key'),
+        db.Index('ix_inspection_schedules_due', 'next_due_at'),
+        db.Index('ix_inspection_schedules_inspector_due', 'last_inspector_id', 'next_due_at'),
+    )
+
+    def __repr__(self):
+        return f'<InspectionSchedule f={self.facility_id} a={self.area_id} t={self.template_id}>'
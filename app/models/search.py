@@ -0,0 +1,54 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import event, text
+import logging
+
+logger = logging.getLogger(__name__)
+
+class SearchDocument(db.Model):
+    """One searchable row per indexed entity.
+
+    Maintained by ``app.services.search``. MySQL searches it through a
+    FULLTEXT index; SQLite mirrors it into the ``search_fts`` FTS5 table
+    (same rowid) when FTS5 is available.
+    """
+    __tablename__ = 'search_documents'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(30), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    # Owning facility/template used to link results that have no page of their own
+    parent_id = db.Column(db.Integer)
+    title = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('entity_type', 'entity_id', name='uq_search_documents_entity'),
+    )
+
+    def __repr__(self):
+        return f'<SearchDocument {self.entity_type}:{self.entity_id}>'
+
+
+FTS_TABLE = 'search_fts'
+CREATE_FTS = f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, body, tokenize='porter unicode61')"
+CREATE_FULLTEXT = 'CREATE FULLTEXT INDEX ix_search_documents_fulltext ON search_documents (title, body)'
+
+
+@event.listens_for(SearchDocument.__table__, 'after_create')
+def _create_text_index(target, connection, **kw):
+    if connection.dialect.name in ('mysql', 'mariadb'):
+        connection.execute(text(CREATE_FULLTEXT))
+    elif connection.dialect.name == 'sqlite':
+        try:
+            connection.execute(text(CREATE_FTS))
+        except Exception as e:
+            # SQLite built without FTS5: searches fall back to LIKE matching
+            logger.warning('FTS5 unavailable, search will use LIKE scans: %s', e)
+
+
+@event.listens_for(SearchDocument.__table__, 'after_drop')
+def _drop_text_index(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text(f'DROP TABLE IF EXISTS {FTS_TABLE}'))
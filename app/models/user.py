@@ -1,11 +1,13 @@
 from app import db, login_manager
+from app.utils.user_cache import user_cache
+from app.utils.fragment_cache import fragment_cache
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    return user_cache.load(User, int(user_id))
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
@@ -28,3 +30,6 @@ class User(UserMixin, db.Model):
 
     def __repr__(self):
         return f'<User {self.username}>'
+
+user_cache.watch(User)
+fragment_cache.watch(User)
@@ -0,0 +1,31 @@
+from flask import Blueprint, jsonify, current_app
+from flask_login import login_required
+from app.utils.decorators import admin_required
+from app import db
+from app.utils.profiling import profiler
+from app.utils.db_pool import pool_monitor
+
+bp = Blueprint('admin', __name__, url_prefix='/admin')
+
+@bp.route('/profiling')
+@login_required
+@admin_required
+def profiling():
+    return jsonify({
+        'enabled': bool(current_app.config.get('PROFILING_ENABLED')),
+        'window': current_app.config.get('PROFILING_WINDOW', 1000),
+        'endpoints': profiler.summary()
+    })
+
+@bp.route('/profiling/reset', methods=['POST'])
+@login_required
+@admin_required
+def reset_profiling():
+    profiler.reset()
+    return jsonify({'success': True})
+
+@bp.route('/pool')
+@login_required
+@admin_required
+def pool():
+    return jsonify(pool_monitor.status(db.engine))
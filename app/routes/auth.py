@@ -4,6 +4,7 @@ from app import db
 from app.models.user import User
 from app.utils.forms import LoginForm, UserForm
 from app.utils.decorators import admin_required
+from app.utils.pagination import paginate_keyset
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -37,8 +38,9 @@ def logout():
 @login_required
 @admin_required
 def list_users():
-    users = User.query.order_by(User.created_at.desc()).all()
-    return render_template('auth/users.html', users=users)
+    # Newest first; ids follow creation order and, unlike created_at, are never NULL
+    page = paginate_keyset(User.query, [User.id], descending=True)
+    return render_template('auth/users.html', users=page.items, page=page)
 
 @bp.route('/users/new', methods=['GET', 'POST'])
 @login_required
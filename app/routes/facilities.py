@@ -4,14 +4,31 @@ from app import db
 from app.models.facility import Facility, Area
 from app.utils.forms import FacilityForm, AreaForm
 from app.utils.decorators import supervisor_required
+from app.utils.pagination import paginate_keyset
+from app.utils.db_routing import replica_reads
+from app.utils.http_cache import conditional
+from app.services.versions import catalog_version, facility_version, entity_changes
+from sqlalchemy import func
 
 bp = Blueprint('facilities', __name__, url_prefix='/facilities')
 
 @bp.route('/')
+@replica_reads
 @login_required
+@conditional(catalog_version)
 def list_facilities():
-    facilities = Facility.query.order_by(Facility.name).all()
-    return render_template('facilities/list.html', facilities=facilities)
+    # Area counts and card versions are correlated subqueries, evaluated only for rows on the page
+    area_count = db.session.query(func.count(Area.id))\
+        .filter(Area.facility_id == Facility.id).correlate(Facility).scalar_subquery()
+    version = entity_changes('facility', Facility.id).correlate(Facility)
+    
+    page = paginate_keyset(db.session.query(Facility, area_count, version), [Facility.name, Facility.id])
+    
+    facilities = [facility for facility, _, _ in page]
+    area_counts = {facility.id: count for facility, count, _ in page}
+    versions = {facility.id: version for facility, _, version in page}
+    return render_template('facilities/list.html', facilities=facilities, area_counts=area_counts,
+                           versions=versions, page=page)
 
 @bp.route('/new', methods=['GET', 'POST'])
 @login_required
@@ -37,7 +54,9 @@ def create_facility():
     return render_template('facilities/form.html', form=form, title='Create Facility')
 
 @bp.route('/<int:facility_id>')
+@replica_reads
 @login_required
+@conditional(facility_version)
 def view_facility(facility_id):
     facility = Facility.query.get_or_404(facility_id)
     areas = facility.areas.order_by(Area.name).all()
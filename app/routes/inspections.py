@@ -1,7 +1,71 @@
-from flask import Blueprint
+from flask import Blueprint, render_template, request, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import select, func
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models.inspection import Inspection, InspectionResult
+from app.models.schedule import InspectionSchedule
+from app.utils.pagination import paginate_keyset
+from app.services.submissions import submit_inspection, SubmissionError
+from app.services.schedule import due_query
+from app.utils.db_routing import replica_reads
+from datetime import datetime
 
 bp = Blueprint('inspections', __name__, url_prefix='/inspections')
 
+def _photos(inspection_ids):
+    """Map inspection id -> (one photo reference, photo count) in a single query."""
+    if not inspection_ids:
+        return {}
+    rows = db.session.execute(
+        select(InspectionResult.inspection_id, func.min(InspectionResult.photo_path),
+               func.count(InspectionResult.photo_path))
+        .where(InspectionResult.inspection_id.in_(inspection_ids), InspectionResult.photo_path.isnot(None))
+        .group_by(InspectionResult.inspection_id)
+    )
+    return {row[0]: (row[1], row[2]) for row in rows}
+
 @bp.route('/')
+@replica_reads
+@login_required
 def index():
-    return "Inspections module - Coming in Phase 2"
+    query = Inspection.query.options(
+        joinedload(Inspection.facility),
+        joinedload(Inspection.area),
+        joinedload(Inspection.inspector)
+    )
+    if current_user.role == 'inspector':
+        query = query.filter(Inspection.inspector_id == current_user.id)
+    
+    page = paginate_keyset(query, [Inspection.inspection_date, Inspection.id], descending=True)
+    return render_template('inspections/list.html', inspections=page.items, page=page,
+                           photos=_photos([inspection.id for inspection in page.items]))
+
+@bp.route('/due')
+@replica_reads
+@login_required
+def due():
+    now = datetime.utcnow()
+    page = paginate_keyset(due_query(current_user, now),
+                           [InspectionSchedule.next_due_at, InspectionSchedule.id])
+    return render_template('inspections/due.html', schedules=page.items, page=page, now=now)
+
+@bp.route('/api/submit', methods=['POST'])
+@login_required
+def submit():
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict) and 'client_key' not in payload and request.headers.get('Idempotency-Key'):
+        payload['client_key'] = request.headers['Idempotency-Key']
+    
+    try:
+        inspection, created = submit_inspection(payload, current_user)
+    except SubmissionError as e:
+        return jsonify({'success': False, 'errors': e.errors}), 400
+    
+    return jsonify({
+        'success': True,
+        'inspection_id': inspection.id,
+        'overall_score': float(inspection.overall_score) if inspection.overall_score is not None else None,
+        'result_count': inspection.results.count(),
+        'replayed': not created
+    }), 201 if created else 200
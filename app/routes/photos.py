@@ -0,0 +1,47 @@
+from flask import Blueprint, request, jsonify, send_file, abort, current_app
+from flask_login import login_required
+from app.services.photos import photo_pipeline, parse_reference, photo_url, PhotoError
+
+bp = Blueprint('photos', __name__, url_prefix='/photos')
+
+@bp.route('/upload', methods=['POST'])
+@login_required
+def upload():
+    # Multipart uploads are spooled to disk by Werkzeug; raw bodies are read straight from the socket
+    stream = request.files['photo'].stream if 'photo' in request.files else request.stream
+    
+    try:
+        reference, duplicate = photo_pipeline.store(stream)
+    except PhotoError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'photo_path': reference,
+        'duplicate': duplicate,
+        'thumbnail_url': photo_url(reference)
+    }), 200 if duplicate else 201
+
+@bp.route('/<reference>')
+@login_required
+def serve(reference):
+    # Only derivatives are served: originals still carry EXIF/GPS metadata
+    size = request.args.get('size', 'thumb')
+    if size not in current_app.config.get('PHOTO_SIZES', {}):
+        abort(404)
+    
+    try:
+        parse_reference(reference)
+    except PhotoError:
+        abort(404)
+    
+    path = photo_pipeline.resolve(reference, size)
+    if path is None:
+        if photo_pipeline.is_pending(reference):
+            response = jsonify({'success': False, 'error': 'The photo is still being processed.'})
+            response.status_code = 503
+            response.headers['Retry-After'] = str(current_app.config.get('PHOTO_WAIT_SECONDS', 5))
+            return response
+        abort(404)
+    # Content-addressed files never change, so browsers may cache them for good
+    return send_file(path, max_age=31536000, conditional=True)
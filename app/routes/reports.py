@@ -1,7 +1,105 @@
-from flask import Blueprint
+from flask import Blueprint, Response, render_template, request, stream_with_context, abort, send_file, jsonify, current_app
+from flask_login import login_required, current_user
+from app.models.facility import Facility
+from app.models.inspection import Inspection, InspectionTemplate
+from app.services.pdf_reports import report_renderer
+from app.services.trends import parse_trend_args, get_trend
+from app.services.exports import parse_export_filters, iter_export_rows, stream_csv, EXPORT_HEADER
+from app.utils.decorators import supervisor_required
+from app.utils.xlsx_stream import stream_xlsx
+from app.utils.db_routing import replica_reads
+from concurrent.futures import TimeoutError
+from datetime import datetime
 
 bp = Blueprint('reports', __name__, url_prefix='/reports')
 
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
 @bp.route('/')
+@replica_reads
+@login_required
 def index():
-    return "Reports module - Coming in Phase 2"
+    facilities = Facility.query.filter_by(active=True).order_by(Facility.name).all()
+    templates = InspectionTemplate.query.order_by(InspectionTemplate.name).all()
+    return render_template('reports/index.html', facilities=facilities, templates=templates)
+
+@bp.route('/export.<fmt>')
+@replica_reads
+@login_required
+@supervisor_required
+def export(fmt):
+    if fmt not in ('csv', 'xlsx'):
+        abort(404)
+    
+    try:
+        filters = parse_export_filters(request.args)
+    except ValueError as e:
+        abort(400, description=str(e))
+    
+    filename = f'inspections-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}'
+    rows = iter_export_rows(filters)
+    
+    # Rows are pulled from a server-side cursor while the response is written
+    if fmt == 'csv':
+        body, mimetype = stream_csv(rows), 'text/csv'
+    else:
+        body, mimetype = stream_xlsx(EXPORT_HEADER, rows, sheet_name='Inspections'), XLSX_MIMETYPE
+    
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+
+@bp.route('/trends')
+@replica_reads
+@login_required
+@supervisor_required
+def trends():
+    try:
+        params = parse_trend_args(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    return jsonify({'success': True, **get_trend(params)})
+
+
+def _pending_response(ready, total):
+    response = jsonify({'status': 'pending', 'ready': ready, 'total': total})
+    response.status_code = 202
+    response.headers['Retry-After'] = str(current_app.config.get('REPORT_RETRY_AFTER', 2))
+    return response
+
+@bp.route('/inspections/<int:inspection_id>.pdf')
+@login_required
+def inspection_pdf(inspection_id):
+    inspection = Inspection.query.get_or_404(inspection_id)
+    if current_user.role == 'inspector' and inspection.inspector_id != current_user.id:
+        abort(403)
+    
+    path, future = report_renderer.ensure(inspection)
+    if future is not None:
+        # Short renders are served directly; long ones are polled so the worker is released
+        try:
+            future.result(timeout=current_app.config.get('REPORT_WAIT_SECONDS', 3))
+        except TimeoutError:
+            return _pending_response(0, 1)
+    
+    return send_file(path, mimetype='application/pdf', download_name=f'inspection-{inspection.id}.pdf')
+
+@bp.route('/facilities/<int:facility_id>/bundle')
+@login_required
+@supervisor_required
+def facility_bundle(facility_id):
+    facility = Facility.query.get_or_404(facility_id)
+    try:
+        month_start = datetime.strptime(request.args.get('month', ''), '%Y-%m')
+    except ValueError:
+        abort(400, description='month must be YYYY-MM.')
+    month_end = month_start.replace(year=month_start.year + month_start.month // 12,
+                                    month=month_start.month % 12 + 1)
+    
+    path, ready, total = report_renderer.bundle(facility.id, month_start, month_end)
+    if path is None:
+        return _pending_response(ready, total)
+    
+    return send_file(path, mimetype='application/zip',
+                     download_name=f'{facility.name}-{month_start:%Y-%m}-inspections.zip')
@@ -0,0 +1,61 @@
+from flask import Blueprint, render_template, request, jsonify, url_for, abort
+from flask_login import login_required
+from app.models.search import SearchDocument
+from app.services.search import search, ENTITY_TYPES
+from app.utils.pagination import KeysetPage, encode_cursor, decode_cursor, get_per_page
+from app.utils.db_routing import replica_reads
+
+bp = Blueprint('search', __name__, url_prefix='/search')
+
+def _result_url(result):
+    if result['entity_type'] == 'facility':
+        return url_for('facilities.view_facility', facility_id=result['entity_id'])
+    if result['entity_type'] == 'area':
+        return url_for('facilities.view_facility', facility_id=result['parent_id'])
+    if result['entity_type'] == 'template':
+        return url_for('templates.view_template', template_id=result['entity_id'])
+    if result['entity_type'] == 'checklist_item':
+        return url_for('templates.view_template', template_id=result['parent_id'])
+    return None
+
+def _run_search():
+    query = request.args.get('q', '').strip()
+    entity_types = [t for t in request.args.get('type', '').split(',') if t in ENTITY_TYPES]
+    per_page = get_per_page()
+    
+    # Relevance order has no stable seek key, so the cursor carries an offset
+    offset = 0
+    cursor = request.args.get('cursor')
+    if cursor:
+        offset = decode_cursor(cursor, [SearchDocument.id])[1][0]
+        if type(offset) is not int or offset < 0:
+            abort(400, description='Invalid pagination cursor.')
+    
+    results, has_more = search(query, entity_types, offset, per_page)
+    for result in results:
+        result['url'] = _result_url(result)
+    
+    next_cursor = encode_cursor('next', [offset + per_page]) if has_more else None
+    prev_cursor = encode_cursor('prev', [max(0, offset - per_page)]) if offset else None
+    return query, entity_types, KeysetPage(results, next_cursor, prev_cursor, per_page)
+
+@bp.route('/')
+@replica_reads
+@login_required
+def index():
+    query, entity_types, page = _run_search()
+    return render_template('search/results.html', query=query, entity_types=entity_types,
+                           results=page.items, page=page)
+
+@bp.route('/api')
+@replica_reads
+@login_required
+def api():
+    query, entity_types, page = _run_search()
+    return jsonify({
+        'success': True,
+        'query': query,
+        'results': page.items,
+        'next_cursor': page.next_cursor,
+        'prev_cursor': page.prev_cursor
+    })
@@ -0,0 +1,68 @@
+from flask import Blueprint, request, jsonify, current_app
+from flask_login import login_required, current_user
+from app import db
+from app.services.sync import build_snapshot, build_delta
+from app.services.submissions import submit_inspection, SubmissionError
+from app.services.versions import catalog_version
+from app.utils.http_cache import conditional
+from sqlalchemy.exc import SQLAlchemyError
+
+bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+@bp.route('/snapshot')
+@login_required
+@conditional(catalog_version)
+def snapshot():
+    return jsonify(build_snapshot())
+
+@bp.route('/changes')
+@login_required
+@conditional(catalog_version)
+def changes():
+    since = request.args.get('since', type=int)
+    if since is None or since < 0:
+        return jsonify({'success': False, 'error': 'since must be a sync token.'}), 400
+    
+    max_changes = current_app.config.get('SYNC_MAX_CHANGES', 5000)
+    limit = max(1, min(request.args.get('limit', max_changes, type=int), max_changes))
+    return jsonify(build_delta(since, limit))
+
+@bp.route('/inspections', methods=['POST'])
+@login_required
+def upload_inspections():
+    payload = request.get_json(silent=True) or {}
+    queued = payload.get('inspections')
+    max_batch = current_app.config.get('SYNC_MAX_BATCH', 100)
+    
+    if not isinstance(queued, list):
+        return jsonify({'success': False, 'error': 'inspections must be a list.'}), 400
+    if len(queued) > max_batch:
+        return jsonify({'success': False, 'error': f'At most {max_batch} inspections per request.'}), 413
+    
+    # Each inspection commits on its own so one bad entry doesn't block the queue
+    results = []
+    for entry in queued:
+        client_key = entry.get('client_key') if isinstance(entry, dict) else None
+        if not client_key:
+            results.append({'client_key': None, 'success': False, 'errors': ['client_key is required for sync.']})
+            continue
+        try:
+            inspection, created = submit_inspection(entry, current_user)
+        except SubmissionError as e:
+            results.append({'client_key': client_key, 'success': False, 'errors': e.errors})
+            continue
+        except SQLAlchemyError:
+            # Report the entry and keep going, or the device would replay the same batch forever
+            db.session.rollback()
+            current_app.logger.exception('Sync upload of %s failed', client_key)
+            results.append({'client_key': client_key, 'success': False,
+                            'errors': ['The inspection could not be stored.']})
+            continue
+        results.append({
+            'client_key': client_key,
+            'success': True,
+            'inspection_id': inspection.id,
+            'replayed': not created
+        })
+    
+    return jsonify({'success': all(r['success'] for r in results), 'results': results})
@@ -3,15 +3,33 @@ from flask_login import login_required, current_user
 from app import db
 from app.models.inspection import InspectionTemplate, ChecklistItem
 from app.utils.forms import InspectionTemplateForm, ChecklistItemForm
+from app.services import checklist_order
+from app.services.template_cache import template_cache
 from app.utils.decorators import supervisor_required
+from app.utils.pagination import paginate_keyset
+from app.utils.db_routing import replica_reads
+from app.utils.http_cache import conditional
+from app.services.versions import catalog_version, template_version
+from sqlalchemy import func
 
 bp = Blueprint('templates', __name__, url_prefix='/templates')
 
 @bp.route('/')
+@replica_reads
 @login_required
+@conditional(catalog_version)
 def index():
-    templates = InspectionTemplate.query.order_by(InspectionTemplate.name).all()
-    return render_template('templates/list.html', templates=templates)
+    # Item counts are a correlated subquery, evaluated only for rows on the page
+    item_count = db.session.query(func.count(ChecklistItem.id))\
+        .filter(ChecklistItem.template_id == InspectionTemplate.id)\
+        .correlate(InspectionTemplate).scalar_subquery()
+    
+    page = paginate_keyset(db.session.query(InspectionTemplate, item_count),
+                           [InspectionTemplate.name, InspectionTemplate.id])
+    
+    templates = [template for template, _ in page]
+    item_counts = {template.id: count for template, count in page}
+    return render_template('templates/list.html', templates=templates, item_counts=item_counts, page=page)
 
 @bp.route('/new', methods=['GET', 'POST'])
 @login_required
@@ -36,20 +54,15 @@ def create_template():
     return render_template('templates/form.html', form=form, title='Create Inspection Template')
 
 @bp.route('/<int:template_id>')
+@replica_reads
 @login_required
+@conditional(template_version)
 def view_template(template_id):
     template = InspectionTemplate.query.get_or_404(template_id)
-    checklist_items = template.checklist_items.order_by(ChecklistItem.display_order, ChecklistItem.category).all()
-    
-    # Group items by category
-    items_by_category = {}
-    for item in checklist_items:
-        category = item.category or 'General'
-        if category not in items_by_category:
-            items_by_category[category] = []
-        items_by_category[category].append(item)
+    compiled = template_cache.get(template)
     
-    return render_template('templates/view.html', template=template, items_by_category=items_by_category)
+    return render_template('templates/view.html', template=template,
+                           items_by_category=compiled.items_by_category, item_count=compiled.item_count)
 
 @bp.route('/<int:template_id>/edit', methods=['GET', 'POST'])
 @login_required
@@ -62,12 +75,14 @@ def edit_template(template_id):
         template.name = form.name.data
         template.description = form.description.data
         template.frequency = form.frequency.data
+        template.bump_version()
         
         db.session.commit()
+        template_cache.invalidate(template.id)
         flash(f'Template "{template.name}" updated successfully.', 'success')
         return redirect(url_for('templates.view_template', template_id=template.id))
     
-    checklist_items = template.checklist_items.order_by(ChecklistItem.display_order, ChecklistItem.category).all()
+    checklist_items = template_cache.get(template).items
     
     return render_template('templates/edit.html', form=form, template=template, checklist_items=checklist_items)
 
@@ -85,6 +100,7 @@ def delete_template(template_id):
     template_name = template.name
     db.session.delete(template)
     db.session.commit()
+    template_cache.invalidate(template_id)
     
     flash(f'Template "{template_name}" deleted successfully.', 'success')
     return redirect(url_for('templates.index'))
@@ -114,7 +130,9 @@ def create_checklist_item(template_id):
         )
         
         db.session.add(item)
+        template.bump_version()
         db.session.commit()
+        template_cache.invalidate(template.id)
         
         flash('Checklist item added successfully.', 'success')
         return redirect(url_for('templates.edit_template', template_id=template.id))
@@ -134,8 +152,10 @@ def edit_checklist_item(item_id):
         item.scoring_type = form.scoring_type.data
         item.weight = form.weight.data
         item.requires_photo = form.requires_photo.data
+        item.template.bump_version()
         
         db.session.commit()
+        template_cache.invalidate(item.template_id)
         flash('Checklist item updated successfully.', 'success')
         return redirect(url_for('templates.edit_template', template_id=item.template_id))
     
@@ -148,8 +168,10 @@ def delete_checklist_item(item_id):
     item = ChecklistItem.query.get_or_404(item_id)
     template_id = item.template_id
     
+    item.template.bump_version()
     db.session.delete(item)
     db.session.commit()
+    template_cache.invalidate(template_id)
     
     flash('Checklist item deleted successfully.', 'success')
     return redirect(url_for('templates.edit_template', template_id=template_id))
@@ -159,12 +181,23 @@ def delete_checklist_item(item_id):
 @supervisor_required
 def reorder_items(template_id):
     template = InspectionTemplate.query.get_or_404(template_id)
-    item_order = request.json.get('item_order', [])
-    
-    for index, item_id in enumerate(item_order):
-        item = ChecklistItem.query.get(item_id)
-        if item and item.template_id == template.id:
-            item.display_order = index
-    
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'success': False, 'error': 'Expected a JSON object.'}), 400
+    
+    try:
+        if 'item_id' in data:
+            # Partial move: only the items between the old and new slot are rewritten
+            updated = checklist_order.move_item(template.id, int(data['item_id']), int(data.get('position', 0)))
+            if updated is None:
+                return jsonify({'success': False, 'error': 'Item not found in template.'}), 404
+        else:
+            updated = checklist_order.reorder_items(template.id, data.get('item_order', []))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'Invalid item order.'}), 400
+    
+    if updated:
+        template.bump_version()
     db.session.commit()
-    return jsonify({'success': True})
\ No newline at end of file
+    template_cache.invalidate(template.id)
+    return jsonify({'success': True, 'updated': updated})
\ No newline at end of file
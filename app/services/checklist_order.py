@@ -0,0 +1,75 @@
+from app import db
+from app.models.inspection import ChecklistItem
+from app.services.sync import record_changes
+from app.services.template_cache import ITEM_ORDER
+from sqlalchemy import select, update, case
+
+
+def _write_orders(template_id, new_orders):
+    """Write ``{item_id: display_order}`` in a single CASE-based UPDATE."""
+    if not new_orders:
+        return 0
+    table = ChecklistItem.__table__
+    db.session.execute(
+        update(table)
+        .where(table.c.template_id == template_id, table.c.id.in_(new_orders))
+        .values(display_order=case(new_orders, value=table.c.id))
+    )
+    # The bulk UPDATE skips the session listeners, so log the change for device sync
+    record_changes(db.session.connection(), 'checklist_item', list(new_orders))
+    return len(new_orders)
+
+
+def reorder_items(template_id, item_order):
+    """Apply a full ordering; ids outside the template are ignored.
+
+    Ownership and current positions come from one ``IN`` query, and only rows
+    whose position actually changes are written.
+    """
+    item_ids = [int(item_id) for item_id in item_order]
+    table = ChecklistItem.__table__
+    current = dict(db.session.execute(
+        select(table.c.id, table.c.display_order)
+        .where(table.c.template_id == template_id, table.c.id.in_(item_ids))
+    ).all()) if item_ids else {}
+
+    # Numbered from 1, like newly created items
+    new_orders = {item_id: position for position, item_id in enumerate(item_ids, 1)
+                  if item_id in current and current[item_id] != position}
+    return _write_orders(template_id, new_orders)
+
+
+def move_item(template_id, item_id, position):
+    """Move one item to ``position`` (0-based, as listed in the editor).
+
+    Only the items between the old and the new slot are rewritten: they take
+    over the ``display_order`` values already used in that range, so the
+    numbering elsewhere (gaps left by deletions included) stays as it is.
+    Ties or missing values cannot express the new order; only then is the
+    whole template renumbered from 1.
+    """
+    table = ChecklistItem.__table__
+    rows = db.session.execute(
+        select(table.c.id, table.c.display_order)
+        .where(table.c.template_id == template_id)
+        .order_by(*ITEM_ORDER)
+    ).all()
+    ordered = [row.id for row in rows]
+    if item_id not in ordered:
+        return None
+
+    old = ordered.index(item_id)
+    new = max(0, min(position, len(ordered) - 1))
+    ordered.insert(new, ordered.pop(old))
+
+    slots = [row.display_order for row in rows]
+    if None in slots or any(a >= b for a, b in zip(slots, slots[1:])):
+        slots = list(range(1, len(ordered) + 1))
+        affected = range(len(ordered))
+    else:
+        affected = range(min(old, new), max(old, new) + 1)
+
+    current = dict(rows)
+    new_orders = {ordered[index]: slots[index] for index in affected
+                  if current[ordered[index]] != slots[index]}
+    return _write_orders(template_id, new_orders)
@@ -0,0 +1,90 @@
+from app import db
+from app.models.inspection import Inspection, InspectionTemplate
+from app.models.facility import Facility
+from app.models.issue import Issue
+from app.models.user import User
+from app.services.schedule import overdue_count
+from sqlalchemy import func, case, and_, literal
+from sqlalchemy.orm import joinedload
+from datetime import datetime, timedelta
+
+OPEN_ISSUE_STATUSES = ('open', 'in_progress')
+
+
+def get_dashboard_stats(user, now=None):
+    """Compute every dashboard counter for ``user`` in a single SELECT.
+
+    The inspection counters are conditional aggregates over one scan of the
+    last 30 days; open issues and the admin/supervisor totals ride along as
+    scalar subqueries so the whole card row costs one round trip.
+    """
+    now = now or datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    today_end = today_start + timedelta(days=1)
+    thirty_days_ago = now - timedelta(days=30)
+
+    is_inspector = user.role == 'inspector'
+    is_staff = user.role in ['admin', 'supervisor']
+
+    is_today = and_(Inspection.inspection_date >= today_start,
+                    Inspection.inspection_date < today_end)
+    is_scored = and_(Inspection.status == 'completed',
+                     Inspection.overall_score.isnot(None),
+                     Inspection.inspection_date >= thirty_days_ago)
+
+    inspection_filters = [Inspection.inspection_date >= min(today_start, thirty_days_ago)]
+    if is_inspector:
+        inspection_filters.append(Inspection.inspector_id == user.id)
+
+    # Open issues are scoped through the owning inspection for inspectors
+    open_issues = db.session.query(func.count(Issue.id)).filter(Issue.status.in_(OPEN_ISSUE_STATUSES))
+    if is_inspector:
+        open_issues = open_issues.join(Inspection, Issue.inspection_id == Inspection.id)\
+            .filter(Inspection.inspector_id == user.id)
+
+    columns = [
+        func.count(case((is_today, 1))).label('today_inspections'),
+        func.count(case((and_(is_today, Inspection.status == 'completed'), 1))).label('completed_today'),
+        func.avg(case((is_scored, Inspection.overall_score))).label('avg_score'),
+        open_issues.scalar_subquery().label('open_issues'),
+        overdue_count(user, now).label('overdue_inspections'),
+    ]
+
+    if is_staff:
+        columns.append(db.session.query(func.count(Facility.id))
+                       .filter(Facility.active.is_(True)).scalar_subquery().label('total_facilities'))
+        columns.append(db.session.query(func.count(InspectionTemplate.id))
+                       .scalar_subquery().label('total_templates'))
+    else:
+        columns.append(literal(0).label('total_facilities'))
+        columns.append(literal(0).label('total_templates'))
+
+    if user.role == 'admin':
+        columns.append(db.session.query(func.count(User.id)).scalar_subquery().label('total_users'))
+    else:
+        columns.append(literal(0).label('total_users'))
+
+    row = db.session.query(*columns).select_from(Inspection).filter(*inspection_filters).one()
+
+    avg_score = row.avg_score
+    return {
+        'today_inspections': row.today_inspections or 0,
+        'completed_today': row.completed_today or 0,
+        'open_issues': row.open_issues or 0,
+        'overdue_inspections': row.overdue_inspections or 0,
+        'avg_score': round(avg_score, 2) if avg_score else None,
+        'total_facilities': row.total_facilities or 0,
+        'total_templates': row.total_templates or 0,
+        'total_users': row.total_users or 0,
+    }
+
+
+def get_recent_inspections(user, limit=5):
+    query = Inspection.query.options(
+        joinedload(Inspection.facility),
+        joinedload(Inspection.area),
+        joinedload(Inspection.inspector)
+    )
+    if user.role == 'inspector':
+        query = query.filter(Inspection.inspector_id == user.id)
+    return query.order_by(Inspection.inspection_date.desc()).limit(limit).all()
@@ -0,0 +1,102 @@
+from app import db
+from app.models.inspection import Inspection, InspectionResult, ChecklistItem, InspectionTemplate
+from app.models.facility import Facility, Area
+from app.models.user import User
+from sqlalchemy import select
+from datetime import datetime, timedelta
+import csv
+import io
+
+EXPORT_COLUMNS = (
+    ('inspection_id', Inspection.id),
+    ('inspection_date', Inspection.inspection_date),
+    ('status', Inspection.status),
+    ('overall_score', Inspection.overall_score),
+    ('facility', Facility.name),
+    ('area', Area.name),
+    ('inspector', User.username),
+    ('template', InspectionTemplate.name),
+    ('category', ChecklistItem.category),
+    ('item', ChecklistItem.item_description),
+    ('scoring_type', ChecklistItem.scoring_type),
+    ('weight', ChecklistItem.weight),
+    ('score', InspectionResult.score),
+    ('passed', InspectionResult.passed),
+    ('comments', InspectionResult.comments),
+    ('photo_path', InspectionResult.photo_path),
+)
+
+EXPORT_HEADER = [name for name, _ in EXPORT_COLUMNS]
+
+# Spreadsheets run CSV cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def parse_export_filters(args):
+    """Read facility/template/date-range filters from request args."""
+    filters = {
+        'facility_id': args.get('facility_id', type=int),
+        'template_id': args.get('template_id', type=int),
+        'start': None,
+        'end': None,
+    }
+    for key in ('start', 'end'):
+        value = args.get(key)
+        if value:
+            try:
+                filters[key] = datetime.strptime(value, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError(f'{key} must be a YYYY-MM-DD date.')
+    return filters
+
+
+def export_query(facility_id=None, template_id=None, start=None, end=None):
+    """One row per result; inspections without results still get a row."""
+    query = select(*[column for _, column in EXPORT_COLUMNS])\
+        .select_from(Inspection)\
+        .outerjoin(InspectionResult, InspectionResult.inspection_id == Inspection.id)\
+        .outerjoin(ChecklistItem, InspectionResult.checklist_item_id == ChecklistItem.id)\
+        .join(Facility, Inspection.facility_id == Facility.id)\
+        .outerjoin(Area, Inspection.area_id == Area.id)\
+        .join(User, Inspection.inspector_id == User.id)\
+        .join(InspectionTemplate, Inspection.template_id == InspectionTemplate.id)
+
+    if facility_id:
+        query = query.where(Inspection.facility_id == facility_id)
+    if template_id:
+        query = query.where(Inspection.template_id == template_id)
+    if start:
+        query = query.where(Inspection.inspection_date >= start)
+    if end:
+        # The end date is inclusive
+        query = query.where(Inspection.inspection_date < end + timedelta(days=1))
+
+    return query.order_by(Inspection.inspection_date, Inspection.id, ChecklistItem.display_order, ChecklistItem.id)
+
+
+def iter_export_rows(filters, batch_size=1000):
+    """Yield export rows through a server-side cursor, ``batch_size`` at a time."""
+    result = db.session.execute(
+        export_query(**filters).execution_options(stream_results=True, yield_per=batch_size))
+    for row in result:
+        yield tuple(row)
+
+
+def _csv_cell(value):
+    # A leading quote makes the spreadsheet show the text instead of running it
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows, flush_every=500):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADER)
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_csv_cell(value) for value in row])
+        if count % flush_every == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
@@ -0,0 +1,199 @@
+from app import db, mail
+from app.models.issue import Issue
+from app.models.facility import Facility, Area
+from app.models.user import User
+from app.models.outbox import OutboundEmail
+from flask import current_app
+from flask.cli import AppGroup
+from flask_mail import Message
+from sqlalchemy import event, select, insert, update, or_, and_
+from sqlalchemy.orm import attributes
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import click
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+ALERT_SEVERITIES = ('high', 'critical')
+
+outbox_cli = AppGroup('outbox', help='Deliver queued email.')
+
+# When this process last handed a message to the SMTP server; kept across
+# send_pending calls so back-to-back batches still respect the rate limit
+_last_send = 0.0
+
+
+def _alert_needed(session, issue):
+    if issue.severity not in ALERT_SEVERITIES or not issue.assigned_to:
+        return False
+    if issue in session.new:
+        return True
+    # Existing issues alert when they are (re)assigned or escalated
+    return attributes.get_history(issue, 'assigned_to').has_changes() or \
+        attributes.get_history(issue, 'severity').has_changes()
+
+
+@event.listens_for(db.session, 'after_flush')
+def _queue_issue_alerts(session, flush_context):
+    issues = [obj for obj in list(session.new) + list(session.dirty)
+              if isinstance(obj, Issue) and _alert_needed(session, obj)]
+    if not issues:
+        return
+
+    connection = session.connection()
+    user_ids = {issue.assigned_to for issue in issues}
+    area_ids = {issue.area_id for issue in issues}
+    emails = dict(connection.execute(select(User.id, User.email).where(User.id.in_(user_ids))).all())
+    places = {row.id: row for row in connection.execute(
+        select(Area.id, Area.name, Facility.name.label('facility'))
+        .join(Facility, Area.facility_id == Facility.id).where(Area.id.in_(area_ids)))}
+
+    # Hold alerts for the digest window so bursts to one person coalesce
+    send_after = datetime.utcnow() + timedelta(seconds=current_app.config.get('MAIL_DIGEST_WINDOW', 60))
+    rows = []
+    for issue in issues:
+        if issue.assigned_to not in emails:
+            continue
+        place = places.get(issue.area_id)
+        location = f'{place.facility} / {place.name}' if place else f'area {issue.area_id}'
+        rows.append({
+            'recipient': emails[issue.assigned_to],
+            'subject': f'[Janitorial QC] {issue.severity.upper()} issue at {location}',
+            'body': f'Severity: {issue.severity}\nLocation: {location}\n\n{issue.description}',
+            'kind': 'issue_alert',
+            'issue_id': issue.id,
+            'status': 'pending',
+            'attempts': 0,
+            'next_attempt_at': send_after,
+            'created_at': datetime.utcnow(),
+        })
+    if rows:
+        connection.execute(insert(OutboundEmail.__table__), rows)
+
+
+def queue_email(recipient, subject, body, kind='notification', send_after=None):
+    """Add a message to the outbox; it is sent when the surrounding transaction commits."""
+    message = OutboundEmail(recipient=recipient, subject=subject, body=body, kind=kind,
+                            next_attempt_at=send_after or datetime.utcnow())
+    db.session.add(message)
+    return message
+
+
+def _claim(limit, now):
+    """Lease up to ``limit`` due messages so concurrent senders never share one."""
+    table = OutboundEmail.__table__
+    lease = timedelta(seconds=current_app.config.get('MAIL_CLAIM_LEASE', 300))
+    due = and_(table.c.status == 'pending', table.c.next_attempt_at <= now,
+               or_(table.c.locked_until.is_(None), table.c.locked_until < now))
+    ids = db.session.execute(select(table.c.id).where(due).order_by(table.c.id).limit(limit)).scalars().all()
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    db.session.execute(update(table).where(table.c.id.in_(ids), due)
+                       .values(claim_token=token, locked_until=now + lease))
+    db.session.commit()
+    return OutboundEmail.query.filter_by(claim_token=token).order_by(OutboundEmail.id).all()
+
+
+def _digest(recipient, messages):
+    if len(messages) == 1:
+        return messages[0].subject, messages[0].body
+    subject = f'[Janitorial QC] {len(messages)} new alerts'
+    body = '\n\n'.join(f'--- {message.subject}\n{message.body}' for message in messages)
+    return subject, body
+
+
+def _backoff(attempts):
+    base = current_app.config.get('MAIL_RETRY_BASE', 30)
+    cap = current_app.config.get('MAIL_RETRY_MAX', 3600)
+    return timedelta(seconds=min(cap, base * 2 ** (attempts - 1)))
+
+
+def send_pending(now=None):
+    """Deliver one batch of due messages; returns ``(sent, failed)`` message counts.
+
+    Messages to the same recipient are coalesced into one digest, all
+    digests share one SMTP connection, and sends are spaced to respect
+    ``MAIL_RATE_LIMIT`` messages per minute, counting the previous batch.
+    """
+    global _last_send
+    now = now or datetime.utcnow()
+    claimed = _claim(current_app.config.get('MAIL_BATCH_SIZE', 50), now)
+    if not claimed:
+        return 0, 0
+
+    by_recipient = OrderedDict()
+    for message in claimed:
+        by_recipient.setdefault(message.recipient, []).append(message)
+
+    rate = current_app.config.get('MAIL_RATE_LIMIT', 30)
+    interval = 60.0 / rate if rate else 0
+    max_attempts = current_app.config.get('MAIL_MAX_ATTEMPTS', 6)
+    sent = failed = 0
+
+    def record_failure(messages, error):
+        for message in messages:
+            message.attempts += 1
+            message.last_error = str(error)[:1000]
+            message.claim_token = None
+            message.locked_until = None
+            if message.attempts >= max_attempts:
+                message.status = 'failed'
+            else:
+                message.next_attempt_at = now + _backoff(message.attempts)
+
+    try:
+        with mail.connect() as connection:
+            for recipient, messages in by_recipient.items():
+                wait = _last_send + interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                subject, body = _digest(recipient, messages)
+                try:
+                    connection.send(Message(subject=subject, recipients=[recipient], body=body))
+                except Exception as e:
+                    logger.warning('Sending to %s failed: %s', recipient, e)
+                    record_failure(messages, e)
+                    failed += len(messages)
+                else:
+                    for message in messages:
+                        message.status = 'sent'
+                        message.sent_at = datetime.utcnow()
+                        message.claim_token = None
+                        message.locked_until = None
+                    sent += len(messages)
+                _last_send = time.monotonic()
+                db.session.commit()
+    except Exception as e:
+        # The SMTP server is unreachable: retry everything still claimed later
+        logger.warning('Mail server unavailable: %s', e)
+        remaining = [m for m in claimed if m.status == 'pending' and m.claim_token]
+        record_failure(remaining, e)
+        failed += len(remaining)
+        db.session.commit()
+
+    return sent, failed
+
+
+@outbox_cli.command('send')
+def send_command():
+    """Send one batch of due messages."""
+    sent, failed = send_pending()
+    click.echo(f'Sent {sent} messages, {failed} failed.')
+
+
+@outbox_cli.command('worker')
+@click.option('--interval', default=10, help='Seconds to wait when the outbox is empty.')
+def worker_command(interval):
+    """Keep delivering queued messages until interrupted."""
+    click.echo('Outbox worker started.')
+    while True:
+        sent, failed = send_pending()
+        if sent or failed:
+            click.echo(f'Sent {sent} messages, {failed} failed.')
+        else:
+            time.sleep(interval)
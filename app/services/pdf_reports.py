@@ -0,0 +1,325 @@
+from app import db
+from app.models.inspection import Inspection, InspectionResult, ChecklistItem, InspectionTemplate
+from app.models.facility import Facility, Area
+from app.models.user import User
+from app.services.photos import photo_pipeline, PhotoError
+from app.services.template_cache import MAX_POINTS
+from app.services.versions import entity_changes
+from app.utils.pools import get_executor
+from flask import current_app
+from sqlalchemy import select, func
+import glob
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+
+def render_inspection_pdf(data, path):
+    """Render one inspection report to ``path``.
+
+    Runs in the report pool, so it only receives plain data: the header
+    fields, result rows and local thumbnail paths gathered by the request.
+    """
+    # reportlab is only needed inside the render workers, so it is not imported at start-up
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+
+    styles = getSampleStyleSheet()
+    story = [
+        Paragraph(f'Inspection Report #{data["id"]}', styles['Title']),
+        Table([
+            ['Facility', data['facility'], 'Date', data['inspection_date']],
+            ['Area', data['area'] or 'N/A', 'Inspector', data['inspector']],
+            ['Template', data['template'], 'Status', data['status'].replace('_', ' ').title()],
+            ['Score', f'{data["overall_score"]}%' if data['overall_score'] is not None else '--',
+             'Completed', data['completed_at'] or '--'],
+        ], colWidths=[1 * inch, 2.4 * inch, 1 * inch, 2.4 * inch], style=TableStyle([
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTNAME', (2, 0), (2, -1), 'Helvetica-Bold'),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ])),
+        Spacer(1, 0.25 * inch),
+    ]
+
+    category = None
+    rows = []
+    for result in data['results']:
+        if result['category'] != category:
+            category = result['category']
+            rows.append([Paragraph(f'<b>{category}</b>', styles['Normal']), '', '', ''])
+        if result['passed'] is not None:
+            outcome = 'Pass' if result['passed'] else 'Fail'
+        elif result['score'] is not None:
+            outcome = f'{result["score"]} / {result["max_points"]}'
+        else:
+            outcome = '--'
+        photo = ''
+        if result['thumbnail'] and os.path.exists(result['thumbnail']):
+            photo = Image(result['thumbnail'], width=0.9 * inch, height=0.9 * inch, kind='proportional')
+        rows.append([Paragraph(result['item'], styles['Normal']), outcome,
+                     Paragraph(result['comments'] or '', styles['Normal']), photo])
+
+    if rows:
+        story.append(Table([['Item', 'Result', 'Comments', 'Photo']] + rows,
+                           colWidths=[2.6 * inch, 0.9 * inch, 2.3 * inch, 1 * inch], repeatRows=1,
+                           style=TableStyle([
+                               ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                               ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                               ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+                               ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                           ])))
+    if data['notes']:
+        story += [Spacer(1, 0.2 * inch), Paragraph(f'<b>Notes:</b> {data["notes"]}', styles['Normal'])]
+
+    story += [Spacer(1, 0.6 * inch), Table([
+        ['Inspector signature', '', 'Supervisor sign-off', ''],
+        ['Date', '', 'Date', ''],
+    ], colWidths=[1.5 * inch, 1.9 * inch, 1.5 * inch, 1.9 * inch], rowHeights=0.45 * inch, style=TableStyle([
+        ('LINEBELOW', (1, 0), (1, -1), 0.5, colors.black),
+        ('LINEBELOW', (3, 0), (3, -1), 0.5, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'BOTTOM'),
+    ]))]
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        SimpleDocTemplate(tmp_path, pagesize=letter, title=f'Inspection {data["id"]}').build(story)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    _remove_others(os.path.join(os.path.dirname(path), f'inspection-{data["id"]}-*.pdf'), path)
+    return path
+
+
+def _remove_others(pattern, keep):
+    # Older renders (or bundles) of the same report are stale once ``keep`` lands
+    for stale in glob.glob(pattern):
+        if stale != keep:
+            try:
+                os.remove(stale)
+            except FileNotFoundError:
+                pass
+
+
+def report_stamps(inspection_ids):
+    """Map inspection id -> cache stamp covering everything its PDF shows.
+
+    Besides the inspection's own ``updated_at`` the stamp takes in its
+    results and the change log versions of the facility, area and template
+    (item edits bump the template), so renaming any of them misses the
+    cache. One query for the whole list.
+    """
+    result_count = select(func.count(InspectionResult.id))\
+        .where(InspectionResult.inspection_id == Inspection.id).scalar_subquery()
+    last_result = select(func.coalesce(func.max(InspectionResult.id), 0))\
+        .where(InspectionResult.inspection_id == Inspection.id).scalar_subquery()
+    stamps = {}
+    for row in db.session.execute(
+        select(Inspection.id, Inspection.updated_at, Inspection.completed_at, Inspection.inspection_date,
+               result_count, last_result,
+               entity_changes('facility', Inspection.facility_id),
+               entity_changes('area', Inspection.area_id),
+               entity_changes('template', Inspection.template_id),
+               User.username)
+        .join(User, Inspection.inspector_id == User.id)
+        .where(Inspection.id.in_(inspection_ids))
+    ):
+        stamps[row[0]] = hashlib.sha1(repr(tuple(row[1:])).encode()).hexdigest()[:16]
+    return stamps
+
+
+def _escape(text):
+    # reportlab paragraphs use a mini-markup language
+    return (text or '').replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def inspection_report_data(inspection):
+    header = db.session.execute(
+        select(Facility.name, Area.name, User.username, InspectionTemplate.name)
+        .select_from(Inspection)
+        .join(Facility, Inspection.facility_id == Facility.id)
+        .outerjoin(Area, Inspection.area_id == Area.id)
+        .join(User, Inspection.inspector_id == User.id)
+        .join(InspectionTemplate, Inspection.template_id == InspectionTemplate.id)
+        .where(Inspection.id == inspection.id)
+    ).one()
+
+    results = []
+    for row in db.session.execute(
+        select(ChecklistItem.category, ChecklistItem.item_description, ChecklistItem.scoring_type,
+               InspectionResult.score, InspectionResult.passed, InspectionResult.comments,
+               InspectionResult.photo_path)
+        .join(ChecklistItem, InspectionResult.checklist_item_id == ChecklistItem.id)
+        .where(InspectionResult.inspection_id == inspection.id)
+        .order_by(ChecklistItem.display_order, ChecklistItem.id)
+    ):
+        thumbnail = None
+        if row.photo_path:
+            try:
+                thumbnail = photo_pipeline.resolve(row.photo_path, 'thumb')
+            except PhotoError:
+                thumbnail = None
+        results.append({
+            'category': row.category or 'General',
+            'item': _escape(row.item_description),
+            'max_points': MAX_POINTS.get(row.scoring_type or 'pass_fail', 1),
+            'score': float(row.score) if row.score is not None else None,
+            'passed': row.passed,
+            'comments': _escape(row.comments),
+            'thumbnail': thumbnail,
+        })
+
+    return {
+        'id': inspection.id,
+        'facility': _escape(header[0]),
+        'area': _escape(header[1]),
+        'inspector': _escape(header[2]),
+        'template': _escape(header[3]),
+        'inspection_date': inspection.inspection_date.strftime('%Y-%m-%d %H:%M'),
+        'completed_at': inspection.completed_at.strftime('%Y-%m-%d %H:%M') if inspection.completed_at else None,
+        'status': inspection.status or 'in_progress',
+        'overall_score': float(inspection.overall_score) if inspection.overall_score is not None else None,
+        'notes': _escape(inspection.notes),
+        'results': results,
+    }
+
+
+class ReportRenderer:
+    """Renders report PDFs in a worker pool and keeps them in an on-disk cache.
+
+    Cached files are named after the inspection id and its
+    :func:`report_stamps` stamp, so a changed inspection simply misses and
+    older renders are swept when the new one lands. Files nobody asked for
+    in ``REPORT_CACHE_MAX_AGE`` seconds are swept as well.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def _cache_folder(self):
+        folder = current_app.config['REPORT_CACHE_FOLDER']
+        os.makedirs(folder, exist_ok=True)
+        return folder
+
+    def _executor(self):
+        return get_executor('reports', current_app.config.get('REPORT_EXECUTOR', 'process'),
+                            current_app.config.get('REPORT_WORKERS', 2))
+
+    def inspection_path(self, inspection, stamp=None):
+        if stamp is None:
+            stamp = report_stamps([inspection.id])[inspection.id]
+        return os.path.join(self._cache_folder(), f'inspection-{inspection.id}-{stamp}.pdf')
+
+    def sweep(self):
+        """Remove cached files unused for ``REPORT_CACHE_MAX_AGE`` seconds; runs at most hourly."""
+        now = time.time()
+        max_age = current_app.config['REPORT_CACHE_MAX_AGE']
+        with self._lock:
+            if now - self._last_sweep < min(max_age, 3600):
+                return 0
+            self._last_sweep = now
+            pending = set(self._pending)
+
+        removed = 0
+        for pattern in ('inspection-*.pdf', 'bundle-*.zip'):
+            for path in glob.glob(os.path.join(self._cache_folder(), pattern)):
+                if path in pending:
+                    continue
+                try:
+                    if now - os.path.getmtime(path) > max_age:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    @staticmethod
+    def _touch(path):
+        # Cache hits keep a file young for the age sweep
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def ensure(self, inspection, stamp=None):
+        """Return ``(path, future)``; ``future`` is None when the PDF is already cached."""
+        path = self.inspection_path(inspection, stamp)
+        if os.path.exists(path):
+            self._touch(path)
+            return path, None
+        self.sweep()
+
+        with self._lock:
+            future = self._pending.get(path)
+            if future is not None:
+                return path, future
+            future = self._executor().submit(render_inspection_pdf, inspection_report_data(inspection), path)
+            self._pending[path] = future
+
+        def finished(done, inspection_id=inspection.id):
+            with self._lock:
+                self._pending.pop(path, None)
+            if done.exception() is not None:
+                logger.error('Rendering report for inspection %s failed: %s', inspection_id, done.exception())
+
+        future.add_done_callback(finished)
+        return path, future
+
+    def bundle(self, facility_id, month_start, month_end):
+        """Return ``(path, ready, total)`` for a facility's monthly bundle.
+
+        Missing PDFs are queued in parallel; ``path`` is None until every
+        report in the month is rendered.
+        """
+        inspections = Inspection.query.filter(
+            Inspection.facility_id == facility_id,
+            Inspection.inspection_date >= month_start,
+            Inspection.inspection_date < month_end
+        ).order_by(Inspection.inspection_date, Inspection.id).all()
+
+        stamps = report_stamps([inspection.id for inspection in inspections])
+        paths = []
+        ready = 0
+        for inspection in inspections:
+            path, future = self.ensure(inspection, stamps[inspection.id])
+            paths.append(path)
+            if os.path.exists(path):
+                ready += 1
+        if ready < len(inspections):
+            return None, ready, len(inspections)
+
+        digest = hashlib.sha1('|'.join(os.path.basename(p) for p in paths).encode()).hexdigest()[:16]
+        bundle_path = os.path.join(self._cache_folder(),
+                                   f'bundle-{facility_id}-{month_start:%Y-%m}-{digest}.zip')
+        if os.path.exists(bundle_path):
+            self._touch(bundle_path)
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_folder(), suffix='.tmp')
+            os.close(fd)
+            try:
+                # PDFs are already compressed; storing them keeps bundling cheap
+                with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+                    for inspection, path in zip(inspections, paths):
+                        archive.write(path, f'{inspection.inspection_date:%Y-%m-%d}-inspection-{inspection.id}.pdf')
+                os.replace(tmp_path, bundle_path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            _remove_others(os.path.join(self._cache_folder(), f'bundle-{facility_id}-{month_start:%Y-%m}-*.zip'),
+                           bundle_path)
+        return bundle_path, ready, len(inspections)
+
+
+report_renderer = ReportRenderer()
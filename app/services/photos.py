@@ -0,0 +1,206 @@
+from flask import current_app, url_for
+from app.utils.pools import get_executor
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Pillow format -> stored extension
+FORMAT_EXTENSIONS = {
+    'JPEG': 'jpg',
+    'PNG': 'png',
+    'GIF': 'gif',
+}
+
+REFERENCE_PATTERN = re.compile(r'^([0-9a-f]{64})\.(jpg|png|gif)$')
+
+
+class PhotoError(Exception):
+    pass
+
+
+def _shard(digest):
+    return os.path.join(digest[:2], digest[2:4])
+
+
+def original_path(upload_folder, reference):
+    digest = parse_reference(reference)[0]
+    return os.path.join(upload_folder, 'originals', _shard(digest), reference)
+
+
+def derivative_path(upload_folder, reference, variant):
+    digest = parse_reference(reference)[0]
+    return os.path.join(upload_folder, 'derived', _shard(digest), f'{digest}_{variant}.webp')
+
+
+def parse_reference(reference):
+    match = REFERENCE_PATTERN.match(reference or '')
+    if match is None:
+        raise PhotoError('Invalid photo reference.')
+    return match.group(1), match.group(2)
+
+
+def render_derivatives(source, targets):
+    """Write EXIF-free WebP derivatives of ``source``.
+
+    ``targets`` is a list of ``(path, max_side)``. Runs inside the worker
+    pool, so it only takes plain arguments and never touches the app.
+    """
+    # Pillow is imported on first use so it does not slow down app start-up
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if image.mode in ('P', 'LA') else 'RGB')
+        for path, max_side in targets:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            derived = image.copy()
+            derived.thumbnail((max_side, max_side))
+            # Saving without exif= drops the metadata (GPS, device serials)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    derived.save(tmp, 'WEBP', quality=80, method=4)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        return image.size
+
+
+class PhotoPipeline:
+    """Content-addressed photo storage with background derivative rendering.
+
+    Originals keep the camera's metadata (GPS, device serials) and are only
+    ever read to render derivatives; clients are served derivatives alone.
+    """
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        return get_executor('photos', current_app.config.get('PHOTO_EXECUTOR', 'thread'),
+                            current_app.config.get('PHOTO_WORKERS', 2))
+
+    def store(self, stream):
+        """Stream ``stream`` to disk in chunks and file it under its SHA-256.
+
+        Returns ``(reference, duplicate)``; a duplicate upload reuses the
+        existing file and its derivatives.
+        """
+        from PIL import Image, UnidentifiedImageError
+
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        chunk_size = current_app.config.get('PHOTO_CHUNK_SIZE', 64 * 1024)
+        tmp_dir = os.path.join(upload_folder, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while True:
+                    chunk = stream.read(chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    tmp.write(chunk)
+
+            # Only the header is parsed here; full decoding happens in the pool
+            try:
+                with Image.open(tmp_path) as image:
+                    image_format = image.format
+            except UnidentifiedImageError:
+                raise PhotoError('File is not a supported image.')
+            extension = FORMAT_EXTENSIONS.get(image_format)
+            if extension is None or extension not in current_app.config['ALLOWED_EXTENSIONS']:
+                raise PhotoError(f'{image_format} images are not allowed.')
+
+            reference = f'{digest.hexdigest()}.{extension}'
+            destination = original_path(upload_folder, reference)
+            duplicate = os.path.exists(destination)
+            if not duplicate:
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                os.replace(tmp_path, destination)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self.schedule_derivatives(reference)
+        return reference, duplicate
+
+    def schedule_derivatives(self, reference):
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        sizes = current_app.config.get('PHOTO_SIZES', {'thumb': 320, 'medium': 1280})
+        targets = [(derivative_path(upload_folder, reference, variant), max_side)
+                   for variant, max_side in sizes.items()
+                   if not os.path.exists(derivative_path(upload_folder, reference, variant))]
+        if not targets or not os.path.exists(original_path(upload_folder, reference)):
+            return None
+
+        # Re-uploads of a photo that is still rendering share the queued job
+        with self._lock:
+            future = self._pending.get(reference)
+            if future is not None:
+                return future
+            future = self._get_executor().submit(
+                render_derivatives, original_path(upload_folder, reference), targets)
+            self._pending[reference] = future
+
+        def finished(done):
+            with self._lock:
+                self._pending.pop(reference, None)
+            if done.exception() is not None:
+                logger.error('Rendering derivatives for %s failed: %s', reference, done.exception())
+
+        future.add_done_callback(finished)
+        return future
+
+    def exists(self, reference):
+        """Whether ``reference`` names an original in the photo store."""
+        try:
+            path = original_path(current_app.config['UPLOAD_FOLDER'], reference)
+        except (PhotoError, TypeError):
+            return False
+        return os.path.exists(path)
+
+    def is_pending(self, reference):
+        with self._lock:
+            return reference in self._pending
+
+    def resolve(self, reference, variant, timeout=None):
+        """Return the ``variant`` derivative on disk, or None.
+
+        A missing derivative is (re)queued and waited for up to ``timeout``
+        seconds (``PHOTO_WAIT_SECONDS`` by default). The original is never
+        returned, so its metadata cannot leak.
+        """
+        upload_folder = current_app.config['UPLOAD_FOLDER']
+        path = derivative_path(upload_folder, reference, variant)
+        if os.path.exists(path):
+            return path
+        future = self.schedule_derivatives(reference)
+        if future is not None:
+            try:
+                future.result(timeout=current_app.config.get('PHOTO_WAIT_SECONDS', 5)
+                              if timeout is None else timeout)
+            except Exception:
+                # Timeouts and render errors alike: report the photo as not ready
+                pass
+        return path if os.path.exists(path) else None
+
+
+photo_pipeline = PhotoPipeline()
+
+
+def photo_url(reference, size='thumb'):
+    """Jinja helper: URL of a stored photo, defaulting to its thumbnail."""
+    if not reference:
+        return None
+    return url_for('photos.serve', reference=reference, size=size)
@@ -0,0 +1,62 @@
+from app import db
+from app.models.user import User
+from app.services.dashboard_stats import get_dashboard_stats, get_recent_inspections
+from app.utils.query_counter import count_queries
+from flask.cli import AppGroup
+import re
+import click
+
+# Tables that grow with inspection volume; a full scan of these is a regression
+HOT_TABLES = {'inspections', 'issues', 'inspection_results'}
+
+ROLES = ('admin', 'supervisor', 'inspector')
+
+explain_cli = AppGroup('explain', help='Check query plans of hot paths.')
+
+_SQLITE_SCAN = re.compile(r'^SCAN (\w+)(?: AS \w+)?$')
+
+
+def full_scans(connection, statement, parameters):
+    """Return the hot tables that ``statement`` reads with a full table scan."""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+        scans = set()
+        for row in rows:
+            match = _SQLITE_SCAN.match(row[-1])
+            if match:
+                scans.add(match.group(1))
+    elif dialect == 'mysql':
+        rows = connection.exec_driver_sql('EXPLAIN ' + statement, parameters).mappings().all()
+        scans = {row['table'] for row in rows if row['type'] == 'ALL'}
+    else:
+        raise click.ClickException(f'EXPLAIN checks are not supported for {dialect}.')
+    return scans & HOT_TABLES
+
+
+def dashboard_plan_report():
+    """Run the dashboard queries for each role and collect full scans of hot tables."""
+    report = {}
+    for role in ROLES:
+        user = User.query.filter_by(role=role).first() or User(id=0, role=role)
+        with count_queries(db.engine, select_only=True) as statements:
+            get_dashboard_stats(user)
+            get_recent_inspections(user)
+        connection = db.session.connection()
+        report[role] = [(statement, sorted(full_scans(connection, statement, parameters)))
+                        for statement, parameters in statements]
+    return report
+
+
+@explain_cli.command('dashboard')
+def explain_dashboard():
+    """Fail if dashboard queries fall back to full scans of hot tables."""
+    failures = 0
+    for role, plans in dashboard_plan_report().items():
+        for statement, scans in plans:
+            if scans:
+                failures += 1
+                click.echo(f'[{role}] full scan of {", ".join(scans)}:\n{statement}\n', err=True)
+    if failures:
+        raise click.ClickException(f'{failures} dashboard queries use full table scans.')
+    click.echo('Dashboard queries use indexes for all hot tables.')
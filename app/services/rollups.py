@@ -0,0 +1,279 @@
+from app import db
+from app.models.inspection import Inspection
+from app.models.facility import Area
+from app.models.issue import Issue
+from app.models.rollup import DailyRollup
+from app.utils.upsert import upsert
+from flask.cli import AppGroup
+from sqlalchemy import event, select, insert, delete, func, case, and_, or_
+from sqlalchemy.orm import attributes
+from datetime import date, datetime
+from decimal import Decimal
+import click
+
+INSPECTION_FIELDS = ('inspection_date', 'facility_id', 'area_id', 'inspector_id',
+                     'template_id', 'status', 'overall_score')
+ISSUE_FIELDS = ('reported_at', 'area_id', 'inspection_id', 'status')
+KEY_COLUMNS = ('day', 'facility_id', 'area_id', 'inspector_id', 'template_id')
+COUNTER_COLUMNS = ('inspection_count', 'completed_count', 'score_sum', 'score_count',
+                   'open_issue_count', 'resolved_issue_count')
+# Incremental updates and rebuilds must agree; a NULL status is neither
+OPEN_ISSUE_STATUSES = ('open', 'in_progress')
+# Inspections whose scores feed the trends, both the rolled-up overall
+# series and the per-category series read from item results
+TREND_STATUSES = ('completed',)
+# Owners an issue's rollup key is resolved through: (model, issue column, key fields)
+REKEY_OWNERS = ((Area, Issue.area_id, ('facility_id',)),
+                (Inspection, Issue.inspection_id, ('inspector_id', 'template_id')))
+
+_PENDING_KEY = 'rollup_deltas'
+_REKEY_KEY = 'rollup_reassigned_issues'
+
+rollups_cli = AppGroup('rollups', help='Maintain the daily rollup tables.')
+
+
+def _as_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    # SQLite returns DATE() results as ISO strings
+    return date.fromisoformat(str(value)[:10])
+
+
+def _old_values(obj, fields):
+    values = {}
+    for field in fields:
+        hist = attributes.get_history(obj, field)
+        if hist.deleted:
+            values[field] = hist.deleted[0]
+        elif hist.unchanged:
+            values[field] = hist.unchanged[0]
+        else:
+            values[field] = None
+    return values
+
+
+def _new_values(obj, fields):
+    return {field: getattr(obj, field) for field in fields}
+
+
+def _inspection_contribution(values):
+    day = _as_date(values['inspection_date'])
+    if day is None:
+        return None
+    key = (day, values['facility_id'] or 0, values['area_id'] or 0,
+           values['inspector_id'] or 0, values['template_id'] or 0)
+    completed = values['status'] == 'completed'
+    scored = values['status'] in TREND_STATUSES and values['overall_score'] is not None
+    return key, {
+        'inspection_count': 1,
+        'completed_count': 1 if completed else 0,
+        'score_sum': Decimal(values['overall_score']) if scored else Decimal(0),
+        'score_count': 1 if scored else 0,
+    }
+
+
+def _issue_contributions(connection, rows):
+    """Resolve facility/inspector/template for issue snapshots in two IN queries."""
+    area_ids = {values['area_id'] for values in rows if values['area_id']}
+    inspection_ids = {values['inspection_id'] for values in rows if values['inspection_id']}
+
+    facility_by_area = {}
+    if area_ids:
+        facility_by_area = dict(connection.execute(
+            select(Area.id, Area.facility_id).where(Area.id.in_(area_ids))).all())
+    owner_by_inspection = {}
+    if inspection_ids:
+        owner_by_inspection = {row.id: (row.inspector_id, row.template_id) for row in connection.execute(
+            select(Inspection.id, Inspection.inspector_id, Inspection.template_id)
+            .where(Inspection.id.in_(inspection_ids)))}
+
+    contributions = []
+    for values in rows:
+        day = _as_date(values['reported_at'])
+        if day is None:
+            continue
+        inspector_id, template_id = owner_by_inspection.get(values['inspection_id'], (0, 0))
+        key = (day, facility_by_area.get(values['area_id'], 0), values['area_id'] or 0,
+               inspector_id or 0, template_id or 0)
+        contributions.append((key, {
+            'open_issue_count': 1 if values['status'] in OPEN_ISSUE_STATUSES else 0,
+            'resolved_issue_count': 1 if values['status'] == 'resolved' else 0,
+        }))
+    return contributions
+
+
+def _accumulate(deltas, contributions, sign):
+    for key, counters in contributions:
+        bucket = deltas.setdefault(key, {})
+        for column, amount in counters.items():
+            bucket[column] = bucket.get(column, 0) + sign * amount
+
+
+def _collect(session, connection, objects, sign, snapshot):
+    inspections = [obj for obj in objects if isinstance(obj, Inspection)]
+    issues = [obj for obj in objects if isinstance(obj, Issue)]
+    if not inspections and not issues:
+        return
+
+    deltas = session.info.setdefault(_PENDING_KEY, {})
+    contributions = [_inspection_contribution(snapshot(obj, INSPECTION_FIELDS)) for obj in inspections]
+    _accumulate(deltas, [c for c in contributions if c], sign)
+    if issues:
+        _accumulate(deltas, _issue_contributions(
+            connection, [snapshot(obj, ISSUE_FIELDS) for obj in issues]), sign)
+
+
+def _apply(connection, deltas):
+    table = DailyRollup.__table__
+    for key, counters in deltas.items():
+        counters = {column: amount for column, amount in counters.items() if amount}
+        if not counters:
+            continue
+        row = dict(zip(KEY_COLUMNS, key))
+        row.update({column: 0 for column in COUNTER_COLUMNS})
+        row.update(counters)
+        # A single upsert: two first writes to one key must not both INSERT
+        upsert(connection, table, row, KEY_COLUMNS,
+               lambda proposed: {column: table.c[column] + amount for column, amount in counters.items()})
+
+
+def _issue_rows(connection, issue_ids):
+    table = Issue.__table__
+    return [dict(row._mapping) for row in connection.execute(
+        select(*[table.c[field] for field in ISSUE_FIELDS]).where(table.c.id.in_(issue_ids)))]
+
+
+def _reassigned_issues(session, connection):
+    """Snapshot issues outside the flush whose rollup key moves with it.
+
+    An issue's key is resolved through its area and inspection, so moving an
+    area to another facility or an inspection to another inspector or template
+    re-keys every issue pointing at it.
+    """
+    conditions = []
+    for model, column, fields in REKEY_OWNERS:
+        owner_ids = [obj.id for obj in session.dirty if isinstance(obj, model)
+                     and any(attributes.get_history(obj, field).has_changes() for field in fields)]
+        if owner_ids:
+            conditions.append(column.in_(owner_ids))
+    if not conditions:
+        return []
+    # Issues in the flush are re-keyed through their own snapshots
+    flushed = [obj.id for obj in list(session.dirty) + list(session.deleted)
+               if isinstance(obj, Issue) and obj.id is not None]
+    query = select(Issue.id).where(or_(*conditions))
+    if flushed:
+        query = query.where(Issue.id.notin_(flushed))
+    issue_ids = connection.execute(query).scalars().all()
+    return _issue_rows(connection, issue_ids) if issue_ids else []
+
+
+@event.listens_for(db.session, 'before_flush')
+def _subtract_previous_state(session, flush_context, instances):
+    # Previous values must be read before the flush overwrites the history
+    persistent = [obj for obj in session.dirty if session.is_modified(obj)]
+    with session.no_autoflush:
+        connection = session.connection()
+        _collect(session, connection, persistent + list(session.deleted), -1, _old_values)
+        reassigned = _reassigned_issues(session, connection)
+        if reassigned:
+            # Resolved against the owners still in the database; added back
+            # under the new owners once the flush has written them
+            _accumulate(session.info.setdefault(_PENDING_KEY, {}),
+                        _issue_contributions(connection, reassigned), -1)
+            session.info[_REKEY_KEY] = reassigned
+
+
+@event.listens_for(db.session, 'after_flush')
+def _add_current_state(session, flush_context):
+    connection = session.connection()
+    current = [obj for obj in session.new] + [obj for obj in session.dirty if session.is_modified(obj)]
+    _collect(session, connection, current, 1, _new_values)
+    reassigned = session.info.pop(_REKEY_KEY, None)
+    if reassigned:
+        _accumulate(session.info.setdefault(_PENDING_KEY, {}),
+                    _issue_contributions(connection, reassigned), 1)
+    deltas = session.info.pop(_PENDING_KEY, None)
+    if deltas:
+        _apply(connection, deltas)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_REKEY_KEY, None)
+
+
+def rebuild_rollups():
+    """Recompute every rollup row from the source tables."""
+    inspection_day = func.date(Inspection.inspection_date)
+    is_completed = Inspection.status == 'completed'
+    is_scored = and_(Inspection.status.in_(TREND_STATUSES), Inspection.overall_score.isnot(None))
+    inspection_rows = db.session.execute(
+        select(inspection_day, Inspection.facility_id, func.coalesce(Inspection.area_id, 0),
+               Inspection.inspector_id, Inspection.template_id,
+               func.count(Inspection.id),
+               func.sum(case((is_completed, 1), else_=0)),
+               func.sum(case((is_scored, Inspection.overall_score), else_=0)),
+               func.sum(case((is_scored, 1), else_=0)))
+        .group_by(inspection_day, Inspection.facility_id, func.coalesce(Inspection.area_id, 0),
+                  Inspection.inspector_id, Inspection.template_id))
+
+    issue_day = func.date(Issue.reported_at)
+    issue_rows = db.session.execute(
+        select(issue_day, Area.facility_id, Issue.area_id,
+               func.coalesce(Inspection.inspector_id, 0), func.coalesce(Inspection.template_id, 0),
+               func.sum(case((Issue.status.in_(OPEN_ISSUE_STATUSES), 1), else_=0)),
+               func.sum(case((Issue.status == 'resolved', 1), else_=0)))
+        .select_from(Issue)
+        .join(Area, Issue.area_id == Area.id)
+        .outerjoin(Inspection, Issue.inspection_id == Inspection.id)
+        .where(Issue.reported_at.isnot(None))
+        .group_by(issue_day, Area.facility_id, Issue.area_id,
+                  func.coalesce(Inspection.inspector_id, 0), func.coalesce(Inspection.template_id, 0)))
+
+    rows = {}
+    def bucket(key):
+        key = (_as_date(key[0]),) + tuple(key[1:])
+        if key not in rows:
+            rows[key] = dict(zip(KEY_COLUMNS, key), **{column: 0 for column in COUNTER_COLUMNS})
+        return rows[key]
+
+    for row in inspection_rows:
+        target = bucket(row[:5])
+        target.update(inspection_count=row[5], completed_count=row[6] or 0,
+                      score_sum=row[7] or 0, score_count=row[8] or 0)
+    for row in issue_rows:
+        target = bucket(row[:5])
+        target.update(open_issue_count=row[5] or 0, resolved_issue_count=row[6] or 0)
+
+    db.session.execute(delete(DailyRollup.__table__))
+    if rows:
+        db.session.execute(insert(DailyRollup.__table__), list(rows.values()))
+    db.session.commit()
+    return len(rows)
+
+
+def summarize_rollups(start_day, end_day, **filters):
+    """Sum rollup counters for ``start_day <= day < end_day``.
+
+    ``filters`` may narrow by any key column, e.g. ``inspector_id=3``.
+    """
+    table = DailyRollup.__table__
+    conditions = [table.c.day >= start_day, table.c.day < end_day]
+    conditions += [table.c[column] == value for column, value in filters.items()]
+    row = db.session.execute(
+        select(*[func.coalesce(func.sum(table.c[column]), 0).label(column) for column in COUNTER_COLUMNS])
+        .where(*conditions)).one()
+    return dict(row._mapping)
+
+
+@rollups_cli.command('rebuild')
+def rebuild_command():
+    """Rebuild daily rollups from inspections and issues."""
+    count = rebuild_rollups()
+    click.echo(f'Rebuilt {count} rollup rows.')
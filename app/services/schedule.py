@@ -0,0 +1,182 @@
+from app import db
+from app.models.facility import Facility
+from app.models.inspection import Inspection, InspectionTemplate
+from app.models.schedule import InspectionSchedule
+from app.utils.upsert import upsert
+from flask.cli import AppGroup
+from sqlalchemy import event, select, insert, update, delete, func, bindparam
+from sqlalchemy.orm import attributes, joinedload, contains_eager
+from datetime import datetime, timedelta
+import calendar
+import click
+
+# Statuses that count as "inspected" for scheduling purposes
+DONE_STATUSES = ('completed', 'flagged')
+
+schedule_cli = AppGroup('schedule', help='Maintain the inspection schedule.')
+
+
+def _add_months(moment, months):
+    month = moment.month - 1 + months
+    year = moment.year + month // 12
+    month = month % 12 + 1
+    day = min(moment.day, calendar.monthrange(year, month)[1])
+    return moment.replace(year=year, month=month, day=day)
+
+
+def next_due(last_completed_at, frequency):
+    """Return when the next inspection is due, or None for unscheduled templates."""
+    if frequency == 'daily':
+        return last_completed_at + timedelta(days=1)
+    if frequency == 'weekly':
+        return last_completed_at + timedelta(weeks=1)
+    if frequency == 'monthly':
+        return _add_months(last_completed_at, 1)
+    if frequency == 'quarterly':
+        return _add_months(last_completed_at, 3)
+    return None
+
+
+def _completed_at(inspection):
+    return inspection.completed_at or inspection.inspection_date or datetime.utcnow()
+
+
+def _record(connection, inspection, frequency):
+    """Advance the schedule row for the inspection's key if it is newer."""
+    table = InspectionSchedule.__table__
+    completed_at = _completed_at(inspection)
+    row = {
+        'facility_id': inspection.facility_id,
+        'area_id': inspection.area_id or 0,
+        'template_id': inspection.template_id,
+        'last_inspection_id': inspection.id,
+        'last_inspector_id': inspection.inspector_id,
+        'last_completed_at': completed_at,
+        'next_due_at': next_due(completed_at, frequency),
+    }
+    # One statement, so two first completions of a key cannot both insert
+    upsert(connection, table, row, ('facility_id', 'area_id', 'template_id'),
+           lambda proposed: {column: proposed[column] for column in
+                             ('last_inspection_id', 'last_inspector_id', 'last_completed_at', 'next_due_at')},
+           where=lambda proposed: table.c.last_completed_at <= proposed.last_completed_at)
+
+
+def _just_completed(session, inspection):
+    if inspection.status not in DONE_STATUSES:
+        return False
+    if inspection in session.new:
+        return True
+    return attributes.get_history(inspection, 'status').has_changes() or \
+        attributes.get_history(inspection, 'completed_at').has_changes()
+
+
+def _reschedule_template(connection, template_id, frequency):
+    table = InspectionSchedule.__table__
+    rows = connection.execute(select(table.c.id, table.c.last_completed_at)
+                              .where(table.c.template_id == template_id)).all()
+    if rows:
+        connection.execute(
+            update(table).where(table.c.id == bindparam('row_id'))
+            .values(next_due_at=bindparam('due')),
+            [{'row_id': row.id, 'due': next_due(row.last_completed_at, frequency)} for row in rows])
+
+
+@event.listens_for(db.session, 'after_flush')
+def _update_schedule(session, flush_context):
+    changed = list(session.new) + list(session.dirty)
+    completed = [obj for obj in changed
+                 if isinstance(obj, Inspection) and _just_completed(session, obj)]
+    retimed = [obj for obj in changed
+               if isinstance(obj, InspectionTemplate) and obj not in session.new
+               and attributes.get_history(obj, 'frequency').has_changes()]
+    if not completed and not retimed:
+        return
+
+    connection = session.connection()
+    if completed:
+        template_ids = {inspection.template_id for inspection in completed}
+        frequencies = dict(connection.execute(
+            select(InspectionTemplate.id, InspectionTemplate.frequency)
+            .where(InspectionTemplate.id.in_(template_ids))).all())
+        for inspection in sorted(completed, key=_completed_at):
+            _record(connection, inspection, frequencies.get(inspection.template_id))
+    for template in retimed:
+        _reschedule_template(connection, template.id, template.frequency)
+
+
+def rebuild_schedule():
+    """Recompute every schedule row from completed inspections in one pass."""
+    completed_at = func.coalesce(Inspection.completed_at, Inspection.inspection_date)
+    rank = func.row_number().over(
+        partition_by=(Inspection.facility_id, func.coalesce(Inspection.area_id, 0), Inspection.template_id),
+        order_by=(completed_at.desc(), Inspection.id.desc())
+    ).label('rank')
+    latest = select(
+        Inspection.id, Inspection.facility_id, func.coalesce(Inspection.area_id, 0).label('area_id'),
+        Inspection.template_id, Inspection.inspector_id, completed_at.label('completed_at'), rank
+    ).where(Inspection.status.in_(DONE_STATUSES)).subquery()
+
+    rows = db.session.execute(
+        select(latest, InspectionTemplate.frequency)
+        .join(InspectionTemplate, InspectionTemplate.id == latest.c.template_id)
+        .where(latest.c.rank == 1)
+    ).all()
+
+    db.session.execute(delete(InspectionSchedule))
+    if rows:
+        db.session.execute(insert(InspectionSchedule.__table__), [{
+            'facility_id': row.facility_id,
+            'area_id': row.area_id,
+            'template_id': row.template_id,
+            'last_inspection_id': row.id,
+            'last_inspector_id': row.inspector_id,
+            'last_completed_at': row.completed_at,
+            'next_due_at': next_due(row.completed_at, row.frequency),
+        } for row in rows])
+    db.session.commit()
+    return len(rows)
+
+
+def _today_end(now):
+    return now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def _active_facilities(query):
+    # Deactivated facilities (and so their areas) drop off until reactivated
+    return query.join(Facility, InspectionSchedule.facility_id == Facility.id)\
+        .filter(Facility.active.is_(True))
+
+
+def due_query(user, now=None):
+    """Schedule rows due by the end of today, soonest first.
+
+    Inspectors see the areas they inspected last; staff see everything.
+    Only active facilities are listed.
+    """
+    now = now or datetime.utcnow()
+    query = _active_facilities(InspectionSchedule.query).options(
+        contains_eager(InspectionSchedule.facility),
+        joinedload(InspectionSchedule.area),
+        joinedload(InspectionSchedule.template),
+        joinedload(InspectionSchedule.last_inspector)
+    ).filter(InspectionSchedule.next_due_at < _today_end(now))
+    if user.role == 'inspector':
+        query = query.filter(InspectionSchedule.last_inspector_id == user.id)
+    return query
+
+
+def overdue_count(user, now=None):
+    """Scalar subquery counting schedule rows already past due for ``user``."""
+    now = now or datetime.utcnow()
+    query = _active_facilities(db.session.query(func.count(InspectionSchedule.id)))\
+        .filter(InspectionSchedule.next_due_at < now)
+    if user.role == 'inspector':
+        query = query.filter(InspectionSchedule.last_inspector_id == user.id)
+    return query.scalar_subquery()
+
+
+@schedule_cli.command('rebuild')
+def rebuild_command():
+    """Recompute the schedule from inspection history."""
+    count = rebuild_schedule()
+    click.echo(f'Rebuilt {count} schedule rows.')
@@ -0,0 +1,145 @@
+from app import db
+from app.models.inspection import Inspection, InspectionResult, ChecklistItem
+from app.services.template_cache import MAX_POINTS
+from flask.cli import AppGroup
+from sqlalchemy import select, update, bindparam
+from decimal import Decimal
+import click
+
+SCORED_STATUSES = ('completed', 'flagged')
+
+# Keep IN lists and UPDATE batches to a size every backend handles comfortably
+CHUNK_SIZE = 1000
+
+scoring_cli = AppGroup('scoring', help='Compute inspection scores.')
+
+
+def _chunks(values, size=CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _item_table(item_ids):
+    """Return sorted item ids with their weights, max points and pass/fail flags."""
+    # numpy is imported on first use so it does not slow down app start-up
+    import numpy as np
+
+    rows = []
+    for chunk in _chunks(sorted(item_ids)):
+        rows.extend(db.session.execute(
+            select(ChecklistItem.id, ChecklistItem.weight, ChecklistItem.scoring_type)
+            .where(ChecklistItem.id.in_(chunk))
+        ).all())
+    rows.sort(key=lambda row: row.id)
+
+    ids = np.array([row.id for row in rows], dtype=np.int64)
+    weights = np.array([float(row.weight) if row.weight is not None else 1.0 for row in rows])
+    max_points = np.array([MAX_POINTS.get(row.scoring_type or 'pass_fail', 1) for row in rows], dtype=float)
+    pass_fail = np.array([(row.scoring_type or 'pass_fail') == 'pass_fail' for row in rows], dtype=bool)
+    return ids, weights, max_points, pass_fail
+
+
+def score_rows(rows):
+    """Turn ``(inspection_id, checklist_item_id, score, passed)`` rows into scores.
+
+    Each answered item contributes ``weight * ratio`` where ``ratio`` is 1/0
+    for pass/fail items and ``score / max_points`` for ratings. The result is
+    the weighted mean as a 0-100 percentage; items with neither a score nor a
+    pass flag are left out of the denominator. Returns ``{inspection_id:
+    Decimal or None}``.
+    """
+    import numpy as np
+
+    if not rows:
+        return {}
+
+    inspection_col = np.array([row[0] for row in rows], dtype=np.int64)
+    item_col = np.array([row[1] for row in rows], dtype=np.int64)
+    scores = np.array([float(row[2]) if row[2] is not None else np.nan for row in rows])
+    passed = np.array([-1 if row[3] is None else int(bool(row[3])) for row in rows], dtype=np.int8)
+
+    item_ids, weights, max_points, pass_fail = _item_table(set(item_col.tolist()))
+    if not len(item_ids):
+        return {inspection_id: None for inspection_id in set(inspection_col.tolist())}
+    known = np.isin(item_col, item_ids)
+    position = np.searchsorted(item_ids, item_col).clip(0, len(item_ids) - 1)
+
+    has_score = ~np.isnan(scores)
+    is_pass_fail = pass_fail[position]
+    pass_ratio = np.where(passed >= 0, passed, has_score & (np.nan_to_num(scores) > 0)).astype(float)
+    rating_ratio = np.clip(np.nan_to_num(scores) / max_points[position], 0.0, 1.0)
+
+    ratio = np.where(is_pass_fail, pass_ratio, rating_ratio)
+    answered = known & np.where(is_pass_fail, (passed >= 0) | has_score, has_score)
+    weight = np.where(answered, weights[position], 0.0)
+
+    inspection_ids, index = np.unique(inspection_col, return_inverse=True)
+    earned = np.bincount(index, weights=weight * ratio, minlength=len(inspection_ids))
+    possible = np.bincount(index, weights=weight, minlength=len(inspection_ids))
+
+    result = {}
+    for inspection_id, got, total in zip(inspection_ids.tolist(), earned, possible):
+        result[inspection_id] = Decimal(f'{got / total * 100:.2f}') if total > 0 else None
+    return result
+
+
+def compute_scores(inspection_ids):
+    """Score the given inspections from their stored results."""
+    rows = []
+    for chunk in _chunks(list(inspection_ids)):
+        rows.extend(tuple(row) for row in db.session.execute(
+            select(InspectionResult.inspection_id, InspectionResult.checklist_item_id,
+                   InspectionResult.score, InspectionResult.passed)
+            .where(InspectionResult.inspection_id.in_(chunk))
+        ))
+    return score_rows(rows)
+
+
+def score_inspection(inspection):
+    return compute_scores([inspection.id]).get(inspection.id)
+
+
+def rescore_inspections(template_id=None, chunk_size=CHUNK_SIZE):
+    """Recompute ``overall_score`` for every completed/flagged inspection.
+
+    Inspections are walked in id order one chunk at a time; each chunk is
+    scored with one results query and written back with one executemany
+    UPDATE. Returns the number of inspections rescored.
+    """
+    table = Inspection.__table__
+    write = update(table).where(table.c.id == bindparam('inspection_id'))\
+        .values(overall_score=bindparam('overall_score'))
+
+    last_id = 0
+    total = 0
+    while True:
+        query = select(table.c.id).where(table.c.status.in_(SCORED_STATUSES), table.c.id > last_id)
+        if template_id is not None:
+            query = query.where(table.c.template_id == template_id)
+        ids = db.session.execute(query.order_by(table.c.id).limit(chunk_size)).scalars().all()
+        if not ids:
+            break
+
+        # Inspections without any result rows keep their stored score
+        scores = compute_scores(ids)
+        if scores:
+            db.session.execute(write, [{'inspection_id': inspection_id, 'overall_score': score}
+                                       for inspection_id, score in scores.items()])
+        total += len(scores)
+        last_id = ids[-1]
+
+    db.session.commit()
+    return total
+
+
+@scoring_cli.command('rescore')
+@click.option('--template-id', type=int, default=None, help='Only rescore inspections of this template.')
+def rescore_command(template_id):
+    """Rescore inspection history after template weights change."""
+    from app.services.rollups import rebuild_rollups
+
+    count = rescore_inspections(template_id)
+    click.echo(f'Rescored {count} inspections.')
+    # The bulk UPDATE bypasses the session listeners that maintain the rollups
+    rebuild_rollups()
+    click.echo('Rebuilt daily rollups.')
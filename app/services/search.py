@@ -0,0 +1,232 @@
+from app import db
+from app.models.facility import Facility, Area
+from app.models.inspection import InspectionTemplate, ChecklistItem
+from app.models.issue import Issue
+from app.models.search import SearchDocument, FTS_TABLE
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event, select, insert, update, delete, text, or_, and_, bindparam
+from datetime import datetime
+import click
+import re
+
+ENTITY_TYPES = ('facility', 'area', 'template', 'checklist_item', 'issue')
+
+# Title matches count this many times more than body matches
+TITLE_WEIGHT = 5.0
+
+search_cli = AppGroup('search', help='Maintain the search index.')
+
+
+def _join(*parts):
+    return ' '.join(part for part in parts if part)
+
+
+def _document(obj):
+    """Return ``(entity_type, entity_id, parent_id, title, body)`` or None."""
+    if isinstance(obj, Facility):
+        return 'facility', obj.id, None, obj.name, _join(obj.address, obj.contact_person)
+    if isinstance(obj, Area):
+        return 'area', obj.id, obj.facility_id, obj.name, obj.area_type
+    if isinstance(obj, InspectionTemplate):
+        return 'template', obj.id, None, obj.name, obj.description
+    if isinstance(obj, ChecklistItem):
+        return 'checklist_item', obj.id, obj.template_id, (obj.item_description or '')[:255], \
+            _join(obj.category, obj.item_description)
+    if isinstance(obj, Issue):
+        return 'issue', obj.id, obj.area_id, f'{(obj.severity or "").title()} issue', obj.description
+    return None
+
+
+def backend(connection):
+    """Name of the text search strategy usable on ``connection``."""
+    dialect = connection.dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        return 'fulltext'
+    if dialect == 'sqlite' and connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = :name"), {'name': FTS_TABLE}).first():
+        return 'fts5'
+    return 'like'
+
+
+def _write(connection, documents, removed):
+    table = SearchDocument.__table__
+    use_fts = backend(connection) == 'fts5'
+    now = datetime.utcnow()
+
+    keys = list(documents) + list(removed)
+    existing = {}
+    for entity_type in {key[0] for key in keys}:
+        ids = [key[1] for key in keys if key[0] == entity_type]
+        for row in connection.execute(select(table.c.id, table.c.entity_id)
+                                      .where(table.c.entity_type == entity_type, table.c.entity_id.in_(ids))):
+            existing[(entity_type, row.entity_id)] = row.id
+
+    stale = [existing[key] for key in removed if key in existing]
+    if stale:
+        connection.execute(delete(table).where(table.c.id.in_(stale)))
+        if use_fts:
+            connection.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid IN :ids')
+                               .bindparams(bindparam('ids', expanding=True)), {'ids': stale})
+
+    for key, (parent_id, title, body) in documents.items():
+        values = {'parent_id': parent_id, 'title': title or '', 'body': body, 'updated_at': now}
+        document_id = existing.get(key)
+        if document_id is None:
+            document_id = connection.execute(insert(table).values(
+                entity_type=key[0], entity_id=key[1], **values)).inserted_primary_key[0]
+        else:
+            connection.execute(update(table).where(table.c.id == document_id).values(**values))
+            if use_fts:
+                connection.execute(text(f'DELETE FROM {FTS_TABLE} WHERE rowid = :id'), {'id': document_id})
+        if use_fts:
+            connection.execute(text(f'INSERT INTO {FTS_TABLE} (rowid, title, body) VALUES (:id, :title, :body)'),
+                               {'id': document_id, 'title': values['title'], 'body': body or ''})
+
+
+@event.listens_for(db.session, 'after_flush')
+def _index_changes(session, flush_context):
+    documents = {}
+    for obj in list(session.new) + list(session.dirty):
+        document = _document(obj)
+        if document is not None:
+            documents[document[:2]] = document[2:]
+    removed = set()
+    for obj in session.deleted:
+        document = _document(obj)
+        if document is not None:
+            removed.add(document[:2])
+    if documents or removed:
+        _write(session.connection(), documents, removed)
+
+
+def rebuild_index():
+    """Re-index every searchable entity; returns the number of documents."""
+    connection = db.session.connection()
+    db.session.execute(delete(SearchDocument))
+    use_fts = backend(connection) == 'fts5'
+    if use_fts:
+        db.session.execute(text(f'DELETE FROM {FTS_TABLE}'))
+
+    total = 0
+    now = datetime.utcnow()
+    for model in (Facility, Area, InspectionTemplate, ChecklistItem, Issue):
+        rows = []
+        for obj in model.query.yield_per(1000):
+            entity_type, entity_id, parent_id, title, body = _document(obj)
+            rows.append({'entity_type': entity_type, 'entity_id': entity_id, 'parent_id': parent_id,
+                         'title': title or '', 'body': body, 'updated_at': now})
+        if rows:
+            db.session.execute(insert(SearchDocument.__table__), rows)
+            total += len(rows)
+
+    if use_fts:
+        db.session.execute(text(f"INSERT INTO {FTS_TABLE} (rowid, title, body) "
+                                f"SELECT id, title, COALESCE(body, '') FROM search_documents"))
+    db.session.commit()
+    return total
+
+
+def _terms(query):
+    return re.findall(r'\w+', query.lower())[:10]
+
+
+def _snippet(body, terms, width=160):
+    body = ' '.join((body or '').split())
+    lowered = body.lower()
+    positions = [lowered.find(term) for term in terms if term in lowered]
+    start = max(0, min(positions) - 40) if positions else 0
+    snippet = body[start:start + width]
+    return ('...' if start else '') + snippet + ('...' if start + width < len(body) else '')
+
+
+def _type_filter(entity_types, params):
+    if not entity_types:
+        return ''
+    params['types'] = list(entity_types)
+    return ' AND d.entity_type IN :types'
+
+
+def _fts5_search(terms, entity_types, offset, limit):
+    params = {'match': ' '.join(f'"{term}"' for term in terms) + '*', 'limit': limit, 'offset': offset}
+    sql = text(f"""
+        SELECT d.id, d.entity_type, d.entity_id, d.parent_id, d.title, d.body,
+               -bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0) AS score
+        FROM {FTS_TABLE} JOIN search_documents d ON d.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :match{_type_filter(entity_types, params)}
+        ORDER BY score DESC, d.id
+        LIMIT :limit OFFSET :offset""")
+    if entity_types:
+        sql = sql.bindparams(bindparam('types', expanding=True))
+    return db.session.execute(sql, params).all()
+
+
+def _fulltext_search(terms, entity_types, offset, limit):
+    # Boolean mode so every term must match; the last one may be a prefix
+    params = {'against': ' '.join(f'+{term}' for term in terms) + '*', 'limit': limit, 'offset': offset}
+    sql = text(f"""
+        SELECT d.id, d.entity_type, d.entity_id, d.parent_id, d.title, d.body,
+               MATCH (d.title, d.body) AGAINST (:against IN BOOLEAN MODE) AS score
+        FROM search_documents d
+        WHERE MATCH (d.title, d.body) AGAINST (:against IN BOOLEAN MODE){_type_filter(entity_types, params)}
+        ORDER BY score DESC, d.id
+        LIMIT :limit OFFSET :offset""")
+    if entity_types:
+        sql = sql.bindparams(bindparam('types', expanding=True))
+    return db.session.execute(sql, params).all()
+
+
+def _like_search(terms, entity_types, offset, limit):
+    # Fallback without a text index: filter with LIKE, rank in Python
+    table = SearchDocument.__table__
+    conditions = [or_(table.c.title.ilike(f'%{term}%'), table.c.body.ilike(f'%{term}%')) for term in terms]
+    if entity_types:
+        conditions.append(table.c.entity_type.in_(entity_types))
+    rows = db.session.execute(
+        select(table).where(and_(*conditions)).limit(current_app.config.get('SEARCH_FALLBACK_LIMIT', 1000))
+    ).all()
+
+    def score(row):
+        title, body = row.title.lower(), (row.body or '').lower()
+        return sum(TITLE_WEIGHT * title.count(term) + body.count(term) for term in terms)
+
+    ranked = sorted(((score(row), row) for row in rows), key=lambda pair: (-pair[0], pair[1].id))
+    return [(row.id, row.entity_type, row.entity_id, row.parent_id, row.title, row.body, value)
+            for value, row in ranked[offset:offset + limit]]
+
+
+SEARCHERS = {
+    'fts5': _fts5_search,
+    'fulltext': _fulltext_search,
+    'like': _like_search,
+}
+
+
+def search(query, entity_types=None, offset=0, limit=20):
+    """Ranked search over the index; returns ``(results, has_more)``.
+
+    Each result is a dict with ``entity_type``, ``entity_id``, ``parent_id``,
+    ``title``, ``snippet`` and ``score`` (higher is better).
+    """
+    terms = _terms(query or '')
+    if not terms:
+        return [], False
+
+    searcher = SEARCHERS[backend(db.session.connection())]
+    rows = searcher(terms, entity_types, offset, limit + 1)
+    results = [{
+        'entity_type': row[1],
+        'entity_id': row[2],
+        'parent_id': row[3],
+        'title': row[4],
+        'snippet': _snippet(row[5], terms),
+        'score': round(float(row[6] or 0), 4),
+    } for row in rows[:limit]]
+    return results, len(rows) > limit
+
+
+@search_cli.command('rebuild')
+def rebuild_command():
+    """Rebuild the search index from the source tables."""
+    count = rebuild_index()
+    click.echo(f'Indexed {count} documents.')
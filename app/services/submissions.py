@@ -0,0 +1,192 @@
+from app import db
+from app.models.inspection import Inspection, InspectionResult, InspectionTemplate
+from app.models.facility import Facility, Area
+from app.services.photos import photo_pipeline
+from app.services.scoring import score_rows
+from app.services.template_cache import template_cache
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+
+SUBMITTABLE_STATUSES = ('in_progress', 'completed', 'flagged')
+MAX_KEY_LENGTH = 64
+
+
+class SubmissionError(Exception):
+    """Raised with a list of human-readable problems in a submission."""
+
+    def __init__(self, errors):
+        super().__init__('; '.join(errors))
+        self.errors = errors
+
+
+def _parse_date(value):
+    if value is None:
+        return datetime.utcnow()
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        raise SubmissionError(['inspection_date must be an ISO 8601 timestamp.'])
+    # Stored naive in UTC like the rest of the schema
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _validate_results(compiled, results):
+    errors = []
+    rows = []
+    seen = set()
+
+    if not isinstance(results, list):
+        raise SubmissionError(['results must be a list.'])
+
+    for index, result in enumerate(results):
+        if not isinstance(result, dict):
+            errors.append(f'results[{index}] must be an object.')
+            continue
+        try:
+            item_id = int(result.get('checklist_item_id'))
+        except (TypeError, ValueError):
+            errors.append(f'results[{index}].checklist_item_id is required.')
+            continue
+
+        item = compiled.items_by_id.get(item_id)
+        if item is None:
+            errors.append(f'results[{index}]: item {item_id} is not part of this template.')
+            continue
+        if item_id in seen:
+            errors.append(f'results[{index}]: item {item_id} was submitted more than once.')
+            continue
+        seen.add(item_id)
+
+        score = result.get('score')
+        if score is not None:
+            try:
+                score = Decimal(str(score))
+            except InvalidOperation:
+                errors.append(f'results[{index}].score must be a number.')
+                continue
+            if not 0 <= score <= item.max_points:
+                errors.append(f'results[{index}].score must be between 0 and {item.max_points}.')
+                continue
+
+        passed = result.get('passed')
+        if passed is not None and not isinstance(passed, bool):
+            errors.append(f'results[{index}].passed must be true or false.')
+            continue
+
+        photo_path = result.get('photo_path') or None
+        if photo_path is not None and not photo_pipeline.exists(photo_path):
+            errors.append(f'results[{index}].photo_path is not an uploaded photo.')
+            continue
+        if item.requires_photo and photo_path is None:
+            errors.append(f'results[{index}]: item {item_id} requires a photo.')
+            continue
+
+        rows.append({
+            'checklist_item_id': item_id,
+            'score': score,
+            'passed': passed,
+            'comments': result.get('comments'),
+            'photo_path': photo_path,
+        })
+
+    if errors:
+        raise SubmissionError(errors)
+    return rows
+
+
+def find_submission(client_key, inspector_id):
+    return Inspection.query.filter_by(client_key=client_key, inspector_id=inspector_id).first()
+
+
+def submit_inspection(payload, inspector):
+    """Validate and store a whole inspection in one transaction.
+
+    Returns ``(inspection, created)``. Replaying a payload with a
+    ``client_key`` that was already stored returns the original inspection
+    with ``created=False`` and writes nothing.
+    """
+    if not isinstance(payload, dict):
+        raise SubmissionError(['Request body must be a JSON object.'])
+
+    client_key = payload.get('client_key')
+    if client_key is not None:
+        client_key = str(client_key)
+        if not client_key or len(client_key) > MAX_KEY_LENGTH:
+            raise SubmissionError([f'client_key must be 1-{MAX_KEY_LENGTH} characters.'])
+        existing = find_submission(client_key, inspector.id)
+        if existing is not None:
+            return existing, False
+
+    errors = []
+    try:
+        template_id = int(payload.get('template_id'))
+        facility_id = int(payload.get('facility_id'))
+    except (TypeError, ValueError):
+        raise SubmissionError(['template_id and facility_id are required.'])
+    area_id = payload.get('area_id')
+    if area_id is not None:
+        try:
+            area_id = int(area_id)
+        except (TypeError, ValueError):
+            errors.append('area_id must be an integer.')
+            area_id = None
+
+    template = db.session.get(InspectionTemplate, template_id)
+    if template is None:
+        errors.append(f'Template {template_id} does not exist.')
+    facility = db.session.get(Facility, facility_id)
+    if facility is None or not facility.active:
+        errors.append(f'Facility {facility_id} does not exist or is inactive.')
+    if area_id is not None:
+        area = db.session.get(Area, area_id)
+        if area is None or area.facility_id != facility_id:
+            errors.append(f'Area {area_id} does not belong to facility {facility_id}.')
+
+    status = payload.get('status', 'completed')
+    if status not in SUBMITTABLE_STATUSES:
+        errors.append(f'status must be one of {", ".join(SUBMITTABLE_STATUSES)}.')
+    if errors:
+        raise SubmissionError(errors)
+
+    inspection_date = _parse_date(payload.get('inspection_date'))
+    rows = _validate_results(template_cache.get(template), payload.get('results', []))
+
+    overall_score = None
+    if rows and status != 'in_progress':
+        overall_score = score_rows([(0, row['checklist_item_id'], row['score'], row['passed'])
+                                    for row in rows]).get(0)
+
+    inspection = Inspection(
+        template_id=template_id,
+        facility_id=facility_id,
+        area_id=area_id,
+        inspector_id=inspector.id,
+        inspection_date=inspection_date,
+        status=status,
+        notes=payload.get('notes'),
+        overall_score=overall_score,
+        completed_at=datetime.utcnow() if status != 'in_progress' else None,
+        client_key=client_key
+    )
+
+    try:
+        db.session.add(inspection)
+        db.session.flush()
+        if rows:
+            for row in rows:
+                row['inspection_id'] = inspection.id
+            db.session.execute(insert(InspectionResult.__table__), rows)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        # A concurrent retry with the same key won the race
+        existing = find_submission(client_key, inspector.id) if client_key else None
+        if existing is None:
+            raise
+        return existing, False
+
+    return inspection, True
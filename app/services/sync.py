@@ -0,0 +1,183 @@
+from app import db
+from app.models.facility import Facility, Area
+from app.models.inspection import InspectionTemplate, ChecklistItem
+from app.models.change_log import ChangeLog
+from flask import current_app
+from sqlalchemy import event, select, insert, func
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+# Entity name on the wire -> (model, serialized columns)
+ENTITIES = {
+    'facility': (Facility, ('id', 'name', 'address', 'active')),
+    'area': (Area, ('id', 'facility_id', 'name', 'area_type')),
+    'template': (InspectionTemplate, ('id', 'name', 'description', 'frequency', 'version')),
+    'checklist_item': (ChecklistItem, ('id', 'template_id', 'category', 'item_description',
+                                       'scoring_type', 'weight', 'requires_photo', 'display_order')),
+}
+ENTITY_BY_MODEL = {model: name for name, (model, _) in ENTITIES.items()}
+
+# Keep IN lists to a size every backend handles comfortably
+CHUNK_SIZE = 1000
+
+_PENDING_KEY = 'sync_changes'
+
+
+def record_changes(connection, entity_type, entity_ids, operation='upsert'):
+    """Append change log rows for writes that bypass the ORM (bulk UPDATEs)."""
+    if not entity_ids:
+        return
+    now = datetime.utcnow()
+    connection.execute(insert(ChangeLog.__table__), [
+        {'entity_type': entity_type, 'entity_id': entity_id, 'operation': operation, 'changed_at': now}
+        for entity_id in entity_ids
+    ])
+
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_catalog_changes(session, flush_context, instances):
+    # Checked before the flush: SQL-expression values (version + 1) no longer
+    # count as modifications once they have been executed
+    changes = session.info.setdefault(_PENDING_KEY, [])
+    for obj in session.dirty:
+        if type(obj) in ENTITY_BY_MODEL and session.is_modified(obj):
+            changes.append((ENTITY_BY_MODEL[type(obj)], obj.id, 'upsert'))
+    for obj in session.deleted:
+        if type(obj) in ENTITY_BY_MODEL:
+            changes.append((ENTITY_BY_MODEL[type(obj)], obj.id, 'delete'))
+
+
+@event.listens_for(db.session, 'after_flush')
+def _log_catalog_changes(session, flush_context):
+    changes = session.info.pop(_PENDING_KEY, [])
+    # New rows only have an id once they are inserted
+    for obj in session.new:
+        if type(obj) in ENTITY_BY_MODEL:
+            changes.append((ENTITY_BY_MODEL[type(obj)], obj.id, 'upsert'))
+
+    if changes:
+        now = datetime.utcnow()
+        session.connection().execute(insert(ChangeLog.__table__), [
+            {'entity_type': entity_type, 'entity_id': entity_id, 'operation': operation, 'changed_at': now}
+            for entity_type, entity_id, operation in changes
+        ])
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_catalog_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _encode(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _columnar(entity_type, rows):
+    columns = ENTITIES[entity_type][1]
+    return {
+        'columns': list(columns),
+        'rows': [[_encode(value) for value in row] for row in rows],
+    }
+
+
+def _select_columns(entity_type):
+    """Select what devices see of ``entity_type``: active facilities and their areas only."""
+    model, columns = ENTITIES[entity_type]
+    query = select(*[getattr(model, column) for column in columns]).order_by(model.id)
+    if entity_type == 'facility':
+        query = query.where(Facility.active.is_(True))
+    elif entity_type == 'area':
+        query = query.join(Facility, Area.facility_id == Facility.id).where(Facility.active.is_(True))
+    return query
+
+
+def _settled_before():
+    # Change log ids are allocated at flush but become visible at commit, so
+    # a lower id can appear after a higher one was read. Rows older than this
+    # belong to transactions that have finished; tokens never pass younger ones.
+    return datetime.utcnow() - timedelta(seconds=current_app.config.get('SYNC_SETTLE_SECONDS', 10))
+
+
+def token_query():
+    """SELECT of the highest change log id that no in-flight transaction can still precede."""
+    return select(ChangeLog.id).where(ChangeLog.changed_at <= _settled_before())\
+        .order_by(ChangeLog.id.desc()).limit(1)
+
+
+def current_token():
+    return db.session.execute(token_query()).scalar() or 0
+
+
+def build_snapshot():
+    """Return the whole active catalog in columnar form plus its sync token."""
+    # Read the token first: anything changed while reading is simply re-sent
+    token = current_token()
+
+    entities = {}
+    for entity_type in ENTITIES:
+        entities[entity_type] = _columnar(entity_type, db.session.execute(_select_columns(entity_type)).all())
+
+    return {'token': token, 'entities': entities}
+
+
+def build_delta(since, limit):
+    """Return the net catalog changes after token ``since``.
+
+    At most ``limit`` change log rows are consumed per call; ``has_more``
+    tells the device to ask again with the returned token. Several changes
+    to one entity collapse into its latest state.
+    """
+    settled_before = _settled_before()
+    log = db.session.execute(
+        select(ChangeLog.id, ChangeLog.entity_type, ChangeLog.entity_id, ChangeLog.operation,
+               ChangeLog.changed_at)
+        .where(ChangeLog.id > since).order_by(ChangeLog.id).limit(limit + 1)
+    ).all()
+    has_more = len(log) > limit
+    log = log[:limit]
+
+    # Recent rows are sent now but sent again next time (see _settled_before)
+    token = max([row.id for row in log if row.changed_at <= settled_before], default=since)
+    has_more = has_more and token > since
+
+    latest = {}
+    for row in log:
+        latest[(row.entity_type, row.entity_id)] = row.operation
+
+    upserts = {entity_type: [] for entity_type in ENTITIES}
+    deleted = {entity_type: [] for entity_type in ENTITIES}
+    for (entity_type, entity_id), operation in latest.items():
+        if entity_type not in ENTITIES:
+            continue
+        (upserts if operation == 'upsert' else deleted)[entity_type].append(entity_id)
+
+    # A facility that was (de)activated takes its areas along
+    facility_ids = upserts['facility']
+    for start in range(0, len(facility_ids), CHUNK_SIZE):
+        area_ids = db.session.execute(
+            select(Area.id).where(Area.facility_id.in_(facility_ids[start:start + CHUNK_SIZE]))
+        ).scalars().all()
+        upserts['area'] = sorted(set(upserts['area']) | set(area_ids))
+
+    entities = {}
+    for entity_type, entity_ids in upserts.items():
+        if not entity_ids:
+            continue
+        model = ENTITIES[entity_type][0]
+        rows = []
+        for start in range(0, len(entity_ids), CHUNK_SIZE):
+            chunk = entity_ids[start:start + CHUNK_SIZE]
+            rows.extend(db.session.execute(_select_columns(entity_type).where(model.id.in_(chunk))).all())
+        entities[entity_type] = _columnar(entity_type, rows)
+        # Rows that no longer exist, or devices no longer see, are reported as deletes
+        missing = set(entity_ids) - {row[0] for row in rows}
+        deleted[entity_type].extend(sorted(missing))
+
+    return {
+        'token': token,
+        'has_more': has_more,
+        'entities': entities,
+        'deleted': {entity_type: ids for entity_type, ids in deleted.items() if ids},
+    }
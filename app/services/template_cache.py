@@ -0,0 +1,112 @@
+from app.models.inspection import ChecklistItem
+from flask import current_app
+from collections import OrderedDict
+import threading
+
+# Highest score a single item can receive, by scoring type
+MAX_POINTS = {
+    'pass_fail': 1,
+    'rating_5': 5,
+    'rating_10': 10,
+}
+
+DEFAULT_CATEGORY = 'General'
+
+# Display order of checklist items everywhere a template is shown or edited
+ITEM_ORDER = (ChecklistItem.display_order, ChecklistItem.category, ChecklistItem.id)
+
+
+class CompiledItem:
+    __slots__ = ('id', 'category', 'item_description', 'scoring_type', 'weight',
+                 'max_points', 'requires_photo', 'display_order')
+
+    def __init__(self, item):
+        object.__setattr__(self, 'id', item.id)
+        object.__setattr__(self, 'category', item.category or DEFAULT_CATEGORY)
+        object.__setattr__(self, 'item_description', item.item_description)
+        object.__setattr__(self, 'scoring_type', item.scoring_type or 'pass_fail')
+        object.__setattr__(self, 'weight', float(item.weight if item.weight is not None else 1))
+        object.__setattr__(self, 'max_points', MAX_POINTS.get(self.scoring_type, 1))
+        object.__setattr__(self, 'requires_photo', bool(item.requires_photo))
+        object.__setattr__(self, 'display_order', item.display_order)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CompiledItem is immutable')
+
+    def __repr__(self):
+        return f'<CompiledItem {self.id}>'
+
+
+class CompiledTemplate:
+    """Read-only checklist of a template at one version.
+
+    ``items`` keeps display order; ``categories`` is a tuple of
+    ``(category, items)`` pairs in order of first appearance.
+    """
+    __slots__ = ('template_id', 'version', 'items', 'categories', 'items_by_id')
+
+    def __init__(self, template_id, version, items):
+        grouped = OrderedDict()
+        for item in items:
+            grouped.setdefault(item.category, []).append(item)
+
+        object.__setattr__(self, 'template_id', template_id)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'items', tuple(items))
+        object.__setattr__(self, 'categories', tuple((name, tuple(group)) for name, group in grouped.items()))
+        object.__setattr__(self, 'items_by_id', {item.id: item for item in items})
+
+    def __setattr__(self, name, value):
+        raise AttributeError('CompiledTemplate is immutable')
+
+    @property
+    def item_count(self):
+        return len(self.items)
+
+    @property
+    def items_by_category(self):
+        return OrderedDict(self.categories)
+
+
+class TemplateCache:
+    """LRU of compiled checklists keyed by ``(template_id, version)``."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _max_size(self):
+        return current_app.config.get('TEMPLATE_CACHE_SIZE', 256)
+
+    def get(self, template):
+        key = (template.id, template.version)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                return compiled
+
+        compiled = compile_template(template.id, template.version)
+        with self._lock:
+            self._entries[key] = compiled
+            while len(self._entries) > self._max_size():
+                self._entries.popitem(last=False)
+        return compiled
+
+    def invalidate(self, template_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == template_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def compile_template(template_id, version):
+    items = ChecklistItem.query.filter_by(template_id=template_id)\
+        .order_by(*ITEM_ORDER).all()
+    return CompiledTemplate(template_id, version, [CompiledItem(item) for item in items])
+
+
+template_cache = TemplateCache()
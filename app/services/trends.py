@@ -0,0 +1,220 @@
+from app import db
+from app.models.inspection import Inspection, InspectionResult, ChecklistItem
+from app.models.rollup import DailyRollup
+from app.services.rollups import TREND_STATUSES
+from app.services.template_cache import MAX_POINTS, DEFAULT_CATEGORY
+from flask import current_app
+from sqlalchemy import select, func, case, or_
+from collections import OrderedDict
+from datetime import date, timedelta
+import threading
+import time
+
+BUCKETS = ('day', 'week', 'month')
+FILTER_COLUMNS = ('facility_id', 'area_id', 'template_id')
+
+
+def bucket_expression(column, bucket, dialect):
+    """SQL expression truncating ``column`` to the ISO date that starts its bucket.
+
+    Weeks start on Monday. SQLite and MySQL are supported.
+    """
+    if bucket == 'day':
+        return func.date(column)
+    if dialect == 'sqlite':
+        if bucket == 'week':
+            return func.date(column, 'weekday 0', '-6 days')
+        return func.strftime('%Y-%m-01', column)
+    if bucket == 'week':
+        return func.date(func.subdate(column, func.weekday(column)))
+    return func.date_format(column, '%Y-%m-01')
+
+
+def parse_trend_args(args):
+    """Validate query string arguments; raises ``ValueError`` with a message."""
+    try:
+        end = date.fromisoformat(args['end']) if args.get('end') else date.today() + timedelta(days=1)
+        start = date.fromisoformat(args['start']) if args.get('start') else end - timedelta(days=365)
+    except ValueError:
+        raise ValueError('start and end must be YYYY-MM-DD dates')
+    if start >= end:
+        raise ValueError('start must be before end')
+
+    bucket = args.get('bucket', 'week')
+    if bucket not in BUCKETS:
+        raise ValueError(f'bucket must be one of {", ".join(BUCKETS)}')
+
+    max_points = current_app.config.get('TRENDS_MAX_POINTS', 1000)
+    points = args.get('points', current_app.config.get('TRENDS_DEFAULT_POINTS', 120), type=int)
+    if not points or points < 1:
+        raise ValueError('points must be a positive integer')
+
+    filters = {}
+    for column in FILTER_COLUMNS:
+        value = args.get(column, type=int)
+        if value:
+            filters[column] = value
+
+    return {
+        'start': start,
+        'end': end,
+        'bucket': bucket,
+        'points': min(points, max_points),
+        'category': args.get('category') or None,
+        'filters': filters,
+    }
+
+
+def _score_series(start, end, bucket, filters, dialect):
+    """Overall scores per bucket, read from the daily rollups."""
+    table = DailyRollup.__table__
+    label = bucket_expression(table.c.day, bucket, dialect).label('bucket')
+    conditions = [table.c.day >= start, table.c.day < end, table.c.score_count > 0]
+    conditions += [table.c[column] == value for column, value in filters.items()]
+    return db.session.execute(
+        select(label, func.sum(table.c.score_sum), func.sum(table.c.score_count), func.sum(table.c.score_count))
+        .where(*conditions).group_by(label).order_by(label)
+    ).all()
+
+
+def _category_series(start, end, bucket, filters, category, dialect):
+    """Weighted category percentages per bucket, computed from item results.
+
+    Mirrors ``scoring.score_rows``: pass/fail items earn 1 or 0, ratings earn
+    ``score / max_points`` and unanswered items are left out. The count is of
+    inspections with an answered item in the category, not of results.
+    """
+    scoring_type = func.coalesce(ChecklistItem.scoring_type, 'pass_fail')
+    max_points = case(*[(scoring_type == name, points) for name, points in MAX_POINTS.items()], else_=1)
+    is_pass_fail = scoring_type == 'pass_fail'
+    score = InspectionResult.score
+
+    pass_ratio = case((InspectionResult.passed.is_(True), 1.0),
+                      (InspectionResult.passed.is_(False), 0.0),
+                      (score > 0, 1.0), else_=0.0)
+    rating_ratio = case((score >= max_points, 1.0), (score <= 0, 0.0), else_=score * 1.0 / max_points)
+    answered = case((is_pass_fail, or_(InspectionResult.passed.isnot(None), score.isnot(None))),
+                    else_=score.isnot(None))
+    weight = func.coalesce(ChecklistItem.weight, 1)
+    ratio = case((is_pass_fail, pass_ratio), else_=rating_ratio)
+
+    label = bucket_expression(Inspection.inspection_date, bucket, dialect).label('bucket')
+    conditions = [Inspection.status.in_(TREND_STATUSES),
+                  Inspection.inspection_date >= start, Inspection.inspection_date < end,
+                  func.coalesce(ChecklistItem.category, DEFAULT_CATEGORY) == category, answered]
+    conditions += [getattr(Inspection, column) == value for column, value in filters.items()]
+
+    return db.session.execute(
+        select(label, func.sum(weight * ratio * 100), func.sum(weight),
+               func.count(func.distinct(InspectionResult.inspection_id)))
+        .select_from(InspectionResult)
+        .join(Inspection, InspectionResult.inspection_id == Inspection.id)
+        .join(ChecklistItem, InspectionResult.checklist_item_id == ChecklistItem.id)
+        .where(*conditions).group_by(label).order_by(label)
+    ).all()
+
+
+def downsample(labels, numerators, denominators, counts, points):
+    """Merge adjacent buckets so at most ``points`` remain.
+
+    Groups are combined by summing numerators and denominators, so each
+    merged point is the weighted mean of the buckets it replaces and is
+    labelled with the first of them.
+    """
+    # numpy is imported on first use so it does not slow down app start-up
+    import numpy as np
+
+    if len(labels) <= points:
+        return labels, numerators, denominators, counts
+    size = -(-len(labels) // points)
+    starts = np.arange(0, len(labels), size)
+    return ([labels[i] for i in starts],
+            np.add.reduceat(numerators, starts),
+            np.add.reduceat(denominators, starts),
+            np.add.reduceat(counts, starts))
+
+
+def build_trend(params):
+    """Return a columnar trend series for parsed ``params``.
+
+    ``count`` is the number of scored inspections behind each point, in the
+    overall and the category series alike.
+    """
+    import numpy as np
+
+    dialect = db.session.get_bind().dialect.name
+    if params['category']:
+        rows = _category_series(params['start'], params['end'], params['bucket'],
+                                params['filters'], params['category'], dialect)
+    else:
+        rows = _score_series(params['start'], params['end'], params['bucket'], params['filters'], dialect)
+
+    labels = [str(row[0])[:10] for row in rows]
+    numerators = np.array([float(row[1] or 0) for row in rows])
+    denominators = np.array([float(row[2] or 0) for row in rows])
+    counts = np.array([int(row[3] or 0) for row in rows], dtype=np.int64)
+    bucket_count = len(labels)
+
+    labels, numerators, denominators, counts = downsample(
+        labels, numerators, denominators, counts, params['points'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where(denominators > 0, np.round(numerators / denominators, 2), np.nan)
+
+    return {
+        'bucket': params['bucket'],
+        'start': params['start'].isoformat(),
+        'end': params['end'].isoformat(),
+        'category': params['category'],
+        'downsampled': len(labels) < bucket_count,
+        'series': {
+            't': labels,
+            'score': [None if np.isnan(value) else float(value) for value in scores],
+            'count': counts.tolist(),
+        },
+    }
+
+
+class TrendCache:
+    """Small LRU of trend payloads whose entries expire after ``TRENDS_CACHE_TTL`` seconds."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        ttl = current_app.config.get('TRENDS_CACHE_TTL', 300)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > current_app.config.get('TRENDS_CACHE_SIZE', 256):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+trend_cache = TrendCache()
+
+
+def get_trend(params):
+    """``build_trend`` served through the TTL cache."""
+    key = (params['start'], params['end'], params['bucket'], params['points'],
+           params['category'], tuple(sorted(params['filters'].items())))
+    payload = trend_cache.get(key)
+    if payload is None:
+        payload = build_trend(params)
+        trend_cache.set(key, payload)
+    return payload
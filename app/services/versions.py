@@ -0,0 +1,68 @@
+from app import db
+from app.models.facility import Facility, Area
+from app.models.inspection import InspectionTemplate, Inspection
+from app.models.change_log import ChangeLog
+from app.services.sync import token_query
+from sqlalchemy import select, func, and_
+
+# Version stamps for conditional GETs (app.utils.http_cache.conditional).
+# Each returns ``(version, last_modified)`` from a single indexed query, or
+# None when the entity does not exist so the view can produce its 404.
+# ``last_modified`` is None when part of the page has no timestamp to go by.
+
+
+def entity_changes(entity_type, entity_id):
+    """Latest change log id of one entity; ``entity_id`` may be a column to correlate on."""
+    return select(func.coalesce(func.max(ChangeLog.id), 0))\
+        .where(ChangeLog.entity_type == entity_type, ChangeLog.entity_id == entity_id)\
+        .scalar_subquery()
+
+
+def catalog_version():
+    """Stamp of the whole catalog: the latest change log row and the sync token.
+
+    The latest id moves with every edit, but a transaction holding a lower
+    id can commit after a higher one is visible without moving it. The
+    settled sync token passes such a row once it settles, so the stamp
+    changes then. There is no timestamp to go by for the same reason.
+    """
+    row = db.session.execute(
+        select(ChangeLog.id, token_query().correlate(None).scalar_subquery()).order_by(ChangeLog.id.desc()).limit(1)
+    ).first()
+    if row is None:
+        return (0, 0), None
+    return (row[0], row[1] or 0), None
+
+
+def facility_version(facility_id):
+    """Stamp of a facility page: the facility, its areas and their inspection counts."""
+    area_changes = select(func.coalesce(func.max(ChangeLog.id), 0))\
+        .select_from(Area)\
+        .join(ChangeLog, and_(ChangeLog.entity_type == 'area', ChangeLog.entity_id == Area.id))\
+        .where(Area.facility_id == facility_id).scalar_subquery()
+    # Counts catch deleted areas, whose change rows no longer join
+    area_count = select(func.count(Area.id)).where(Area.facility_id == facility_id).scalar_subquery()
+    inspection_count = select(func.count(Inspection.id))\
+        .where(Inspection.facility_id == facility_id).scalar_subquery()
+
+    row = db.session.execute(
+        select(entity_changes('facility', facility_id), area_changes, area_count, inspection_count)
+        .where(Facility.id == facility_id)
+    ).first()
+    if row is None:
+        return None
+    return tuple(row), None
+
+
+def template_version(template_id):
+    """Stamp of a template page; item edits bump ``InspectionTemplate.version``."""
+    inspection_count = select(func.count(Inspection.id))\
+        .where(Inspection.template_id == template_id).scalar_subquery()
+
+    row = db.session.execute(
+        select(InspectionTemplate.version, entity_changes('template', template_id), inspection_count)
+        .where(InspectionTemplate.id == template_id)
+    ).first()
+    if row is None:
+        return None
+    return tuple(row), None
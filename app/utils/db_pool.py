@@ -0,0 +1,150 @@
+from flask import g, request, has_request_context, current_app, jsonify
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from collections import deque
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def engine_options(config):
+    """Build ``SQLALCHEMY_ENGINE_OPTIONS`` from the ``DB_POOL_*`` settings.
+
+    Values already present in ``SQLALCHEMY_ENGINE_OPTIONS`` win. In-memory
+    SQLite keeps Flask-SQLAlchemy's single shared connection.
+    """
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options.setdefault('pool_pre_ping', config.get('DB_POOL_PRE_PING', True))
+
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return options
+
+    options.setdefault('poolclass', MonitoredQueuePool)
+    options.setdefault('pool_size', config.get('DB_POOL_SIZE', 5))
+    options.setdefault('max_overflow', config.get('DB_MAX_OVERFLOW', 10))
+    options.setdefault('pool_timeout', config.get('DB_POOL_TIMEOUT', 10))
+    options.setdefault('pool_recycle', config.get('DB_POOL_RECYCLE', 280))
+
+    if url.get_backend_name() == 'mysql':
+        connect_args = dict(options.get('connect_args') or {})
+        connect_args.setdefault('connect_timeout', config.get('DB_CONNECT_TIMEOUT', 10))
+        if config.get('DB_READ_TIMEOUT'):
+            connect_args.setdefault('read_timeout', config['DB_READ_TIMEOUT'])
+            connect_args.setdefault('write_timeout', config['DB_READ_TIMEOUT'])
+        options['connect_args'] = connect_args
+    return options
+
+
+class MonitoredQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited to :data:`pool_monitor`."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_monitor.record_timeout()
+            raise
+        finally:
+            pool_monitor.record_wait((time.perf_counter() - started) * 1000)
+
+
+class PoolMonitor:
+    """Checkout wait times, pool events and a 503 for exhausted pools.
+
+    Waits longer than ``DB_POOL_SLOW_CHECKOUT_MS`` are logged with the
+    endpoint that paid for them; the last ``DB_POOL_WINDOW`` waits feed the
+    percentiles in :meth:`status`.
+    """
+
+    def __init__(self):
+        self._waits = deque(maxlen=1000)
+        self._counters = {'checkouts': 0, 'connects': 0, 'invalidated': 0, 'timeouts': 0}
+        self._lock = threading.Lock()
+        self._slow_ms = 100
+
+    def init_app(self, app):
+        from sqlalchemy import event
+        from app import db
+
+        self._slow_ms = app.config.get('DB_POOL_SLOW_CHECKOUT_MS', 100)
+        self._waits = deque(self._waits, maxlen=app.config.get('DB_POOL_WINDOW', 1000))
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'connect', lambda *args: self._count('connects'))
+        event.listen(engine, 'invalidate', lambda *args: self._count('invalidated'))
+
+        app.after_request(self._add_timing_header)
+        app.register_error_handler(PoolTimeoutError, self._pool_exhausted)
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def record_wait(self, elapsed_ms):
+        with self._lock:
+            self._counters['checkouts'] += 1
+            self._waits.append(elapsed_ms)
+        if has_request_context():
+            g._pool_wait_ms = g.get('_pool_wait_ms', 0.0) + elapsed_ms
+            if elapsed_ms >= self._slow_ms:
+                logger.warning('Slow connection checkout (%.1f ms) in %s', elapsed_ms, request.endpoint)
+
+    def record_timeout(self):
+        self._count('timeouts')
+
+    def _add_timing_header(self, response):
+        waited = g.get('_pool_wait_ms')
+        if waited is not None:
+            timing = f'pool;dur={waited:.1f}'
+            existing = response.headers.get('Server-Timing')
+            response.headers['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+        return response
+
+    def _pool_exhausted(self, error):
+        logger.error('Connection pool exhausted in %s: %s', request.endpoint, error)
+        response = jsonify({'success': False, 'error': 'The server is busy, please retry shortly.'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(current_app.config.get('DB_POOL_TIMEOUT', 10))
+        return response
+
+    def status(self, engine):
+        """Current pool occupancy plus counters and checkout wait percentiles."""
+        pool = engine.pool
+        with self._lock:
+            waits = sorted(self._waits)
+            counters = dict(self._counters)
+
+        def percentile(p):
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(len(waits) * p / 100))], 3)
+
+        status = {
+            'pool_class': type(pool).__name__,
+            'counters': counters,
+            'checkout_wait_ms': {f'p{p}': percentile(p) for p in (50, 90, 95, 99)},
+            'checkout_wait_samples': len(waits),
+        }
+        if isinstance(pool, QueuePool):
+            size, overflow = pool.size(), pool._max_overflow
+            checked_out = pool.checkedout()
+            status.update({
+                'size': size,
+                'max_overflow': overflow,
+                'timeout': pool.timeout(),
+                'recycle': pool._recycle,
+                'checked_in': pool.checkedin(),
+                'checked_out': checked_out,
+                'overflow': pool.overflow(),
+                'utilization': round(checked_out / (size + overflow), 3) if size + overflow > 0 else None,
+            })
+        return status
+
+
+pool_monitor = PoolMonitor()
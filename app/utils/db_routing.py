@@ -0,0 +1,160 @@
+from flask import g, request, session, has_request_context, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.sql import Select, CompoundSelect
+from sqlalchemy.sql.dml import UpdateBase
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+REPLICA_BIND = 'replica'
+_STICKY_KEY = '_db_primary_until'
+
+
+class RoutingSession(Session):
+    """Session that sends eligible SELECTs to the ``replica`` bind.
+
+    A SELECT goes to the replica when the request was marked with
+    :func:`replica_reads` (or the code is inside :func:`use_replica`), or
+    the statement itself carries ``execution_options(replica=True)``.
+    Everything else stays on the primary, as does every read once this
+    session has written, so a request always sees its own writes.
+    ``execution_options(replica=False)`` forces the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and clause is not None:
+            if isinstance(clause, UpdateBase):
+                self.info['_wrote'] = True
+            elif self._use_replica(clause):
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause):
+        if REPLICA_BIND not in self._db.engines or self.info.get('_wrote'):
+            return False
+        if not isinstance(clause, (Select, CompoundSelect)) or getattr(clause, '_for_update_arg', None) is not None:
+            return False
+
+        requested = clause._execution_options.get('replica')
+        if requested is None:
+            requested = self.info.get('_replica_depth', 0) > 0 or \
+                (has_request_context() and g.get('_replica_reads', False))
+        return bool(requested) and replica_monitor.healthy(self._db)
+
+
+def _mark_written(session, flush_context, instances):
+    session.info['_wrote'] = True
+
+
+def replica_reads(f):
+    """Mark a view whose queries may be served by the read replica."""
+    f._replica_reads = True
+    return f
+
+
+@contextmanager
+def use_replica(session=None):
+    """Route SELECTs inside the block to the replica (subject to the usual checks)."""
+    from app import db
+    session = session or db.session()
+    session.info['_replica_depth'] = session.info.get('_replica_depth', 0) + 1
+    try:
+        yield session
+    finally:
+        session.info['_replica_depth'] -= 1
+
+
+class ReplicaMonitor:
+    """Tracks replica lag and pins writers to the primary.
+
+    Lag is probed at most every ``REPLICA_LAG_CHECK_SECONDS``. On MySQL it
+    is ``Seconds_Behind_Source`` from the replica; elsewhere it is the age
+    of the oldest ``change_log`` row the replica has not seen yet. When lag
+    exceeds ``REPLICA_MAX_LAG_SECONDS``, or the probe fails, reads fall back
+    to the primary. After a request writes, the same browser session reads
+    from the primary for ``REPLICA_STICKY_SECONDS`` so redirects after a
+    POST do not show stale data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._lag = None
+
+    def init_app(self, app):
+        from sqlalchemy import event
+        from app import db
+
+        event.listen(db.session, 'before_flush', _mark_written)
+        app.before_request(self._route_request)
+        app.after_request(self._pin_writers)
+
+    def _route_request(self):
+        view = current_app.view_functions.get(request.endpoint)
+        if not getattr(view, '_replica_reads', False) or request.method not in ('GET', 'HEAD'):
+            return
+        if session.get(_STICKY_KEY, 0) > time.time():
+            return
+        g._replica_reads = True
+
+    def _pin_writers(self, response):
+        from app import db
+        if db.session().info.get('_wrote'):
+            session[_STICKY_KEY] = time.time() + current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+        return response
+
+    def lag(self, db):
+        """Replica lag in seconds (cached); ``None`` when it cannot be measured."""
+        interval = current_app.config.get('REPLICA_LAG_CHECK_SECONDS', 5)
+        with self._lock:
+            if time.monotonic() - self._checked_at < interval:
+                return self._lag
+            self._checked_at = time.monotonic()
+        try:
+            lag = self._probe(db.engines[None], db.engines[REPLICA_BIND])
+        except Exception as e:
+            logger.warning('Replica lag probe failed, reading from the primary: %s', e)
+            lag = None
+        with self._lock:
+            self._lag = lag
+        return lag
+
+    def healthy(self, db):
+        lag = self.lag(db)
+        return lag is not None and lag <= current_app.config.get('REPLICA_MAX_LAG_SECONDS', 5)
+
+    def reset(self):
+        with self._lock:
+            self._checked_at = 0.0
+            self._lag = None
+
+    @staticmethod
+    def _probe(primary, replica):
+        if replica.dialect.name in ('mysql', 'mariadb'):
+            with replica.connect() as connection:
+                row = connection.execute(text('SHOW REPLICA STATUS')).mappings().first()
+            if row is None:
+                # Not a replica at all, so it cannot lag
+                return 0.0
+            lag = row.get('Seconds_Behind_Source')
+            return float(lag) if lag is not None else None
+
+        with replica.connect() as connection:
+            seen = connection.execute(text('SELECT MAX(id) FROM change_log')).scalar() or 0
+        with primary.connect() as connection:
+            oldest_missing = connection.execute(
+                text('SELECT MIN(changed_at) FROM change_log WHERE id > :seen'), {'seen': seen}).scalar()
+        if oldest_missing is None:
+            return 0.0
+        if isinstance(oldest_missing, str):
+            oldest_missing = datetime.fromisoformat(oldest_missing)
+        return max(0.0, (datetime.utcnow() - oldest_missing).total_seconds())
+
+
+replica_monitor = ReplicaMonitor()
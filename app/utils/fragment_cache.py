@@ -0,0 +1,154 @@
+from app import db
+from jinja2 import nodes
+from jinja2.ext import Extension
+from jinja2.exceptions import TemplateSyntaxError
+from markupsafe import Markup
+from sqlalchemy import event
+from collections import OrderedDict, defaultdict
+import sys
+import threading
+
+_PENDING_KEY = 'fragment_changes'
+
+
+class FragmentCache:
+    """Memory-bounded LRU of rendered template fragments.
+
+    Templates mark a fragment with ``{% cache 'Model', id, version... %}``
+    ... ``{% endcache %}``. The entry is keyed by the template location, the
+    entity and the version values, so a bumped version misses in every
+    worker. Committed changes to a watched model drop that entity's entries,
+    but only in the process that committed them: other workers keep their
+    copies, so correctness across workers depends entirely on the version
+    values changing with whatever the fragment shows.
+    ``FRAGMENT_CACHE_MAX_BYTES`` bounds the total size of the cached HTML.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.max_bytes = 16 * 1024 * 1024
+        self._entries = OrderedDict()
+        self._by_entity = defaultdict(set)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._watched = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('FRAGMENT_CACHE_ENABLED', True)
+        self.max_bytes = app.config.get('FRAGMENT_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+        app.jinja_env.add_extension(FragmentCacheExtension)
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_entity.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'max_bytes': self.max_bytes}
+
+    def _remove(self, key):
+        html = self._entries.pop(key, None)
+        if html is None:
+            return
+        self._size -= sys.getsizeof(html)
+        keys = self._by_entity.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_entity[key[1]]
+
+    def render(self, site, entity, version, caller):
+        if not self.enabled:
+            return caller()
+
+        key = (site, entity, version)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                return Markup(html)
+
+        html = str(caller())
+        size = sys.getsizeof(html)
+        if size > self.max_bytes:
+            return Markup(html)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = html
+            self._by_entity[entity].add(key)
+            self._size += size
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return Markup(html)
+
+    def invalidate(self, entities):
+        with self._lock:
+            for entity in entities:
+                for key in list(self._by_entity.get(entity, ())):
+                    self._remove(key)
+
+    def watch(self, model, entity=None):
+        """Drop cached fragments of ``model`` rows once changes to them are committed.
+
+        ``entity`` maps a changed row to the ``(name, id)`` its fragments are
+        cached under; by default the row itself. Child rows pass their parent
+        so, e.g., an edited area refreshes its facility's fragments.
+        """
+        self._watched[model] = entity or (lambda obj: (model.__name__, obj.id))
+        return model
+
+    def _changed_entities(self, session):
+        changed = set()
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            entity = self._watched.get(type(obj))
+            if entity is not None:
+                changed.add(entity(obj))
+        return changed
+
+
+fragment_cache = FragmentCache()
+
+
+@event.listens_for(db.session, 'after_flush')
+def _collect_fragment_changes(session, flush_context):
+    changed = fragment_cache._changed_entities(session)
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_fragments(session):
+    changed = session.info.pop(_PENDING_KEY, None)
+    if changed:
+        fragment_cache.invalidate(changed)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_fragment_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+class FragmentCacheExtension(Extension):
+    """``{% cache 'Model', id, version... %}...{% endcache %}``"""
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            args.append(parser.parse_expression())
+        if len(args) < 2:
+            raise TemplateSyntaxError('cache needs a model name and an id', lineno, parser.name, parser.filename)
+        body = parser.parse_statements(['name:endcache'], drop_needle=True)
+
+        site = nodes.Const(f'{parser.name}:{lineno}')
+        call = self.call_method('_render', [site, nodes.Tuple(args[:2], 'load'), nodes.Tuple(args[2:], 'load')])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render(self, site, entity, version, caller):
+        return fragment_cache.render(site, entity, version, caller)
@@ -0,0 +1,67 @@
+from flask import request, session, current_app, make_response
+from flask_login import current_user
+from functools import wraps
+import hashlib
+
+
+def _etag(version):
+    # Pages differ per user (navbar, role-only buttons) and per query string
+    # (pagination cursors); the salt changes every tag after a release
+    parts = (
+        current_app.config.get('ETAG_SALT', ''),
+        request.endpoint,
+        request.full_path,
+        current_user.get_id() if current_user.is_authenticated else '',
+        getattr(current_user, 'role', ''),
+        repr(version),
+    )
+    return hashlib.sha1('\x1f'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def conditional(stamp):
+    """Answer GET/HEAD with ``304 Not Modified`` when the client's copy is current.
+
+    ``stamp`` receives the view arguments and returns ``(version,
+    last_modified)`` (see :mod:`app.services.versions`) or None to just run
+    the view. The ETag is derived from the version, so a matching
+    ``If-None-Match`` returns before the view queries anything or renders.
+    Place it below ``@login_required``.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Pending flash messages belong to this render only
+            if request.method not in ('GET', 'HEAD') or session.get('_flashes'):
+                return f(*args, **kwargs)
+
+            stamped = stamp(**kwargs)
+            if stamped is None:
+                return f(*args, **kwargs)
+            version, last_modified = stamped
+            etag = _etag(version)
+
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Browsers may keep the page but must revalidate it; Vary keeps
+            # shared caches from mixing users
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Cookie')
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,130 @@
+from flask import current_app, request, abort
+from sqlalchemy import and_, or_
+from sqlalchemy.engine import Row
+from datetime import datetime, date
+import base64
+import json
+
+
+class KeysetPage:
+    """One page of a keyset-paginated query plus the cursors around it."""
+
+    def __init__(self, items, next_cursor, prev_cursor, per_page):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.per_page = per_page
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value):
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return value
+
+
+def encode_cursor(direction, values):
+    payload = json.dumps([direction] + [_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, columns):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, *values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if direction not in ('next', 'prev') or len(values) != len(columns):
+            raise ValueError(cursor)
+        return direction, [_decode_value(c, v) for c, v in zip(columns, values)]
+    except (ValueError, TypeError):
+        abort(400, description='Invalid pagination cursor.')
+
+
+def _seek_condition(columns, values, forward):
+    # (a, b) > (x, y) expanded as a >= x AND (a > x OR (a = x AND b > y)) so the
+    # leading column can drive an index range scan on every backend
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        step = column > values[i] if forward else column < values[i]
+        clauses.append(and_(*equal, step))
+    lead = columns[0] >= values[0] if forward else columns[0] <= values[0]
+    return and_(lead, or_(*clauses))
+
+
+def _key_values(row, columns):
+    entity = row[0] if isinstance(row, Row) else row
+    return [getattr(entity, column.key) for column in columns]
+
+
+def get_per_page():
+    default = current_app.config.get('PER_PAGE', 50)
+    maximum = current_app.config.get('MAX_PER_PAGE', 200)
+    per_page = request.args.get('per_page', default, type=int)
+    return max(1, min(per_page, maximum))
+
+
+def paginate_keyset(query, columns, descending=False, cursor=None, per_page=None):
+    """Return a :class:`KeysetPage` of ``query`` ordered by ``columns``.
+
+    ``columns`` must end in a unique column (normally the primary key) so the
+    ordering is total, and must not hold NULLs: a NULL key never satisfies
+    the seek condition, so its row would be skipped. Each page seeks past the previous one on the sort key
+    instead of using OFFSET, so deep pages cost the same as the first.
+    ``cursor`` and ``per_page`` default to the ``cursor``/``per_page`` query
+    string arguments.
+    """
+    if cursor is None:
+        cursor = request.args.get('cursor')
+    if per_page is None:
+        per_page = get_per_page()
+
+    direction, values = ('next', None)
+    if cursor:
+        direction, values = decode_cursor(cursor, columns)
+
+    # Walking backwards reverses the sort, then the page is flipped back
+    forward = (direction == 'next') != descending
+    if values is not None:
+        query = query.filter(_seek_condition(columns, values, forward))
+    query = query.order_by(*[c.asc() if forward else c.desc() for c in columns])
+
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == 'prev':
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more or direction == 'prev':
+            next_cursor = encode_cursor('next', _key_values(rows[-1], columns))
+        if cursor and (has_more or direction == 'next'):
+            prev_cursor = encode_cursor('prev', _key_values(rows[0], columns))
+    return KeysetPage(rows, next_cursor, prev_cursor, per_page)
@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import os
+import threading
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def get_executor(name, kind='thread', workers=2):
+    """Return the named worker pool for this process, creating it on first use.
+
+    Pools don't survive fork, so a pool inherited from a pre-fork master is
+    replaced in each worker process.
+    """
+    with _lock:
+        entry = _pools.get(name)
+        if entry is None or entry[0] != os.getpid():
+            if kind == 'process':
+                executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            entry = (os.getpid(), executor)
+            _pools[name] = entry
+        return entry[1]
+
+
+def reset_executor(name):
+    with _lock:
+        entry = _pools.pop(name, None)
+    if entry is not None and entry[0] == os.getpid():
+        entry[1].shutdown(wait=False)
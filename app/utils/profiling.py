@@ -0,0 +1,151 @@
+from flask import g, request, has_app_context, has_request_context, current_app, before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from collections import defaultdict, deque
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+PERCENTILES = (50, 90, 95, 99)
+METRICS = ('wall_ms', 'sql_count', 'sql_ms', 'render_ms')
+
+
+class RequestProfile:
+    __slots__ = ('start', 'sql_count', 'sql_ms', 'render_ms', 'statements', 'render_starts')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_ms = 0.0
+        self.render_ms = 0.0
+        self.statements = []
+        self.render_starts = []
+
+
+class RequestProfiler:
+    """Opt-in per-request timing of wall clock, SQL and template rendering.
+
+    Enabled with ``PROFILING_ENABLED``. Each request gets a ``Server-Timing``
+    header; requests slower than ``PROFILING_SLOW_REQUEST_MS`` are logged with
+    their slowest statements and queries over ``PROFILING_SLOW_QUERY_MS`` are
+    logged as they finish. The last ``PROFILING_WINDOW`` samples per endpoint
+    feed :meth:`summary`.
+    """
+
+    def __init__(self):
+        self._samples = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._engine_hooked = False
+
+    def init_app(self, app):
+        if not app.config.get('PROFILING_ENABLED'):
+            return
+        self._hook_engine()
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        before_render_template.connect(self._start_render, app)
+        template_rendered.connect(self._finish_render, app)
+
+    def _hook_engine(self):
+        # Listening on the Engine class covers every engine and bind
+        if self._engine_hooked:
+            return
+        event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+        self._engine_hooked = True
+
+    @staticmethod
+    def _profile():
+        return g.get('_request_profile') if has_request_context() else None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_starts', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_starts')
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+
+        profile = self._profile()
+        if profile is not None:
+            profile.sql_count += 1
+            profile.sql_ms += elapsed_ms
+            profile.statements.append((elapsed_ms, statement))
+
+        if has_app_context() and elapsed_ms >= current_app.config.get('PROFILING_SLOW_QUERY_MS', 100):
+            logger.warning('Slow query (%.1f ms)%s: %s', elapsed_ms,
+                           f' in {request.endpoint}' if has_request_context() else '', statement)
+
+    def _start_render(self, sender, template, context, **extra):
+        profile = self._profile()
+        if profile is not None:
+            profile.render_starts.append(time.perf_counter())
+
+    def _finish_render(self, sender, template, context, **extra):
+        profile = self._profile()
+        if profile is not None and profile.render_starts:
+            started = profile.render_starts.pop()
+            # Only the outermost render counts, nested ones are already inside it
+            if not profile.render_starts:
+                profile.render_ms += (time.perf_counter() - started) * 1000
+
+    def _start_request(self):
+        g._request_profile = RequestProfile()
+
+    def _finish_request(self, response):
+        profile = g.pop('_request_profile', None)
+        if profile is None:
+            return response
+
+        wall_ms = (time.perf_counter() - profile.start) * 1000
+        endpoint = request.endpoint or 'unmatched'
+        self.record(endpoint, (wall_ms, profile.sql_count, profile.sql_ms, profile.render_ms))
+
+        response.headers['Server-Timing'] = ', '.join([
+            f'sql;dur={profile.sql_ms:.1f};desc="{profile.sql_count} queries"',
+            f'render;dur={profile.render_ms:.1f}',
+            f'total;dur={wall_ms:.1f}',
+        ])
+
+        if wall_ms >= current_app.config.get('PROFILING_SLOW_REQUEST_MS', 500):
+            slowest = sorted(profile.statements, key=lambda item: item[0], reverse=True)[:5]
+            logger.warning('Slow request %s %s -> %s: %.1f ms total, %d queries in %.1f ms, render %.1f ms%s',
+                           request.method, request.path, endpoint, wall_ms, profile.sql_count,
+                           profile.sql_ms, profile.render_ms,
+                           ''.join(f'\n  {ms:.1f} ms  {statement}' for ms, statement in slowest))
+        return response
+
+    def record(self, endpoint, sample):
+        window = current_app.config.get('PROFILING_WINDOW', 1000)
+        with self._lock:
+            samples = self._samples[endpoint]
+            samples.append(sample)
+            while len(samples) > window:
+                samples.popleft()
+
+    def summary(self):
+        """Per-endpoint request counts and percentiles of every metric."""
+        # numpy is only needed when the stats are read
+        import numpy as np
+
+        with self._lock:
+            snapshot = {endpoint: np.array(samples) for endpoint, samples in self._samples.items() if samples}
+
+        result = {}
+        for endpoint, samples in sorted(snapshot.items()):
+            stats = {'count': len(samples)}
+            for index, metric in enumerate(METRICS):
+                values = np.percentile(samples[:, index], PERCENTILES)
+                stats[metric] = {f'p{p}': round(float(value), 2) for p, value in zip(PERCENTILES, values)}
+            result[endpoint] = stats
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+
+profiler = RequestProfiler()
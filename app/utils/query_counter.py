@@ -0,0 +1,27 @@
+from sqlalchemy import event
+from contextlib import contextmanager
+
+
+@contextmanager
+def count_queries(engine, select_only=False):
+    """Record every statement ``engine`` executes inside the block.
+
+    Yields a list of ``(statement, parameters)`` tuples, so callers can assert
+    on ``len(statements)`` or inspect the SQL itself::
+
+        with count_queries(db.engine) as statements:
+            client.get('/facilities/')
+        assert len(statements) <= 3
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if select_only and not statement.lstrip().upper().startswith('SELECT'):
+            return
+        statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
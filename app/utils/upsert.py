@@ -0,0 +1,41 @@
+from sqlalchemy import func, Column
+from sqlalchemy.sql.visitors import iterate
+
+
+def upsert(connection, table, row, key_columns, updates, where=None):
+    """Insert ``row`` or, when its unique key already exists, update that row.
+
+    One statement, so concurrent first writes to the same key cannot both
+    insert. ``updates(proposed)`` returns ``{column: expression}``; inside
+    it ``table.c.x`` is the stored value and ``proposed.x`` the value
+    ``row`` tried to insert. ``where(proposed)`` optionally limits which
+    existing rows are updated.
+    """
+    dialect = connection.dialect.name
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f'upsert is not supported on {dialect}')
+
+    statement = insert(table).values(**row)
+    if dialect != 'mysql':
+        proposed = statement.excluded
+        return connection.execute(statement.on_conflict_do_update(
+            index_elements=list(key_columns), set_=updates(proposed),
+            where=where(proposed) if where is not None else None))
+
+    proposed = statement.inserted
+    assignments = updates(proposed)
+    if where is not None:
+        condition = where(proposed)
+        assignments = {column: func.if_(condition, value, table.c[column])
+                       for column, value in assignments.items()}
+        # MySQL assigns left to right, so columns the condition reads go last
+        read = {element.name for element in iterate(condition)
+                if isinstance(element, Column) and element.table is table}
+        assignments = sorted(assignments.items(), key=lambda item: item[0] in read)
+    else:
+        assignments = list(assignments.items())
+    return connection.execute(statement.on_duplicate_key_update(assignments))
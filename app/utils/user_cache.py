@@ -0,0 +1,191 @@
+from app import db
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from collections import OrderedDict
+from urllib.parse import urlparse
+import os
+import sqlite3
+import threading
+import time
+
+_PENDING_KEY = 'user_cache_invalidations'
+
+
+class FileEpochBackend:
+    """Shares an invalidation epoch between workers through a file's mtime."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if not os.path.exists(path):
+            open(path, 'a').close()
+
+    def current(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def bump(self):
+        now = time.time_ns()
+        # Guarantee a visible change even on coarse mtime filesystems
+        os.utime(self.path, ns=(now, max(now, self.current() + 1)))
+
+
+class SQLiteEpochBackend:
+    """Shares an invalidation epoch between workers through a local SQLite file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS user_cache_epoch (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)')
+            conn.execute('INSERT OR IGNORE INTO user_cache_epoch (id, value) VALUES (1, 0)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def current(self):
+        return self._connect().execute('SELECT value FROM user_cache_epoch WHERE id = 1').fetchone()[0]
+
+    def bump(self):
+        self._connect().execute('UPDATE user_cache_epoch SET value = value + 1 WHERE id = 1')
+
+
+def backend_from_url(url):
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme == 'file':
+        return FileEpochBackend(parsed.path)
+    if parsed.scheme == 'sqlite':
+        return SQLiteEpochBackend(parsed.path)
+    raise ValueError(f'Unsupported USER_CACHE_BACKEND: {url}')
+
+
+class UserCache:
+    """TTL + LRU cache of user column snapshots for the login loader.
+
+    Cached users are rebuilt as detached instances and merged into the
+    request's session with ``load=False``, so ``current_user`` needs no SELECT.
+    Any committed change to a cached model invalidates its entry, and the
+    shared backend clears every other worker's cache on its next lookup.
+    Without a backend other workers would keep a demoted or deleted user
+    until the TTL runs out, so the cache stays off.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 300
+        self.max_size = 1024
+        self.backend = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_CACHE_TTL', 300)
+        self.max_size = app.config.get('USER_CACHE_SIZE', 1024)
+        self.backend = backend_from_url(app.config.get('USER_CACHE_BACKEND'))
+        if self.backend is None:
+            self.ttl = 0
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._epoch = self.backend.current() if self.backend else None
+
+    def _sync_epoch(self):
+        if self.backend is None:
+            return
+        epoch = self.backend.current()
+        if epoch != self._epoch:
+            with self._lock:
+                self._entries.clear()
+                self._epoch = epoch
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return snapshot
+
+    def _put(self, key, snapshot):
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, model, ident, broadcast=True):
+        with self._lock:
+            self._entries.pop((model.__name__, ident), None)
+        if broadcast and self.backend is not None:
+            self.backend.bump()
+            with self._lock:
+                self._epoch = self.backend.current()
+
+    def load(self, model, ident):
+        self._sync_epoch()
+        key = (model.__name__, ident)
+        snapshot = self._get(key)
+
+        if snapshot is None:
+            obj = db.session.get(model, ident)
+            if obj is not None:
+                self._put(key, {attr.key: getattr(obj, attr.key)
+                                for attr in inspect(model).column_attrs})
+            return obj
+
+        # Reuse the instance if this session already loaded it
+        existing = db.session.identity_map.get(inspect(model).identity_key_from_primary_key((ident,)))
+        if existing is not None:
+            return existing
+        obj = model(**snapshot)
+        make_transient_to_detached(obj)
+        return db.session.merge(obj, load=False)
+
+    def watch(self, model):
+        """Invalidate cached ``model`` rows once changes to them are committed."""
+
+        @event.listens_for(db.session, 'after_flush')
+        def _collect(session, flush_context):
+            changed = [obj for obj in list(session.dirty) + list(session.deleted)
+                       if isinstance(obj, model)]
+            if changed:
+                pending = session.info.setdefault((_PENDING_KEY, model), set())
+                pending.update(inspect(obj).identity[0] for obj in changed if inspect(obj).identity)
+
+        @event.listens_for(db.session, 'after_commit')
+        def _invalidate(session):
+            pending = session.info.pop((_PENDING_KEY, model), None)
+            if pending:
+                for ident in pending:
+                    self.invalidate(model, ident, broadcast=False)
+                if self.backend is not None:
+                    self.backend.bump()
+                    with self._lock:
+                        self._epoch = self.backend.current()
+
+        @event.listens_for(db.session, 'after_rollback')
+        def _discard(session):
+            session.info.pop((_PENDING_KEY, model), None)
+
+        return model
+
+
+user_cache = UserCache()
@@ -0,0 +1,164 @@
+"""Seed a dataset and time the main endpoints; see :mod:`benchmarks`."""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('--database', help='SQLAlchemy URL (default: BENCHMARK_DATABASE_URL or instance/benchmark.db)')
+    parser.add_argument('--scale', default='small', help='dataset size: tiny, small, medium or large')
+    parser.add_argument('--skip-seed', action='store_true', help='reuse the data already in the database')
+    parser.add_argument('--iterations', type=int, default=50, help='timed requests per scenario')
+    parser.add_argument('--warmup', type=int, default=5, help='untimed requests per scenario')
+    parser.add_argument('--only', help='comma separated scenario names to run')
+    parser.add_argument('--output', default='benchmark-results.json', help='where to write the JSON results')
+    return parser.parse_args(argv)
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _scenarios(ids):
+    """``(name, role, method, url, request kwargs, expected status)`` tuples."""
+    item_ids = ids['item_ids']
+    move = iter(range(10 ** 9))
+    return [
+        ('auth.login', None, 'POST', lambda: '/auth/login',
+         lambda: {'data': {'username': 'inspector', 'password': ids['password']}}, 302),
+        ('dashboard.index[admin]', 'admin', 'GET', lambda: '/', dict, 200),
+        ('dashboard.index[inspector]', 'inspector', 'GET', lambda: '/', dict, 200),
+        ('facilities.list_facilities', 'admin', 'GET', lambda: '/facilities/', dict, 200),
+        ('facilities.view_facility', 'admin', 'GET', lambda: f'/facilities/{ids["facility_id"]}', dict, 200),
+        ('templates.index', 'admin', 'GET', lambda: '/templates/', dict, 200),
+        ('templates.view_template', 'admin', 'GET', lambda: f'/templates/{ids["template_id"]}', dict, 200),
+        ('templates.reorder_items', 'admin', 'POST', lambda: f'/templates/{ids["template_id"]}/items/reorder',
+         lambda: {'json': {'item_id': item_ids[0], 'position': next(move) % len(item_ids)}}, 200),
+        ('inspections.index', 'supervisor', 'GET', lambda: '/inspections/', dict, 200),
+        ('inspections.due', 'inspector', 'GET', lambda: '/inspections/due', dict, 200),
+        ('reports.trends', 'supervisor', 'GET',
+         lambda: f'/reports/trends?bucket=week&facility_id={ids["facility_id"]}&points={next(move) % 50 + 50}',
+         dict, 200),
+        ('search.api', 'inspector', 'GET', lambda: '/search/api?q=broken+soap', dict, 200),
+        ('sync.changes', 'inspector', 'GET', lambda: '/api/sync/changes?since=0&limit=500', dict, 200),
+    ]
+
+
+def _summarize(timings, query_counts):
+    import numpy as np
+    values = np.array(timings)
+    percentiles = dict(zip(('p50', 'p90', 'p95', 'p99'), np.percentile(values, (50, 90, 95, 99))))
+    return {
+        'iterations': len(timings),
+        'ms': {
+            **{key: round(float(value), 3) for key, value in percentiles.items()},
+            'mean': round(float(values.mean()), 3),
+            'min': round(float(values.min()), 3),
+            'max': round(float(values.max()), 3),
+        },
+        'queries': {
+            'min': min(query_counts),
+            'median': int(np.median(query_counts)),
+            'max': max(query_counts),
+        },
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.database:
+        os.environ['BENCHMARK_DATABASE_URL'] = args.database
+
+    # Imported late so the database URL above is picked up by the config
+    from app import create_app, db
+    from app.models import User, Facility, InspectionTemplate, ChecklistItem
+    from app.utils.query_counter import count_queries
+    from benchmarks.dataset import seed, PASSWORD, SCALES
+
+    if args.scale not in SCALES:
+        sys.exit(f'Unknown scale {args.scale!r}; choose from {", ".join(SCALES)}')
+
+    app = create_app('benchmark')
+    with app.app_context():
+        if args.skip_seed:
+            counts = None
+        else:
+            counts = seed(args.scale, log=lambda message: print(message, file=sys.stderr))
+        users = {user.username: user.id for user in
+                 User.query.filter(User.username.in_(('admin', 'supervisor', 'inspector')))}
+        template_id = db.session.query(db.func.min(InspectionTemplate.id)).scalar()
+        ids = {
+            'users': users,
+            'password': PASSWORD,
+            'facility_id': db.session.query(db.func.min(Facility.id)).scalar(),
+            'template_id': template_id,
+            'item_ids': [row.id for row in ChecklistItem.query.filter_by(template_id=template_id)
+                         .order_by(ChecklistItem.display_order)],
+        }
+        engine = db.engine
+        dialect = engine.dialect.name
+
+    only = set(args.only.split(',')) if args.only else None
+    results = {}
+    for name, role, method, url, request_kwargs, expected in _scenarios(ids):
+        if only and name not in only:
+            continue
+
+        client = app.test_client()
+        if role:
+            with client.session_transaction() as session:
+                session['_user_id'] = str(ids['users'][role])
+                session['_fresh'] = True
+
+        timings, query_counts = [], []
+        for iteration in range(args.warmup + args.iterations):
+            if role is None:
+                # Login is measured from a fresh, anonymous client every time
+                client = app.test_client()
+            target, kwargs = url(), request_kwargs()
+            with count_queries(engine) as statements:
+                started = time.perf_counter()
+                response = client.open(target, method=method, **kwargs)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+            if response.status_code != expected:
+                sys.exit(f'{name}: expected {expected}, got {response.status_code} for {target}')
+            if iteration >= args.warmup:
+                timings.append(elapsed_ms)
+                query_counts.append(len(statements))
+
+        results[name] = _summarize(timings, query_counts)
+        print(f'{name:32} p50 {results[name]["ms"]["p50"]:9.2f} ms  p95 {results[name]["ms"]["p95"]:9.2f} ms  '
+              f'queries {results[name]["queries"]["median"]}', file=sys.stderr)
+
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'git_revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': dialect,
+            'scale': args.scale,
+            'rows': counts,
+            'iterations': args.iterations,
+            'warmup': args.warmup,
+        },
+        'scenarios': results,
+    }
+    with open(args.output, 'w') as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+    print(f'Wrote {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compare two benchmark result files.
+
+    python -m benchmarks.compare before.json after.json [--threshold 10]
+
+Exits with status 1 when any scenario's p95 latency regressed by more than
+``--threshold`` percent or its median query count went up.
+"""
+import argparse
+import json
+import sys
+
+
+def _change(before, after):
+    if not before:
+        return float('inf') if after else 0.0
+    return (after - before) / before * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.compare')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=10.0, help='allowed p95 regression in percent')
+    args = parser.parse_args(argv)
+
+    with open(args.before) as fh:
+        before = json.load(fh)['scenarios']
+    with open(args.after) as fh:
+        after = json.load(fh)['scenarios']
+
+    regressed = []
+    print(f'{"scenario":32} {"p50 before":>11} {"p50 after":>10} {"p95 before":>11} {"p95 after":>10} '
+          f'{"change":>8} {"queries":>9}')
+    for name in sorted(set(before) & set(after)):
+        old, new = before[name], after[name]
+        change = _change(old['ms']['p95'], new['ms']['p95'])
+        queries = f'{old["queries"]["median"]}->{new["queries"]["median"]}'
+        print(f'{name:32} {old["ms"]["p50"]:11.2f} {new["ms"]["p50"]:10.2f} {old["ms"]["p95"]:11.2f} '
+              f'{new["ms"]["p95"]:10.2f} {change:+7.1f}% {queries:>9}')
+        if change > args.threshold or new['queries']['median'] > old['queries']['median']:
+            regressed.append(name)
+
+    for name in sorted(set(before) ^ set(after)):
+        print(f'{name:32} only in {"before" if name in before else "after"}')
+
+    if regressed:
+        print(f'Regressed: {", ".join(regressed)}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
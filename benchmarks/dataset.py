@@ -0,0 +1,157 @@
+"""Synthetic dataset generator built on the application models.
+
+Rows are written with Core bulk inserts in chunks, so the session listeners
+that maintain derived tables do not fire; :func:`seed` rebuilds those
+(rollups, schedule, search index) once at the end.
+"""
+from app import db
+from app.models import (User, Facility, Area, InspectionTemplate, ChecklistItem, Inspection,
+                        InspectionResult, Issue)
+from app.services.rollups import rebuild_rollups
+from app.services.schedule import rebuild_schedule
+from app.services.search import rebuild_index
+from sqlalchemy import insert, text
+from werkzeug.security import generate_password_hash
+from datetime import datetime, timedelta
+import random
+import time
+
+# facilities, areas per facility, templates, items per template, inspections
+SCALES = {
+    'tiny': dict(facilities=20, areas=5, templates=5, items=20, inspections=1000),
+    'small': dict(facilities=200, areas=10, templates=20, items=25, inspections=20000),
+    'medium': dict(facilities=1000, areas=15, templates=40, items=30, inspections=100000),
+    'large': dict(facilities=3000, areas=15, templates=60, items=30, inspections=400000),
+}
+
+PASSWORD = 'benchmark'
+CHUNK = 10000
+
+AREA_TYPES = ('restroom', 'office', 'lobby', 'kitchen', 'hallway', 'stairwell', 'conference')
+CATEGORIES = ('Floors', 'Restrooms', 'Surfaces', 'Trash', 'Supplies', 'Windows')
+PHRASES = ('soap dispenser', 'paper towel holder', 'mirror', 'floor drain', 'trash can liner',
+           'door handle', 'baseboard', 'light switch', 'sink basin', 'toilet partition')
+CONDITIONS = ('broken', 'empty', 'streaked', 'dusty', 'stained', 'missing', 'sticky')
+
+
+def _insert(connection, table, rows):
+    for start in range(0, len(rows), CHUNK):
+        connection.execute(insert(table), rows[start:start + CHUNK])
+
+
+def _users(connection, inspector_count):
+    password_hash = generate_password_hash(PASSWORD)
+    now = datetime.utcnow()
+    rows = [dict(username=role, email=f'{role}@bench.local', role=role,
+                 password_hash=password_hash, created_at=now)
+            for role in ('admin', 'supervisor', 'inspector')]
+    rows += [dict(username=f'inspector{i}', email=f'inspector{i}@bench.local', role='inspector',
+                  password_hash=password_hash, created_at=now - timedelta(minutes=i))
+             for i in range(1, inspector_count)]
+    _insert(connection, User.__table__, rows)
+    return [row.id for row in connection.execute(
+        text("SELECT id FROM users WHERE role = 'inspector' ORDER BY id"))]
+
+
+def seed(scale='small', rng_seed=42, log=print):
+    """Drop and recreate the schema, then fill it at ``scale``.
+
+    Returns a dict of row counts per table.
+    """
+    params = SCALES[scale]
+    rng = random.Random(rng_seed)
+    started = time.perf_counter()
+
+    db.drop_all()
+    db.create_all()
+
+    connection = db.session.connection()
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql('PRAGMA synchronous = OFF')
+
+    inspector_ids = _users(connection, max(3, params['facilities'] // 10))
+
+    _insert(connection, Facility.__table__, [
+        dict(id=f, name=f'Facility {f:05d}', address=f'{f} Main Street', contact_person=f'Manager {f}',
+             active=rng.random() > 0.05)
+        for f in range(1, params['facilities'] + 1)])
+
+    areas = []
+    for f in range(1, params['facilities'] + 1):
+        for a in range(params['areas']):
+            areas.append(dict(id=len(areas) + 1, facility_id=f, name=f'{rng.choice(AREA_TYPES).title()} {a + 1}',
+                              area_type=rng.choice(AREA_TYPES)))
+    _insert(connection, Area.__table__, areas)
+
+    templates, items = [], []
+    for t in range(1, params['templates'] + 1):
+        templates.append(dict(id=t, name=f'Template {t:03d}', description=f'Standard checklist {t}',
+                              frequency=rng.choice(('daily', 'weekly', 'monthly', 'quarterly')),
+                              created_by=1, created_at=datetime.utcnow(), version=1))
+        for i in range(params['items']):
+            items.append(dict(id=len(items) + 1, template_id=t, category=rng.choice(CATEGORIES),
+                              item_description=f'Check {rng.choice(PHRASES)} ({i + 1})',
+                              scoring_type=rng.choice(('pass_fail', 'rating_5', 'rating_10')),
+                              weight=rng.choice((0.5, 1, 1, 1.5)), requires_photo=False, display_order=i))
+    _insert(connection, InspectionTemplate.__table__, templates)
+    _insert(connection, ChecklistItem.__table__, items)
+    log(f'Seeded {len(areas)} areas, {len(templates)} templates, {len(items)} checklist items')
+
+    items_by_template = {}
+    for item in items:
+        items_by_template.setdefault(item['template_id'], []).append(item)
+
+    now = datetime.utcnow()
+    result_count = issue_count = 0
+    inspection_id = 0
+    while inspection_id < params['inspections']:
+        inspections, results, issues = [], [], []
+        for _ in range(min(CHUNK // 4, params['inspections'] - inspection_id)):
+            inspection_id += 1
+            area = areas[rng.randrange(len(areas))]
+            template_id = rng.randint(1, params['templates'])
+            when = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+            status = rng.choices(('completed', 'flagged', 'in_progress'), (90, 5, 5))[0]
+            inspections.append(dict(
+                id=inspection_id, template_id=template_id, facility_id=area['facility_id'], area_id=area['id'],
+                inspector_id=rng.choice(inspector_ids), inspection_date=when, status=status,
+                overall_score=round(rng.uniform(55, 100), 2) if status != 'in_progress' else None,
+                completed_at=when + timedelta(minutes=30) if status != 'in_progress' else None, updated_at=when))
+            for item in items_by_template[template_id]:
+                if item['scoring_type'] == 'pass_fail':
+                    results.append(dict(inspection_id=inspection_id, checklist_item_id=item['id'],
+                                        passed=rng.random() > 0.1, score=None))
+                else:
+                    top = 5 if item['scoring_type'] == 'rating_5' else 10
+                    results.append(dict(inspection_id=inspection_id, checklist_item_id=item['id'],
+                                        passed=None, score=rng.randint(top // 2, top)))
+            if rng.random() < 0.05:
+                issues.append(dict(inspection_id=inspection_id, area_id=area['id'],
+                                   severity=rng.choice(('low', 'medium', 'high', 'critical')),
+                                   description=f'{rng.choice(PHRASES).capitalize()} {rng.choice(CONDITIONS)}',
+                                   status=rng.choice(('open', 'in_progress', 'resolved')), reported_at=when))
+        _insert(connection, Inspection.__table__, inspections)
+        _insert(connection, InspectionResult.__table__, results)
+        if issues:
+            _insert(connection, Issue.__table__, issues)
+        result_count += len(results)
+        issue_count += len(issues)
+        db.session.commit()
+        connection = db.session.connection()
+        log(f'  {inspection_id} inspections, {result_count} results')
+
+    rebuild_rollups()
+    rebuild_schedule()
+    rebuild_index()
+    log(f'Seeded {scale} dataset in {time.perf_counter() - started:.1f}s')
+
+    return {
+        'users': len(inspector_ids) + 2,
+        'facilities': params['facilities'],
+        'areas': len(areas),
+        'templates': len(templates),
+        'checklist_items': len(items),
+        'inspections': inspection_id,
+        'inspection_results': result_count,
+        'issues': issue_count,
+    }
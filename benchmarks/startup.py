@@ -0,0 +1,89 @@
+"""Measure cold start-up: importing ``app`` and running ``create_app``.
+
+Each run is a fresh interpreter, so the numbers match what a newly forked
+gunicorn worker or a ``flask`` CLI invocation pays::
+
+    python -m benchmarks.startup --runs 20 --output startup.json
+
+The report also lists which heavy optional modules were imported, since
+anything in ``HEAVY_MODULES`` should only load on first use.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+HEAVY_MODULES = ('numpy', 'reportlab', 'PIL', 'alembic', 'flask_migrate')
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app(sys.argv[1])
+created = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'factory_ms': (created - imported) * 1000,
+    'modules': len(sys.modules),
+    'heavy': [name for name in sys.argv[2:] if name in sys.modules],
+}))
+"""
+
+
+def _run_once(config_name, env):
+    output = subprocess.run([sys.executable, '-c', PROBE, config_name, *HEAVY_MODULES],
+                            capture_output=True, text=True, check=True, env=env,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.startup')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--config', default='production', help='config name passed to create_app')
+    parser.add_argument('--output', default='startup-results.json')
+    args = parser.parse_args(argv)
+
+    import numpy as np
+
+    env = dict(os.environ)
+    # Nothing is read from the database at start-up, any URL will do
+    env.setdefault('DATABASE_URL', 'sqlite://')
+    runs = [_run_once(args.config, env) for _ in range(args.runs)]
+
+    summary = {}
+    for metric in ('import_ms', 'factory_ms'):
+        values = np.array([run[metric] for run in runs])
+        summary[metric] = {key: round(float(value), 3) for key, value in
+                           zip(('p50', 'p90', 'p95', 'p99'), np.percentile(values, (50, 90, 95, 99)))}
+        summary[metric]['min'] = round(float(values.min()), 3)
+    totals = np.array([run['import_ms'] + run['factory_ms'] for run in runs])
+    summary['total_ms'] = {'p50': round(float(np.percentile(totals, 50)), 3),
+                           'p95': round(float(np.percentile(totals, 95)), 3)}
+
+    report = {
+        'meta': {
+            'created_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'config': args.config,
+            'runs': args.runs,
+        },
+        'startup': summary,
+        'modules_loaded': runs[-1]['modules'],
+        'heavy_modules_loaded': runs[-1]['heavy'],
+    }
+    with open(args.output, 'w') as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+    print(f'import p50 {summary["import_ms"]["p50"]:.1f} ms, create_app p50 {summary["factory_ms"]["p50"]:.1f} ms, '
+          f'{report["modules_loaded"]} modules, heavy: {", ".join(report["heavy_modules_loaded"]) or "none"}',
+          file=sys.stderr)
+    print(f'Wrote {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
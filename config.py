@@ -13,34 +13,142 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
 
+    # Connection pool, per worker process: keep workers * (size + overflow)
+    # below MySQL's max_connections and the recycle time below wait_timeout
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 10)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 10)  # seconds to wait for a connection
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 280)  # seconds
+    DB_POOL_PRE_PING = True
+    DB_CONNECT_TIMEOUT = 10
+    DB_READ_TIMEOUT = int(os.environ.get('DB_READ_TIMEOUT') or 0) or None
+    DB_POOL_SLOW_CHECKOUT_MS = 100
+    DB_POOL_WINDOW = 1000  # checkout waits kept for the admin percentiles
+
+    # Optional read replica for views marked with @replica_reads
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    REPLICA_MAX_LAG_SECONDS = 5
+    REPLICA_LAG_CHECK_SECONDS = 5
+    REPLICA_STICKY_SECONDS = 5  # reads stay on the primary this long after a write
+
     # Upload configuration
     UPLOAD_FOLDER = os.path.join(basedir, 'app/static/uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
+    # Photo pipeline: derivatives (max side in px) are rendered in a background pool
+    PHOTO_SIZES = {'thumb': 320, 'medium': 1280}
+    PHOTO_WORKERS = int(os.environ.get('PHOTO_WORKERS') or 2)
+    PHOTO_EXECUTOR = os.environ.get('PHOTO_EXECUTOR') or 'thread'  # or 'process'
+    PHOTO_CHUNK_SIZE = 64 * 1024
+    PHOTO_WAIT_SECONDS = 5  # a request waits this long for a missing derivative
+
+    # PDF reports are rendered in a worker pool and cached on disk
+    REPORT_CACHE_FOLDER = os.path.join(basedir, 'instance/report_cache')
+    REPORT_EXECUTOR = os.environ.get('REPORT_EXECUTOR') or 'process'  # or 'thread'
+    REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS') or 2)
+    REPORT_WAIT_SECONDS = 3
+    REPORT_RETRY_AFTER = 2
+    REPORT_CACHE_MAX_AGE = 30 * 24 * 3600  # seconds a cached PDF or bundle may go unused
+
+    # Request profiling: per-endpoint timings at /admin/profiling
+    PROFILING_ENABLED = os.environ.get('PROFILING', '').lower() in ('1', 'true', 'yes')
+    PROFILING_SLOW_REQUEST_MS = int(os.environ.get('PROFILING_SLOW_REQUEST_MS') or 500)
+    PROFILING_SLOW_QUERY_MS = int(os.environ.get('PROFILING_SLOW_QUERY_MS') or 100)
+    PROFILING_WINDOW = 1000  # samples kept per endpoint
+
+    # Register Flask-Migrate even outside the flask CLI (it is always loaded there)
+    LOAD_MIGRATIONS = False
+
+    # Pagination
+    PER_PAGE = 50
+    MAX_PER_PAGE = 200
+
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
     SESSION_COOKIE_SECURE = False  # Change to True on production
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
 
+    # User loader cache; it only runs with USER_CACHE_BACKEND set to
+    # file:///path or sqlite:///path, which shares invalidations between workers
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL') or 300)
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE') or 1024)
+    USER_CACHE_BACKEND = os.environ.get('USER_CACHE_BACKEND')
+
+    # Conditional GETs: change ETAG_SALT (e.g. to the release) so every ETag
+    # changes when templates do
+    ETAG_SALT = os.environ.get('ETAG_SALT') or ''
+
+    # Compiled checklist cache (entries are keyed by template id + version)
+    TEMPLATE_CACHE_SIZE = 256
+
+    # Rendered template fragments ({% cache %} blocks), bounded by size
+    FRAGMENT_CACHE_ENABLED = True
+    FRAGMENT_CACHE_MAX_BYTES = int(os.environ.get('FRAGMENT_CACHE_MAX_BYTES') or 16 * 1024 * 1024)
+
+    # Device sync limits
+    SYNC_MAX_CHANGES = 5000
+    SYNC_MAX_BATCH = 100
+    SYNC_SETTLE_SECONDS = 10  # longest write transaction; delta tokens stay behind younger changes
+
     # Mail configuration (configure later)
     MAIL_SERVER = os.environ.get('MAIL_SERVER')
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ['true', 'on', '1']
     MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER') or 'noreply@janitorial-qc.local'
+
+    # Score trend API
+    TRENDS_DEFAULT_POINTS = 120
+    TRENDS_MAX_POINTS = 1000
+    TRENDS_CACHE_TTL = 300  # seconds
+    TRENDS_CACHE_SIZE = 256
+
+    # Search falls back to LIKE scans (ranked in Python) without a text index
+    SEARCH_FALLBACK_LIMIT = 1000
+
+    # Outbox delivery (flask outbox worker)
+    MAIL_BATCH_SIZE = 50
+    MAIL_RATE_LIMIT = int(os.environ.get('MAIL_RATE_LIMIT') or 30)  # messages per minute
+    MAIL_DIGEST_WINDOW = 60  # seconds alerts wait so bursts coalesce
+    MAIL_MAX_ATTEMPTS = 6
+    MAIL_RETRY_BASE = 30
+    MAIL_RETRY_MAX = 3600
+    MAIL_CLAIM_LEASE = 300
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 2)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 3)
 
 class ProductionConfig(Config):
     DEBUG = False
     SESSION_COOKIE_SECURE = True
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+
+class BenchmarkConfig(Config):
+    # Used by ``python -m benchmarks``; points at a throwaway database
+    SQLALCHEMY_DATABASE_URI = os.environ.get('BENCHMARK_DATABASE_URL') or \
+        'sqlite:///' + os.path.join(basedir, 'instance/benchmark.db')
+    WTF_CSRF_ENABLED = False
+    MAIL_SUPPRESS_SEND = True
+
+class TestingConfig(Config):
+    # Used by the pytest suite under tests/
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL') or 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    MAIL_SUPPRESS_SEND = True
 
 config = {
     'development': DevelopmentConfig,
     'production': ProductionConfig,
+    'benchmark': BenchmarkConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
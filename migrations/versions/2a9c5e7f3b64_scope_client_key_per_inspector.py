@@ -0,0 +1,28 @@
+"""scope inspection client key per inspector
+
+Revision ID: 2a9c5e7f3b64
+Revises: d41f6a2b8e07
+Create Date: 2026-10-18 16:20:41.318207
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2a9c5e7f3b64'
+down_revision = 'd41f6a2b8e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_inspections_client_key', type_='unique')
+        batch_op.create_unique_constraint('uq_inspections_inspector_client_key', ['inspector_id', 'client_key'])
+
+
+def downgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_inspections_inspector_client_key', type_='unique')
+        batch_op.create_unique_constraint('uq_inspections_client_key', ['client_key'])
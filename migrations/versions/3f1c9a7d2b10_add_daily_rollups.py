@@ -0,0 +1,44 @@
+"""add daily rollups
+
+Revision ID: 3f1c9a7d2b10
+Revises: 
+Create Date: 2026-10-18 09:12:44.118302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('facility_id', sa.Integer(), nullable=False),
+    sa.Column('area_id', sa.Integer(), nullable=False),
+    sa.Column('inspector_id', sa.Integer(), nullable=False),
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('inspection_count', sa.Integer(), nullable=False),
+    sa.Column('completed_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('score_count', sa.Integer(), nullable=False),
+    sa.Column('open_issue_count', sa.Integer(), nullable=False),
+    sa.Column('resolved_issue_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'facility_id', 'area_id', 'inspector_id', 'template_id', name='uq_daily_rollups_key')
+    )
+    with op.batch_alter_table('daily_rollups', schema=None) as batch_op:
+        batch_op.create_index('ix_daily_rollups_inspector_day', ['inspector_id', 'day'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('daily_rollups', schema=None) as batch_op:
+        batch_op.drop_index('ix_daily_rollups_inspector_day')
+
+    op.drop_table('daily_rollups')
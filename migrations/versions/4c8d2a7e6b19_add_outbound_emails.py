@@ -0,0 +1,48 @@
+"""add outbound email outbox
+
+Revision ID: 4c8d2a7e6b19
+Revises: 9e2a6c4d1f57
+Create Date: 2026-10-18 17:05:42.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8d2a7e6b19'
+down_revision = '9e2a6c4d1f57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbound_emails',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recipient', sa.String(length=255), nullable=False),
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('issue_id', sa.Integer(), nullable=True),
+    sa.Column('status', sa.Enum('pending', 'sent', 'failed'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('claim_token', sa.String(length=32), nullable=True),
+    sa.Column('locked_until', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['issue_id'], ['issues.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('outbound_emails', schema=None) as batch_op:
+        batch_op.create_index('ix_outbound_emails_due', ['status', 'next_attempt_at'], unique=False)
+        batch_op.create_index('ix_outbound_emails_claim', ['claim_token'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('outbound_emails', schema=None) as batch_op:
+        batch_op.drop_index('ix_outbound_emails_claim')
+        batch_op.drop_index('ix_outbound_emails_due')
+
+    op.drop_table('outbound_emails')
@@ -0,0 +1,26 @@
+"""add template version
+
+Revision ID: 5d93b1e7c2a6
+Revises: c27b5e90a4f8
+Create Date: 2026-10-18 12:40:51.306128
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d93b1e7c2a6'
+down_revision = 'c27b5e90a4f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inspection_templates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('inspection_templates', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,26 @@
+"""drop users created_at index
+
+Revision ID: 6f0b8d3a1c52
+Revises: 2a9c5e7f3b64
+Create Date: 2026-10-18 19:02:17.540183
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6f0b8d3a1c52'
+down_revision = '2a9c5e7f3b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_created_at'))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_created_at'), ['created_at'], unique=False)
@@ -0,0 +1,44 @@
+"""add inspection schedules
+
+Revision ID: 7b3e9f0c5a21
+Revises: 4c8d2a7e6b19
+Create Date: 2026-10-18 17:48:20.503917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b3e9f0c5a21'
+down_revision = '4c8d2a7e6b19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('inspection_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('facility_id', sa.Integer(), nullable=False),
+    sa.Column('area_id', sa.Integer(), nullable=False),
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('last_inspection_id', sa.Integer(), nullable=False),
+    sa.Column('last_inspector_id', sa.Integer(), nullable=False),
+    sa.Column('last_completed_at', sa.DateTime(), nullable=False),
+    sa.Column('next_due_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('facility_id', 'area_id', 'template_id', name='uq_inspection_schedules_key')
+    )
+    with op.batch_alter_table('inspection_schedules', schema=None) as batch_op:
+        batch_op.create_index('ix_inspection_schedules_due', ['next_due_at'], unique=False)
+        batch_op.create_index('ix_inspection_schedules_inspector_due', ['last_inspector_id', 'next_due_at'], unique=False)
+
+    # Populate from existing history with: flask schedule rebuild
+
+
+def downgrade():
+    with op.batch_alter_table('inspection_schedules', schema=None) as batch_op:
+        batch_op.drop_index('ix_inspection_schedules_inspector_due')
+        batch_op.drop_index('ix_inspection_schedules_due')
+
+    op.drop_table('inspection_schedules')
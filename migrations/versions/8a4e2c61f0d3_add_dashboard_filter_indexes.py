@@ -0,0 +1,38 @@
+"""add dashboard filter indexes
+
+Revision ID: 8a4e2c61f0d3
+Revises: 3f1c9a7d2b10
+Create Date: 2026-10-18 10:02:17.550913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e2c61f0d3'
+down_revision = '3f1c9a7d2b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_inspections_inspection_date'), ['inspection_date'], unique=False)
+        batch_op.create_index('ix_inspections_inspector_date', ['inspector_id', 'inspection_date'], unique=False)
+        batch_op.create_index('ix_inspections_status_date', ['status', 'inspection_date'], unique=False)
+
+    with op.batch_alter_table('issues', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_issues_inspection_id'), ['inspection_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_issues_status'), ['status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('issues', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_issues_status'))
+        batch_op.drop_index(batch_op.f('ix_issues_inspection_id'))
+
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.drop_index('ix_inspections_status_date')
+        batch_op.drop_index('ix_inspections_inspector_date')
+        batch_op.drop_index(batch_op.f('ix_inspections_inspection_date'))
@@ -0,0 +1,26 @@
+"""add inspection updated_at
+
+Revision ID: 9e2a6c4d1f57
+Revises: 1b7d4f2e9c38
+Create Date: 2026-10-18 16:31:09.845532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e2a6c4d1f57'
+down_revision = '1b7d4f2e9c38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
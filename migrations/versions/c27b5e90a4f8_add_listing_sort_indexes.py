@@ -0,0 +1,50 @@
+"""add listing sort indexes
+
+Revision ID: c27b5e90a4f8
+Revises: 8a4e2c61f0d3
+Create Date: 2026-10-18 11:24:03.902771
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c27b5e90a4f8'
+down_revision = '8a4e2c61f0d3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('facilities', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_facilities_name'), ['name'], unique=False)
+
+    with op.batch_alter_table('areas', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_areas_facility_id'), ['facility_id'], unique=False)
+
+    with op.batch_alter_table('inspection_templates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_inspection_templates_name'), ['name'], unique=False)
+
+    with op.batch_alter_table('checklist_items', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_checklist_items_template_id'), ['template_id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_created_at'), ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_created_at'))
+
+    with op.batch_alter_table('checklist_items', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_checklist_items_template_id'))
+
+    with op.batch_alter_table('inspection_templates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_inspection_templates_name'))
+
+    with op.batch_alter_table('areas', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_areas_facility_id'))
+
+    with op.batch_alter_table('facilities', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_facilities_name'))
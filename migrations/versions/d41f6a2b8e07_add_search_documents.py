@@ -0,0 +1,45 @@
+"""add search documents
+
+Revision ID: d41f6a2b8e07
+Revises: 7b3e9f0c5a21
+Create Date: 2026-10-18 18:36:54.271160
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41f6a2b8e07'
+down_revision = '7b3e9f0c5a21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('search_documents',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('entity_type', sa.String(length=30), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('parent_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('body', sa.Text(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('entity_type', 'entity_id', name='uq_search_documents_entity')
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect in ('mysql', 'mariadb'):
+        op.execute('CREATE FULLTEXT INDEX ix_search_documents_fulltext ON search_documents (title, body)')
+    elif dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE search_fts USING fts5(title, body, tokenize='porter unicode61')")
+
+    # Populate from existing rows with: flask search rebuild
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS search_fts')
+
+    op.drop_table('search_documents')
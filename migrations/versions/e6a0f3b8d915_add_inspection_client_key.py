@@ -0,0 +1,28 @@
+"""add inspection client key
+
+Revision ID: e6a0f3b8d915
+Revises: 5d93b1e7c2a6
+Create Date: 2026-10-18 13:55:12.674420
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6a0f3b8d915'
+down_revision = '5d93b1e7c2a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('client_key', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_inspections_client_key', ['client_key'])
+
+
+def downgrade():
+    with op.batch_alter_table('inspections', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_inspections_client_key', type_='unique')
+        batch_op.drop_column('client_key')
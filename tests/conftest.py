@@ -0,0 +1,121 @@
+import os
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from flask.testing import FlaskClient
+from app import create_app, db
+from sqlalchemy import insert, update
+from app.models import User, Facility, Area, InspectionTemplate, ChecklistItem, Inspection, ChangeLog
+from app.utils.query_counter import count_queries
+
+
+class AppContextClient(FlaskClient):
+    """Runs every request in a fresh app context (own ``g`` and session), as a server would."""
+
+    def open(self, *args, **kwargs):
+        with self.application.app_context():
+            return super().open(*args, **kwargs)
+
+
+@pytest.fixture
+def app_config():
+    """Extra config for the ``app`` fixture; override it in a test module."""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, app_config):
+    app = create_app('testing', {
+        'SQLALCHEMY_DATABASE_URI': os.environ.get('TEST_DATABASE_URL') or f'sqlite:///{tmp_path / "test.db"}',
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'REPORT_CACHE_FOLDER': str(tmp_path / 'report_cache'),
+        'USER_CACHE_BACKEND': f'sqlite://{tmp_path / "user_cache.db"}',
+        **app_config,
+    })
+    app.test_client_class = AppContextClient
+    with app.app_context():
+        # Only the primary gets a schema; a replica bind is a copy of it
+        db.create_all(bind_key=None)
+        yield app
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def query_counter(app):
+    """Record the SELECTs run inside a block::
+
+        with query_counter() as statements:
+            client.get('/facilities/')
+        assert len(statements) <= 3
+    """
+    def counter(select_only=True):
+        return count_queries(db.engine, select_only=select_only)
+    return counter
+
+
+def login(client, user):
+    """Sign ``client`` in as ``user`` without going through the login form."""
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+        session['_fresh'] = True
+    return client
+
+
+def add_inspections(facility, area, template, inspector, count, status='completed', days_ago=0):
+    inspections = [
+        Inspection(template_id=template.id, facility_id=facility.id, area_id=area.id,
+                   inspector_id=inspector.id, status=status, overall_score=80,
+                   inspection_date=datetime.utcnow() - timedelta(days=days_ago, minutes=i))
+        for i in range(count)
+    ]
+    db.session.add_all(inspections)
+    db.session.commit()
+    return inspections
+
+
+def log_change(entity_id, entity_type='facility', age=60, **values):
+    """Insert a change log row ``age`` seconds old; pass ``id`` to fake allocation order."""
+    db.session.execute(insert(ChangeLog.__table__).values(
+        entity_type=entity_type, entity_id=entity_id, operation='upsert',
+        changed_at=datetime.utcnow() - timedelta(seconds=age), **values))
+
+
+def settle_change_log():
+    """Age every change log row past ``SYNC_SETTLE_SECONDS``."""
+    db.session.execute(update(ChangeLog.__table__).values(changed_at=datetime.utcnow() - timedelta(hours=1)))
+    db.session.commit()
+
+
+@pytest.fixture
+def seed(app):
+    """Three users, one facility/area and a five-item daily template."""
+    users = {}
+    for role in ('admin', 'supervisor', 'inspector'):
+        user = User(username=role, email=f'{role}@example.com', role=role)
+        user.set_password('password')
+        db.session.add(user)
+        users[role] = user
+    db.session.commit()
+
+    facility = Facility(name='Main Office', active=True)
+    db.session.add(facility)
+    db.session.commit()
+    area = Area(name='Lobby', facility_id=facility.id)
+    template = InspectionTemplate(name='Daily Clean', frequency='daily', created_by=users['admin'].id)
+    db.session.add_all([area, template])
+    db.session.commit()
+
+    items = [ChecklistItem(template_id=template.id, category=f'Category {i % 2}', item_description=f'Item {i}',
+                           scoring_type=('pass_fail', 'rating_5', 'rating_10')[i % 3], weight=1,
+                           display_order=i + 1)
+             for i in range(5)]
+    db.session.add_all(items)
+    db.session.commit()
+
+    return SimpleNamespace(users=users, facility=facility, area=area, template=template, items=items)
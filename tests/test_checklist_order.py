@@ -0,0 +1,59 @@
+from app import db
+from app.models import ChecklistItem
+from app.services import checklist_order
+from app.services.template_cache import compile_template
+from conftest import login
+
+
+def _orders(template):
+    return [(item.id, item.display_order) for item in compile_template(template.id, template.version).items]
+
+
+def test_move_rewrites_only_the_range_and_keeps_numbering(seed):
+    db.session.delete(seed.items[1])  # leaves a gap: 1, 3, 4, 5
+    db.session.commit()
+    first, third, fourth, fifth = [item.id for item in (seed.items[0], *seed.items[2:])]
+
+    # Drag the last item onto the second row
+    updated = checklist_order.move_item(seed.template.id, fifth, 1)
+    db.session.commit()
+
+    assert updated == 3
+    assert _orders(seed.template) == [(first, 1), (fifth, 3), (third, 4), (fourth, 5)]
+
+
+def test_move_follows_the_editor_order_on_ties(seed):
+    # Equal display_order: the editor lists these by category
+    for item in seed.items:
+        item.display_order = 1
+    db.session.commit()
+    listed = [item_id for item_id, _ in _orders(seed.template)]
+
+    checklist_order.move_item(seed.template.id, listed[0], 2)
+    db.session.commit()
+
+    expected = listed[1:3] + listed[:1] + listed[3:]
+    assert _orders(seed.template) == list(zip(expected, range(1, 6)))
+
+
+def test_reorder_rejects_a_json_list(client, seed):
+    login(client, seed.users['supervisor'])
+
+    response = client.post(f'/templates/{seed.template.id}/items/reorder', json=[seed.items[0].id])
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_reorder_moves_one_item(client, seed):
+    login(client, seed.users['supervisor'])
+    item_ids = [item.id for item in seed.items]
+
+    response = client.post(f'/templates/{seed.template.id}/items/reorder',
+                           json={'item_id': item_ids[0], 'position': 4})
+
+    assert response.status_code == 200
+    db.session.expire_all()
+    assert [item_id for item_id, _ in _orders(seed.template)] == item_ids[1:] + item_ids[:1]
+    assert sorted(ChecklistItem.query.with_entities(ChecklistItem.display_order).all()) == \
+        [(1,), (2,), (3,), (4,), (5,)]
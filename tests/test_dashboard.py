@@ -0,0 +1,50 @@
+import pytest
+from app import db
+from app.models import Issue
+from app.services.dashboard_stats import get_dashboard_stats
+from app.utils.query_counter import count_queries
+from conftest import login, add_inspections
+
+
+def _dashboard_statements(client):
+    # The first request puts the signed-in user in the user cache;
+    # measure the one after that
+    client.get('/')
+    with count_queries(db.engine, select_only=True) as statements:
+        response = client.get('/')
+    assert response.status_code == 200
+    return len(statements)
+
+
+@pytest.mark.parametrize('role', ['admin', 'supervisor', 'inspector'])
+def test_stats_are_one_select(seed, role):
+    add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 3)
+
+    user = seed.users[role]
+    user.role  # reload after the commit above, outside the count
+
+    with count_queries(db.engine) as statements:
+        stats = get_dashboard_stats(user)
+
+    assert len(statements) == 1
+    assert stats['today_inspections'] == 3
+    assert stats['total_users'] == (3 if role == 'admin' else 0)
+
+
+@pytest.mark.parametrize('role', ['admin', 'supervisor', 'inspector'])
+def test_dashboard_statement_count_does_not_grow(client, seed, role):
+    login(client, seed.users[role])
+    inspector = seed.users['inspector']
+    add_inspections(seed.facility, seed.area, seed.template, inspector, 2)
+
+    small = _dashboard_statements(client)
+
+    inspections = add_inspections(seed.facility, seed.area, seed.template, inspector, 40)
+    add_inspections(seed.facility, seed.area, seed.template, inspector, 40, days_ago=10)
+    db.session.add_all([Issue(area_id=seed.area.id, inspection_id=inspection.id, severity='low',
+                              description='Smudges') for inspection in inspections])
+    db.session.commit()
+
+    assert _dashboard_statements(client) == small
+    # The stats query and the recent inspections
+    assert small <= 2
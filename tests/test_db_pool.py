@@ -0,0 +1,49 @@
+import logging
+import pytest
+from app import db
+from app.utils.db_pool import pool_monitor
+from conftest import login
+
+
+@pytest.fixture
+def app_config():
+    # One connection and no overflow, so holding it exhausts the pool
+    return {'DB_POOL_SIZE': 1, 'DB_MAX_OVERFLOW': 0, 'DB_POOL_TIMEOUT': 1}
+
+
+def _counters():
+    return pool_monitor.status(db.engine)['counters']
+
+
+@pytest.fixture
+def supervisor_client(client, seed):
+    login(client, seed.users['supervisor'])
+    # Hand the test session's connection back so requests can have it
+    db.session.remove()
+    return client
+
+
+def test_checkouts_are_timed(supervisor_client):
+    before = _counters()['checkouts']
+
+    response = supervisor_client.get('/facilities/')
+
+    assert response.status_code == 200
+    assert response.headers['Server-Timing'].startswith('pool;dur=')
+    assert _counters()['checkouts'] > before
+
+
+def test_exhausted_pool_returns_503(supervisor_client, caplog):
+    before = _counters()['timeouts']
+
+    with caplog.at_level(logging.WARNING, logger='app.utils.db_pool'):
+        with db.engine.connect():
+            assert pool_monitor.status(db.engine)['utilization'] == 1
+            response = supervisor_client.get('/facilities/')
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert _counters()['timeouts'] == before + 1
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith('Slow connection checkout') for message in messages)
+    assert any(message.startswith('Connection pool exhausted') for message in messages)
@@ -0,0 +1,78 @@
+import csv
+import io
+import re
+import zipfile
+import pytest
+from sqlalchemy import event, insert
+from app import db
+from app.models import InspectionResult
+from app.services.exports import EXPORT_HEADER, iter_export_rows
+from conftest import add_inspections, login
+
+
+@pytest.fixture
+def exported(seed):
+    """Two inspections with two results each and one with none."""
+    inspections = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 3)
+    db.session.execute(insert(InspectionResult.__table__), [
+        {'inspection_id': inspection.id, 'checklist_item_id': item.id, 'passed': True,
+         'comments': '=HYPERLINK("http://example.com")' if item is seed.items[0] else 'Fine'}
+        for inspection in inspections[:2] for item in seed.items[:2]])
+    db.session.commit()
+    return inspections
+
+
+def _csv(client):
+    response = client.get('/reports/export.csv')
+    assert response.status_code == 200
+    return list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+
+def test_csv_has_a_row_per_result_and_per_empty_inspection(client, seed, exported):
+    login(client, seed.users['supervisor'])
+
+    rows = _csv(client)
+
+    assert rows[0] == EXPORT_HEADER
+    inspection_ids = [int(row[0]) for row in rows[1:]]
+    assert sorted(inspection_ids) == sorted([exported[0].id] * 2 + [exported[1].id] * 2 + [exported[2].id])
+
+
+def test_csv_neutralizes_formulas(client, seed, exported):
+    login(client, seed.users['supervisor'])
+
+    comments = {row[EXPORT_HEADER.index('comments')] for row in _csv(client)[1:]}
+
+    assert '\'=HYPERLINK("http://example.com")' in comments
+    assert not any(comment.startswith('=') for comment in comments)
+
+
+def test_xlsx_has_the_same_rows(client, seed, exported):
+    login(client, seed.users['supervisor'])
+
+    response = client.get('/reports/export.xlsx')
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+    assert len(re.findall('<row>', sheet)) == 1 + 5
+    # Inline strings are never evaluated, so no quote is added here
+    assert '<c t="inlineStr"><is><t xml:space="preserve">=HYPERLINK("http://example.com")</t></is></c>' in sheet
+
+
+def test_rows_are_streamed_in_batches(seed, exported):
+    options = []
+
+    @event.listens_for(db.session, 'do_orm_execute')
+    def record(state):
+        options.append(state.execution_options)
+
+    try:
+        rows = list(iter_export_rows({'facility_id': None, 'template_id': None, 'start': None, 'end': None},
+                                     batch_size=2))
+    finally:
+        event.remove(db.session, 'do_orm_execute', record)
+
+    assert len(rows) == 5
+    assert options[-1]['yield_per'] == 2
+    assert options[-1]['stream_results'] is True
@@ -0,0 +1,80 @@
+import sys
+import pytest
+from app import db
+from app.models import Area
+from app.utils.fragment_cache import fragment_cache
+
+FRAGMENT = "{% cache model, id %}{{ body }}{% endcache %}"
+
+
+@pytest.fixture
+def app_config():
+    return {'FRAGMENT_CACHE_MAX_BYTES': 3 * sys.getsizeof('x' * 100)}
+
+
+@pytest.fixture
+def render(app):
+    template = app.jinja_env.from_string(FRAGMENT)
+
+    def render(model, entity_id, body):
+        return template.render(model=model, id=entity_id, body=body)
+    return render
+
+
+def _fill(render, seed):
+    render('Facility', seed.facility.id, 'facility')
+    render('InspectionTemplate', seed.template.id, 'template')
+
+
+@pytest.mark.parametrize('change, dropped', [
+    (lambda seed: setattr(seed.facility, 'name', 'Head Office'), 'Facility'),
+    (lambda seed: setattr(seed.area, 'name', 'Foyer'), 'Facility'),
+    (lambda seed: db.session.add(Area(name='Kitchen', facility_id=seed.facility.id)), 'Facility'),
+    (lambda seed: setattr(seed.template, 'name', 'Nightly Clean'), 'InspectionTemplate'),
+    (lambda seed: setattr(seed.items[0], 'weight', 2), 'InspectionTemplate'),
+    (lambda seed: db.session.delete(seed.items[0]), 'InspectionTemplate'),
+], ids=['facility', 'area', 'new-area', 'template', 'item', 'deleted-item'])
+def test_commit_drops_fragments_of_the_changed_entity(seed, render, change, dropped):
+    _fill(render, seed)
+
+    change(seed)
+    db.session.commit()
+
+    kept = 'InspectionTemplate' if dropped == 'Facility' else 'Facility'
+    entity_id = {'Facility': seed.facility.id, 'InspectionTemplate': seed.template.id}
+    assert render(dropped, entity_id[dropped], 'fresh') == 'fresh'
+    assert render(kept, entity_id[kept], 'fresh') != 'fresh'
+
+
+def test_rollback_keeps_the_cached_fragment(seed, render):
+    _fill(render, seed)
+
+    seed.facility.name = 'Head Office'
+    db.session.flush()
+    db.session.rollback()
+
+    assert render('Facility', seed.facility.id, 'fresh') == 'facility'
+    # Nothing from the rolled back flush leaks into the next commit
+    seed.template.name = 'Nightly Clean'
+    db.session.commit()
+    assert render('Facility', seed.facility.id, 'fresh') == 'facility'
+
+
+def test_least_recently_used_fragments_are_evicted_over_max_bytes(render):
+    body = 'x' * 100
+    for entity_id in (1, 2, 3):
+        render('Facility', entity_id, body)
+    render('Facility', 1, 'fresh')  # a hit moves it to the end
+
+    render('Facility', 4, body)
+
+    stats = fragment_cache.stats()
+    assert stats['entries'] == 3 and stats['bytes'] <= stats['max_bytes']
+    assert render('Facility', 1, 'fresh') == body
+    assert render('Facility', 2, 'fresh') == 'fresh'
+
+
+def test_fragments_larger_than_the_cache_are_not_stored(render):
+    render('Facility', 1, 'x' * 1000)
+
+    assert fragment_cache.stats()['entries'] == 0
@@ -0,0 +1,55 @@
+import pytest
+from app import db
+from app.models import Facility
+from conftest import login, log_change, settle_change_log
+
+
+def _get(client, url, etag=None):
+    return client.get(url, headers={'If-None-Match': etag} if etag else {})
+
+
+@pytest.mark.parametrize('url', ['/api/sync/snapshot', '/api/sync/changes?since=0', '/templates/'])
+def test_not_modified_until_the_catalog_changes(client, seed, url):
+    login(client, seed.users['supervisor'])
+    first = _get(client, url)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    assert _get(client, url, etag).status_code == 304
+
+    db.session.add(Facility(name='Warehouse', active=True))
+    db.session.commit()
+    changed = _get(client, url, etag)
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+
+
+def test_a_late_commit_below_the_latest_id_changes_the_etag_once_settled(client, seed):
+    settle_change_log()
+    login(client, seed.users['supervisor'])
+    latest = _get(client, '/api/sync/snapshot').get_json()['token']
+    # id latest+2 is visible while latest+1 is still in flight
+    log_change(seed.facility.id, id=latest + 2, age=0)
+    db.session.commit()
+    etag = _get(client, '/api/sync/snapshot').headers['ETag']
+
+    log_change(seed.area.id, entity_type='area', id=latest + 1, age=0)
+    db.session.commit()
+    settle_change_log()
+
+    assert _get(client, '/api/sync/snapshot', etag).status_code == 200
+
+
+def test_etag_differs_per_user_and_role(client, app, seed):
+    etags = {}
+    for role in ('admin', 'supervisor'):
+        user_client = login(app.test_client(), seed.users[role])
+        etags[role] = _get(user_client, '/templates/').headers['ETag']
+    assert etags['admin'] != etags['supervisor']
+
+    user_client = login(app.test_client(), seed.users['supervisor'])
+    seed.users['supervisor'].role = 'admin'
+    db.session.commit()
+    promoted = _get(user_client, '/templates/', etags['supervisor'])
+    assert promoted.status_code == 200
+    assert promoted.headers['ETag'] not in etags.values()
@@ -0,0 +1,45 @@
+import pytest
+from app import db
+from app.models import Facility, Area, InspectionTemplate, ChecklistItem
+from conftest import login
+
+
+def _add_facilities(count):
+    facilities = [Facility(name=f'Site {i:03d}', active=True) for i in range(count)]
+    db.session.add_all(facilities)
+    db.session.flush()
+    db.session.add_all([Area(name=f'Area {n}', facility_id=facility.id)
+                        for facility in facilities for n in range(3)])
+    db.session.commit()
+
+
+def _add_templates(count, creator):
+    templates = [InspectionTemplate(name=f'Template {i:03d}', frequency='weekly', created_by=creator.id)
+                 for i in range(count)]
+    db.session.add_all(templates)
+    db.session.flush()
+    db.session.add_all([ChecklistItem(template_id=template.id, item_description=f'Item {n}', display_order=n)
+                        for template in templates for n in range(3)])
+    db.session.commit()
+
+
+@pytest.mark.parametrize('url, add', [
+    ('/facilities/', lambda seed, count: _add_facilities(count)),
+    ('/templates/', lambda seed, count: _add_templates(count, seed.users['admin'])),
+])
+def test_list_statement_count_does_not_grow(client, seed, query_counter, url, add):
+    login(client, seed.users['supervisor'])
+
+    def statements():
+        # The first request puts the signed-in user in the user cache
+        client.get(url)
+        with query_counter() as statements:
+            response = client.get(url)
+        assert response.status_code == 200
+        return len(statements)
+
+    add(seed, 2)
+    small = statements()
+    add(seed, 40)
+
+    assert statements() == small
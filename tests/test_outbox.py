@@ -0,0 +1,66 @@
+import socket
+import time
+import pytest
+from aiosmtpd.controller import Controller
+from app import db
+from app.services.outbox import queue_email, send_pending
+
+RATE_LIMIT = 120  # one message every half second
+
+
+class Recorder:
+    def __init__(self):
+        self.received = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received.append((time.monotonic(), envelope.rcpt_tos))
+        return '250 Message accepted for delivery'
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    recorder = Recorder()
+    controller = Controller(recorder, hostname='127.0.0.1', port=_free_port())
+    controller.start()
+    yield controller, recorder
+    controller.stop()
+
+
+@pytest.fixture
+def app_config(smtp_server):
+    controller, _ = smtp_server
+    return {
+        'MAIL_SUPPRESS_SEND': False,
+        'MAIL_SERVER': controller.hostname,
+        'MAIL_PORT': controller.port,
+        'MAIL_USE_TLS': False,
+        'MAIL_RATE_LIMIT': RATE_LIMIT,
+    }
+
+
+def test_rate_limit_spans_consecutive_batches(app, smtp_server):
+    _, recorder = smtp_server
+    for recipient in ('a@example.com', 'b@example.com'):
+        queue_email(recipient, 'Hello', 'Body')
+        db.session.commit()
+        assert send_pending() == (1, 0)
+
+    assert [rcpt for _, rcpt in recorder.received] == [['a@example.com'], ['b@example.com']]
+    (first, _), (second, _) = recorder.received
+    assert second - first >= 60.0 / RATE_LIMIT * 0.9
+
+
+def test_messages_to_one_recipient_share_a_digest(app, smtp_server):
+    _, recorder = smtp_server
+    for subject in ('First', 'Second'):
+        queue_email('a@example.com', subject, 'Body')
+    db.session.commit()
+
+    assert send_pending() == (2, 0)
+    assert [rcpt for _, rcpt in recorder.received] == [['a@example.com']]
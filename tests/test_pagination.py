@@ -0,0 +1,74 @@
+import re
+import pytest
+from html import unescape
+from sqlalchemy import update
+from app import db
+from app.models import Facility, User
+from app.utils.pagination import paginate_keyset
+from conftest import login
+
+
+def _walk(query, columns, per_page, descending=False):
+    """Follow next cursors to the end, then prev cursors back; returns both page lists."""
+    forward, page = [], paginate_keyset(query, columns, descending, cursor='', per_page=per_page)
+    forward.append(page)
+    while page.has_next:
+        page = paginate_keyset(query, columns, descending, cursor=page.next_cursor, per_page=per_page)
+        forward.append(page)
+    backward = [page]
+    while page.has_prev:
+        page = paginate_keyset(query, columns, descending, cursor=page.prev_cursor, per_page=per_page)
+        backward.append(page)
+    return forward, backward[::-1]
+
+
+def _ids(pages):
+    return [[facility.id for facility in page] for page in pages]
+
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_pages_cover_equal_sort_keys_once(app, descending):
+    # Two names, so every page boundary falls inside a run of equal keys
+    db.session.add_all([Facility(name=f'Site {i % 2}', active=True) for i in range(7)])
+    db.session.commit()
+    columns = [Facility.name, Facility.id]
+    expected = [facility.id for facility in
+                Facility.query.order_by(*[c.desc() if descending else c for c in columns])]
+
+    with app.test_request_context():
+        forward, backward = _walk(Facility.query, columns, 3, descending)
+
+    assert _ids(forward) == [expected[0:3], expected[3:6], expected[6:7]]
+    assert _ids(backward) == _ids(forward)
+    assert not forward[0].has_prev and not forward[-1].has_next
+
+
+def test_exact_multiple_of_the_page_size_has_no_empty_last_page(app):
+    db.session.add_all([Facility(name=f'Site {i}', active=True) for i in range(4)])
+    db.session.commit()
+
+    with app.test_request_context():
+        forward, _ = _walk(Facility.query, [Facility.name, Facility.id], 2)
+
+    assert [len(page) for page in forward] == [2, 2]
+
+
+def test_user_list_includes_users_without_created_at(client, seed):
+    for i in range(4):
+        user = User(username=f'legacy{i}', email=f'legacy{i}@example.com', role='inspector')
+        user.set_password('password')
+        db.session.add(user)
+    db.session.commit()
+    db.session.execute(update(User).where(User.username.like('legacy%')).values(created_at=None))
+    db.session.commit()
+    login(client, seed.users['admin'])
+
+    seen, url = [], '/auth/users?per_page=2'
+    while url:
+        page = client.get(url).get_data(as_text=True)
+        seen += re.findall(r'<td><strong>(\w+)</strong></td>', page)
+        following = re.search(r'href="(/auth/users\?[^"]+)">\s*Next', page)
+        url = unescape(following.group(1)) if following else None
+
+    assert sorted(seen) == sorted(['admin', 'supervisor', 'inspector'] + [f'legacy{i}' for i in range(4)])
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,91 @@
+import os
+import time
+import pytest
+from datetime import datetime
+from app import db
+from app.services.pdf_reports import report_renderer, report_stamps
+from conftest import add_inspections
+
+
+@pytest.fixture
+def renderer(app):
+    app.config['REPORT_EXECUTOR'] = 'thread'
+    report_renderer._last_sweep = time.time()
+    return report_renderer
+
+
+def _stamp(inspection):
+    return report_stamps([inspection.id])[inspection.id]
+
+
+@pytest.mark.parametrize('rename', [
+    lambda seed: setattr(seed.facility, 'name', 'Head Office'),
+    lambda seed: setattr(seed.area, 'name', 'Foyer'),
+    lambda seed: setattr(seed.template, 'name', 'Nightly Clean'),
+    lambda seed: setattr(seed.users['inspector'], 'username', 'renamed'),
+])
+def test_stamp_follows_names_shown_on_the_report(seed, rename):
+    inspection, other = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 2)
+    before = _stamp(inspection)
+    assert _stamp(inspection) == before
+
+    rename(seed)
+    db.session.commit()
+
+    assert _stamp(inspection) != before
+
+
+def _render(renderer, inspection):
+    path, future = renderer.ensure(inspection)
+    if future is not None:
+        future.result(timeout=30)
+    return path
+
+
+def test_new_render_replaces_the_stale_one(renderer, seed):
+    inspection = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 1)[0]
+    stale = _render(renderer, inspection)
+
+    seed.area.name = 'Foyer'
+    db.session.commit()
+    fresh = _render(renderer, inspection)
+
+    assert fresh != stale
+    assert os.path.exists(fresh) and not os.path.exists(stale)
+
+
+def _bundle(renderer, seed):
+    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    month_end = month_start.replace(year=month_start.year + month_start.month // 12,
+                                    month=month_start.month % 12 + 1)
+    for _ in range(50):
+        path, ready, total = renderer.bundle(seed.facility.id, month_start, month_end)
+        if path is not None:
+            return path
+        time.sleep(0.1)
+    raise AssertionError('bundle never became ready')
+
+
+def test_new_bundle_replaces_the_stale_one(renderer, seed):
+    add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 2)
+    stale = _bundle(renderer, seed)
+
+    seed.template.name = 'Nightly Clean'
+    db.session.commit()
+    fresh = _bundle(renderer, seed)
+
+    assert fresh != stale
+    assert os.path.exists(fresh) and not os.path.exists(stale)
+
+
+def test_sweep_removes_files_unused_for_too_long(app, renderer, seed):
+    inspections = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 2)
+    old, recent = [_render(renderer, inspection) for inspection in inspections]
+    expired = time.time() - app.config['REPORT_CACHE_MAX_AGE'] - 60
+    os.utime(old, (expired, expired))
+
+    renderer._last_sweep = 0.0
+    assert renderer.sweep() == 1
+    assert not os.path.exists(old) and os.path.exists(recent)
+    # Sweeps are rate limited
+    assert renderer.sweep() == 0
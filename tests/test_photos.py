@@ -0,0 +1,88 @@
+import io
+import os
+import pytest
+from PIL import Image
+from app import db
+from app.models import InspectionResult
+from app.services.photos import photo_pipeline, original_path, derivative_path, PhotoError
+from conftest import add_inspections, login
+
+GPS_IFD = 0x8825
+
+
+def _jpeg(color='red', size=(800, 600)):
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera Maker'
+    exif[GPS_IFD] = {1: 'N', 2: (52.0, 22.0, 0.0)}
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG', exif=exif)
+    buffer.seek(0)
+    return buffer
+
+
+def _wait_for_derivatives(app, reference):
+    for variant in app.config['PHOTO_SIZES']:
+        assert photo_pipeline.resolve(reference, variant, timeout=30) is not None
+
+
+def test_store_files_the_original_under_its_digest(app):
+    reference, duplicate = photo_pipeline.store(_jpeg())
+
+    assert not duplicate
+    assert reference.endswith('.jpg')
+    assert os.path.exists(original_path(app.config['UPLOAD_FOLDER'], reference))
+
+
+def test_identical_uploads_are_stored_once(app):
+    first, _ = photo_pipeline.store(_jpeg())
+    second, duplicate = photo_pipeline.store(_jpeg())
+    other, _ = photo_pipeline.store(_jpeg('blue'))
+
+    assert duplicate and second == first
+    assert other != first
+
+
+def test_non_images_are_rejected(app):
+    with pytest.raises(PhotoError):
+        photo_pipeline.store(io.BytesIO(b'not an image'))
+
+
+def test_derivatives_are_resized_without_metadata(app):
+    reference, _ = photo_pipeline.store(_jpeg())
+    _wait_for_derivatives(app, reference)
+
+    for variant, max_side in app.config['PHOTO_SIZES'].items():
+        with Image.open(derivative_path(app.config['UPLOAD_FOLDER'], reference, variant)) as image:
+            assert image.format == 'WEBP'
+            assert max(image.size) <= max_side
+            assert not image.getexif()
+
+
+def test_originals_are_never_served(app, client, seed):
+    login(client, seed.users['inspector'])
+    reference = client.post('/photos/upload', data={'photo': (_jpeg(), 'photo.jpg')}).get_json()['photo_path']
+    _wait_for_derivatives(app, reference)
+
+    assert client.get(f'/photos/{reference}?size=original').status_code == 404
+
+    # A missing derivative is rendered on demand, not replaced by the original
+    for variant in ('thumb', 'medium'):
+        os.remove(derivative_path(app.config['UPLOAD_FOLDER'], reference, variant))
+    response = client.get(f'/photos/{reference}?size=thumb')
+    assert response.status_code == 200
+    assert response.mimetype == 'image/webp'
+    assert not Image.open(io.BytesIO(response.data)).getexif()
+
+
+def test_inspection_list_shows_thumbnails(app, client, seed):
+    reference, _ = photo_pipeline.store(_jpeg())
+    inspection = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 1)[0]
+    db.session.add(InspectionResult(inspection_id=inspection.id, checklist_item_id=seed.items[0].id,
+                                    passed=True, photo_path=reference))
+    db.session.commit()
+    login(client, seed.users['supervisor'])
+
+    page = client.get('/inspections/').get_data(as_text=True)
+
+    assert f'/photos/{reference}?size=thumb' in page
+    assert f'/photos/{reference}?size=medium' in page
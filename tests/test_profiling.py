@@ -0,0 +1,80 @@
+import logging
+import re
+import pytest
+from app.utils.profiling import PERCENTILES, METRICS, profiler
+from conftest import login
+
+WINDOW = 3
+
+
+@pytest.fixture
+def app_config():
+    return {
+        'PROFILING_ENABLED': True,
+        'PROFILING_SLOW_QUERY_MS': 0,
+        'PROFILING_SLOW_REQUEST_MS': 60_000,
+        'PROFILING_WINDOW': WINDOW,
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_profiler():
+    # Samples are kept per process, across apps
+    profiler.reset()
+    yield
+    profiler.reset()
+
+
+def test_responses_carry_server_timing(client, seed):
+    login(client, seed.users['admin'])
+
+    response = client.get('/templates/')
+
+    timing = response.headers['Server-Timing']
+    match = re.match(r'sql;dur=[\d.]+;desc="(\d+) queries", render;dur=([\d.]+), total;dur=[\d.]+', timing)
+    assert match, timing
+    assert int(match.group(1)) > 0 and float(match.group(2)) > 0
+
+
+def test_queries_over_the_threshold_are_logged(app, client, seed, caplog):
+    login(client, seed.users['admin'])
+
+    with caplog.at_level(logging.WARNING, logger='app.utils.profiling'):
+        client.get('/templates/')
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith('Slow query')]
+    assert any(' in templates.index: ' in message and 'FROM inspection_templates' in message for message in slow)
+    assert not any(record.getMessage().startswith('Slow request') for record in caplog.records)
+
+    caplog.clear()
+    app.config['PROFILING_SLOW_QUERY_MS'] = 60_000
+    with caplog.at_level(logging.WARNING, logger='app.utils.profiling'):
+        client.get('/templates/')
+    assert not caplog.records
+
+
+def test_summary_reports_percentiles_over_the_window(app, client, seed):
+    with app.app_context():
+        for wall_ms in (1000, 10, 20, 30, 40):
+            profiler.record('reports.trends', (wall_ms, 2, 1.5, 4))
+    login(client, seed.users['admin'])
+    for _ in range(2):
+        client.get('/templates/')
+
+    payload = client.get('/admin/profiling').get_json()
+
+    assert payload['enabled'] is True and payload['window'] == WINDOW
+    trends = payload['endpoints']['reports.trends']
+    # Only the last WINDOW samples are kept, so the 1000 ms outlier is gone
+    assert trends['count'] == WINDOW
+    assert trends['wall_ms'] == {'p50': 30.0, 'p90': 38.0, 'p95': 39.0, 'p99': 39.8}
+    assert trends['sql_count'] == {f'p{p}': 2.0 for p in PERCENTILES}
+    assert set(trends) == {'count', *METRICS}
+    assert payload['endpoints']['templates.index']['count'] == 2
+
+
+def test_summary_is_admin_only(client, seed):
+    login(client, seed.users['supervisor'])
+
+    response = client.get('/admin/profiling')
+
+    assert response.status_code == 302
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import text
+from app import db
+from app.models import Issue
+from app.services.dashboard_stats import get_dashboard_stats
+from app.services.query_plans import dashboard_plan_report
+from app.utils.query_counter import count_queries
+from conftest import add_inspections
+
+
+@pytest.fixture
+def dataset(seed):
+    inspector = seed.users['inspector']
+    for days_ago in range(0, 60, 3):
+        inspections = add_inspections(seed.facility, seed.area, seed.template, inspector, 10, days_ago=days_ago)
+        db.session.add_all([Issue(area_id=seed.area.id, inspection_id=inspection.id, severity='low',
+                                  description='Streaks', status=('open', 'resolved')[inspection.id % 2])
+                            for inspection in inspections[:3]])
+    db.session.commit()
+    # Give the planner real statistics, as production has
+    db.session.execute(text('ANALYZE'))
+    return seed
+
+
+def _plan(statement, parameters):
+    rows = db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+    return ' | '.join(row[-1] for row in rows)
+
+
+def test_dashboard_queries_avoid_full_scans(dataset):
+    report = dashboard_plan_report()
+
+    assert set(report) == {'admin', 'supervisor', 'inspector'}
+    for role, plans in report.items():
+        assert plans, role
+        assert [statement for statement, scans in plans if scans] == [], role
+
+
+@pytest.mark.parametrize('role, indexes', [
+    ('inspector', ['ix_inspections_inspector_date', 'ix_issues_inspection_id']),
+    ('admin', ['ix_inspections_inspection_date', 'ix_issues_status']),
+])
+def test_dashboard_stats_use_the_dashboard_indexes(dataset, role, indexes):
+    user = dataset.users[role]
+    user.role  # reload outside the count
+    with count_queries(db.engine, select_only=True) as statements:
+        get_dashboard_stats(user)
+    plan = _plan(*statements[0])
+
+    for index in indexes:
+        assert f'INDEX {index} ' in plan, plan
+
+
+def test_harness_reports_a_missing_index(dataset):
+    db.session.execute(text('DROP INDEX ix_inspections_inspector_date'))
+    db.session.execute(text('DROP INDEX ix_inspections_status_date'))
+    db.session.execute(text('DROP INDEX ix_inspections_inspection_date'))
+
+    scans = {table for plans in dashboard_plan_report().values() for _, tables in plans for table in tables}
+    assert 'inspections' in scans
+
+
+def test_explain_command_passes(app, dataset):
+    result = app.test_cli_runner().invoke(args=['explain', 'dashboard'])
+    assert result.exit_code == 0, result.output
@@ -0,0 +1,68 @@
+import shutil
+import pytest
+from app import db
+from app.models import Facility
+from app.utils.db_routing import replica_monitor, REPLICA_BIND
+from app.utils.query_counter import count_queries
+from conftest import login
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    return {'SQLALCHEMY_BINDS': {REPLICA_BIND: f'sqlite:///{tmp_path / "replica.db"}'}}
+
+
+@pytest.fixture
+def admin_client(client, seed):
+    return login(client, seed.users['admin'])
+
+
+@pytest.fixture
+def engines(app, admin_client, tmp_path):
+    """Primary and replica engines, the replica a copy of the seeded primary."""
+    primary = db.engines[None]
+    if primary.dialect.name != 'sqlite' or not primary.url.database:
+        pytest.skip('the replica is a copy of a SQLite database file')
+    db.session.remove()
+    for engine in db.engines.values():
+        engine.dispose()
+    shutil.copy(primary.url.database, tmp_path / 'replica.db')
+    replica_monitor.reset()
+    return primary, db.engines[REPLICA_BIND]
+
+
+def _statements(client, engines, method, url, **kwargs):
+    primary, replica = engines
+    with count_queries(primary, select_only=False) as on_primary, \
+            count_queries(replica, select_only=False) as on_replica:
+        response = getattr(client, method)(url, **kwargs)
+    return response, on_primary, on_replica
+
+
+def test_marked_views_read_from_the_replica(admin_client, engines):
+    response, on_primary, on_replica = _statements(admin_client, engines, 'get', '/facilities/')
+
+    assert response.status_code == 200
+    assert on_replica
+    assert not [statement for statement, _ in on_primary if 'facilities' in statement]
+
+
+def test_unmarked_views_stay_on_the_primary(admin_client, engines):
+    response, on_primary, on_replica = _statements(admin_client, engines, 'get', '/auth/users')
+
+    assert response.status_code == 200
+    assert on_primary and not on_replica
+
+
+def test_writes_go_to_the_primary_and_pin_the_next_read(admin_client, engines):
+    response, on_primary, on_replica = _statements(admin_client, engines, 'post', '/facilities/new',
+                                                   data={'name': 'Warehouse', 'active': 'y'})
+    assert response.status_code == 302
+    assert any(statement.startswith('INSERT INTO facilities') for statement, _ in on_primary)
+    assert not on_replica
+    assert Facility.query.filter_by(name='Warehouse').count() == 1
+
+    # The redirect target reads its own write from the primary
+    response, on_primary, on_replica = _statements(admin_client, engines, 'get', '/facilities/')
+    assert b'Warehouse' in response.data
+    assert not on_replica
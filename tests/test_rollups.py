@@ -0,0 +1,71 @@
+from datetime import date
+from sqlalchemy import insert, select
+from app import db
+from app.models import DailyRollup, Facility, InspectionTemplate, Issue
+from app.services.rollups import KEY_COLUMNS, COUNTER_COLUMNS, rebuild_rollups, _apply
+from conftest import add_inspections
+
+
+def _rollups():
+    table = DailyRollup.__table__
+    rows = db.session.execute(select(table).order_by(*[table.c[column] for column in KEY_COLUMNS])).all()
+    return [tuple(getattr(row, column) for column in KEY_COLUMNS + COUNTER_COLUMNS) for row in rows]
+
+
+def test_incremental_rollups_match_a_rebuild(seed):
+    inspections = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 3)
+    inspections[0].status = 'flagged'
+    inspections[1].overall_score = 55
+    db.session.delete(inspections[2])
+    db.session.add_all([
+        Issue(area_id=seed.area.id, inspection_id=inspections[0].id, severity='high', description='Spill'),
+        Issue(area_id=seed.area.id, inspection_id=inspections[1].id, severity='low', description='Dust',
+              status='resolved'),
+        Issue(area_id=seed.area.id, severity='low', description='No status', status=None),
+    ])
+    db.session.commit()
+
+    incremental = _rollups()
+    rebuild_rollups()
+    assert _rollups() == incremental
+
+
+def test_apply_adds_to_a_row_inserted_concurrently(seed):
+    key = (date.today(), seed.facility.id, seed.area.id, seed.users['inspector'].id, seed.template.id)
+    row = dict(zip(KEY_COLUMNS, key), **{column: 0 for column in COUNTER_COLUMNS})
+    # Another transaction created the row after this one found none
+    db.session.execute(insert(DailyRollup.__table__).values(**dict(row, inspection_count=1)))
+
+    _apply(db.session.connection(), {key: {'inspection_count': 1, 'completed_count': 1}})
+    db.session.commit()
+
+    stored = DailyRollup.query.one()
+    assert (stored.inspection_count, stored.completed_count) == (2, 1)
+
+
+def test_reassigning_an_owner_moves_its_issues(seed):
+    inspection = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 1)[0]
+    db.session.add_all([
+        Issue(area_id=seed.area.id, inspection_id=inspection.id, severity='high', description='Spill'),
+        Issue(area_id=seed.area.id, severity='low', description='Dust', status='resolved'),
+    ])
+    other_template = InspectionTemplate(name='Weekly Deep Clean', frequency='weekly')
+    other_facility = Facility(name='Warehouse')
+    db.session.add_all([other_template, other_facility])
+    db.session.commit()
+
+    inspection.inspector_id = seed.users['supervisor'].id
+    inspection.template_id = other_template.id
+    db.session.commit()
+    seed.area.facility_id = other_facility.id
+    db.session.commit()
+
+    # Emptied keys stay behind as zero rows, a rebuild drops them
+    incremental = [row for row in _rollups() if any(row[len(KEY_COLUMNS):])]
+    owner = (seed.users['supervisor'].id, other_template.id)
+    # The inspection keeps its own facility, its issues follow the area
+    assert {row[1:5] for row in incremental} == {
+        (seed.facility.id, seed.area.id) + owner, (other_facility.id, seed.area.id) + owner,
+        (other_facility.id, seed.area.id, 0, 0)}
+    rebuild_rollups()
+    assert _rollups() == incremental
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from sqlalchemy import insert
+from app import db
+from app.models import InspectionSchedule
+from app.services.schedule import _record, due_query, overdue_count
+from conftest import add_inspections, login
+
+
+def _completion(seed, inspection_id, completed_at):
+    return SimpleNamespace(id=inspection_id, facility_id=seed.facility.id, area_id=seed.area.id,
+                           template_id=seed.template.id, inspector_id=seed.users['inspector'].id,
+                           completed_at=completed_at, inspection_date=completed_at)
+
+
+def test_record_only_moves_the_schedule_forward(seed):
+    earlier = datetime(2026, 3, 1, 9)
+    db.session.execute(insert(InspectionSchedule.__table__).values(
+        facility_id=seed.facility.id, area_id=seed.area.id, template_id=seed.template.id,
+        last_inspection_id=1, last_inspector_id=seed.users['inspector'].id,
+        last_completed_at=earlier, next_due_at=earlier + timedelta(days=1)))
+
+    _record(db.session.connection(), _completion(seed, 2, earlier + timedelta(hours=1)), 'daily')
+    # An older completion arriving late does not move the schedule back
+    _record(db.session.connection(), _completion(seed, 3, earlier - timedelta(hours=1)), 'daily')
+    db.session.commit()
+
+    row = InspectionSchedule.query.one()
+    assert (row.last_inspection_id, row.next_due_at) == (2, datetime(2026, 3, 2, 10))
+
+
+def test_due_list_skips_inactive_facilities(client, seed):
+    add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 1, days_ago=3)
+    inspector = seed.users['inspector']
+    assert due_query(inspector).count() == 1
+    assert db.session.query(overdue_count(inspector)).scalar() == 1
+    login(client, inspector)
+    assert b'Main Office' in client.get('/inspections/due').data
+
+    seed.facility.active = False
+    db.session.commit()
+
+    assert due_query(inspector).count() == 0
+    assert db.session.query(overdue_count(inspector)).scalar() == 0
+    response = client.get('/inspections/due')
+    assert response.status_code == 200
+    assert b'Main Office' not in response.data
@@ -0,0 +1,64 @@
+from decimal import Decimal
+from sqlalchemy import insert
+from app import db
+from app.models import Inspection, InspectionResult
+from app.services.scoring import rescore_inspections, score_inspection, score_rows
+from conftest import add_inspections
+
+
+def test_items_are_weighted_by_scoring_type(seed):
+    pass_fail, rating_5, rating_10 = seed.items[:3]
+    pass_fail.weight = 2
+    db.session.commit()
+
+    scores = score_rows([
+        (1, pass_fail.id, None, True),
+        (1, rating_5.id, 3, None),
+        (1, rating_10.id, 4, None),
+        # Ratings are clamped to their scale
+        (2, rating_5.id, 9, None),
+        (2, rating_10.id, -1, None),
+    ])
+
+    # (2 * 1 + 3/5 + 4/10) / (2 + 1 + 1) and (1 + 0) / 2
+    assert scores == {1: Decimal('75.00'), 2: Decimal('50.00')}
+
+
+def test_unanswered_items_are_left_out(seed):
+    pass_fail, rating_5, rating_10 = seed.items[:3]
+
+    scores = score_rows([
+        (1, pass_fail.id, None, False),
+        (1, rating_5.id, None, None),
+        (1, rating_10.id, 10, None),
+        (2, pass_fail.id, None, None),
+        (2, rating_5.id, None, True),
+    ])
+
+    # A pass flag on a rating is not an answer
+    assert scores == {1: Decimal('50.00'), 2: None}
+
+
+def test_batch_rescore_matches_scoring_one_inspection(seed):
+    inspections = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 5)
+    inspections[3].status = 'flagged'
+    inspections[4].status = 'in_progress'
+    rows = []
+    for number, inspection in enumerate(inspections):
+        for offset, item in enumerate(seed.items):
+            if (number + offset) % 4 == 0:
+                continue  # leave some items unanswered
+            rows.append({'inspection_id': inspection.id, 'checklist_item_id': item.id,
+                         'score': (number + offset) % 6, 'passed': None if offset else number % 2 == 0})
+    db.session.execute(insert(InspectionResult.__table__), rows)
+    for inspection in inspections:
+        inspection.overall_score = 1
+    db.session.commit()
+
+    expected = {inspection.id: score_inspection(inspection) for inspection in inspections[:4]}
+    assert rescore_inspections(chunk_size=2) == 4
+
+    db.session.expire_all()
+    stored = {inspection.id: inspection.overall_score for inspection in Inspection.query.order_by(Inspection.id)}
+    assert stored == {**expected, inspections[4].id: Decimal('1.00')}
+    assert len(set(expected.values())) > 1
@@ -0,0 +1,79 @@
+import base64
+import json
+import pytest
+from app import db
+from app.models import Facility, Area, Issue
+from app.services import search as search_service
+from app.services.search import search
+from conftest import login
+
+
+def _cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(['next', *values]).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('offset', ['10', -5, 2.5, True, None, [1]])
+def test_crafted_cursor_is_rejected(client, seed, offset):
+    login(client, seed.users['inspector'])
+
+    response = client.get('/search/api', query_string={'q': 'office', 'cursor': _cursor(offset)})
+
+    assert response.status_code == 400
+
+
+@pytest.fixture(params=['fts5', 'like'])
+def indexed(request, seed, monkeypatch):
+    """The seed plus an issue, searched through FTS5 and through the LIKE fallback."""
+    monkeypatch.setattr(search_service, 'backend', lambda connection: request.param)
+    db.session.add_all([
+        Facility(name='Window Depot', address='1 Harbor Road', active=True),
+        Issue(area_id=seed.area.id, severity='high', description='Cracked window by the lobby doors'),
+    ])
+    db.session.commit()
+    return seed
+
+
+def _hits(query, **kwargs):
+    return [(result['entity_type'], result['title']) for result in search(query, **kwargs)[0]]
+
+
+def test_every_entity_type_is_indexed(indexed):
+    assert _hits('office') == [('facility', 'Main Office')]
+    assert _hits('lobby') == [('area', 'Lobby'), ('issue', 'High issue')]
+    assert _hits('daily') == [('template', 'Daily Clean')]
+    assert ('checklist_item', 'Item 3') in _hits('item')
+
+
+def test_title_matches_rank_first(indexed):
+    assert _hits('window') == [('facility', 'Window Depot'), ('issue', 'High issue')]
+    assert _hits('window', entity_types=['issue']) == [('issue', 'High issue')]
+
+
+def test_edits_and_deletes_update_the_index(indexed):
+    indexed.facility.name = 'Harbor Point'
+    area = Area(name='Loading Dock', facility_id=indexed.facility.id)
+    db.session.add(area)
+    db.session.commit()
+    assert _hits('office') == []
+    assert ('facility', 'Harbor Point') in _hits('harbor')
+    assert _hits('dock') == [('area', 'Loading Dock')]
+
+    db.session.delete(area)
+    db.session.commit()
+    assert _hits('dock') == []
+
+
+def test_cursor_pages_through_results(client, indexed):
+    login(client, indexed.users['inspector'])
+    expected = _hits('item')
+
+    seen, cursor = [], None
+    while True:
+        page = client.get('/search/api', query_string={'q': 'item', 'per_page': 2, 'cursor': cursor}).get_json()
+        seen += [(result['entity_type'], result['title']) for result in page['results']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            break
+
+    assert len(expected) == 5
+    assert seen == expected
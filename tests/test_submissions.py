@@ -0,0 +1,88 @@
+import io
+import pytest
+from PIL import Image
+from app import db
+from app.models import Inspection
+from conftest import login
+
+
+def _payload(seed, **fields):
+    payload = {
+        'template_id': seed.template.id,
+        'facility_id': seed.facility.id,
+        'area_id': seed.area.id,
+        'status': 'completed',
+        'results': [{'checklist_item_id': item.id, 'passed': True, 'score': 1} for item in seed.items[:1]],
+    }
+    payload.update(fields)
+    return payload
+
+
+def test_replay_returns_the_original_inspection(client, seed):
+    login(client, seed.users['inspector'])
+
+    first = client.post('/inspections/api/submit', json=_payload(seed, client_key='device-1'))
+    replay = client.post('/inspections/api/submit', json=_payload(seed, client_key='device-1'))
+
+    assert first.status_code == 201
+    assert replay.status_code == 200
+    assert replay.get_json()['replayed'] is True
+    assert replay.get_json()['inspection_id'] == first.get_json()['inspection_id']
+
+
+def test_client_keys_are_scoped_per_inspector(app, seed):
+    payload = _payload(seed, client_key='shared-key')
+
+    responses = []
+    for role in ('inspector', 'supervisor'):
+        client = login(app.test_client(), seed.users[role])
+        responses.append(client.post('/inspections/api/submit', json=payload))
+
+    assert [response.status_code for response in responses] == [201, 201]
+    assert Inspection.query.filter_by(client_key='shared-key').count() == 2
+
+
+@pytest.mark.parametrize('area_id', [[1], {'id': 1}, 'lobby'])
+def test_area_id_must_be_an_integer(client, seed, area_id):
+    login(client, seed.users['inspector'])
+
+    response = client.post('/inspections/api/submit', json=_payload(seed, area_id=area_id))
+
+    assert response.status_code == 400
+    assert 'area_id must be an integer.' in response.get_json()['errors']
+
+
+@pytest.fixture
+def photo_item(seed):
+    item = seed.items[0]
+    item.requires_photo = True
+    seed.template.bump_version()
+    db.session.commit()
+    return item
+
+
+@pytest.mark.parametrize('photo_path', ['anything', 'a' * 64 + '.jpg', 12])
+def test_photo_path_must_name_an_uploaded_photo(client, seed, photo_item, photo_path):
+    login(client, seed.users['inspector'])
+    payload = _payload(seed, results=[{'checklist_item_id': photo_item.id, 'passed': True,
+                                       'photo_path': photo_path}])
+
+    response = client.post('/inspections/api/submit', json=payload)
+
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == ['results[0].photo_path is not an uploaded photo.']
+
+
+def test_required_photo_is_accepted_once_uploaded(client, seed, photo_item):
+    login(client, seed.users['inspector'])
+    missing = _payload(seed, results=[{'checklist_item_id': photo_item.id, 'passed': True}])
+    assert client.post('/inspections/api/submit', json=missing).status_code == 400
+
+    image = io.BytesIO()
+    Image.new('RGB', (10, 10)).save(image, 'PNG')
+    image.seek(0)
+    reference = client.post('/photos/upload', data={'photo': (image, 'photo.png')}).get_json()['photo_path']
+    stored = _payload(seed, results=[{'checklist_item_id': photo_item.id, 'passed': True,
+                                      'photo_path': reference}])
+
+    assert client.post('/inspections/api/submit', json=stored).status_code == 201
@@ -0,0 +1,75 @@
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.services.sync import build_delta, build_snapshot
+from conftest import login, log_change, settle_change_log
+
+
+def test_token_stays_behind_changes_that_may_still_be_in_flight(seed):
+    settle_change_log()
+    since = build_snapshot()['token']
+    # id since+2 is committed while since+1 is still in flight
+    log_change(seed.facility.id, id=since + 2, age=0)
+    db.session.commit()
+
+    delta = build_delta(since, 100)
+    assert delta['entities']['facility']['rows'][0][0] == seed.facility.id
+    assert delta['token'] == since
+
+    log_change(seed.area.id, entity_type='area', id=since + 1, age=0)
+    db.session.commit()
+    late = build_delta(delta['token'], 100)
+    assert [row[0] for row in late['entities']['area']['rows']] == [seed.area.id]
+
+
+def test_token_advances_once_changes_settle(seed):
+    settle_change_log()
+    since = build_snapshot()['token']
+    log_change(seed.facility.id, id=since + 1)
+    db.session.commit()
+
+    assert build_delta(since, 100)['token'] == since + 1
+
+
+def test_deactivated_facility_is_deleted_with_its_areas(seed):
+    settle_change_log()
+    since = build_snapshot()['token']
+
+    seed.facility.active = False
+    db.session.commit()
+    settle_change_log()
+
+    delta = build_delta(since, 100)
+    assert delta['deleted'] == {'facility': [seed.facility.id], 'area': [seed.area.id]}
+    assert build_snapshot()['entities']['area']['rows'] == []
+
+    seed.facility.active = True
+    db.session.commit()
+    settle_change_log()
+
+    delta = build_delta(delta['token'], 100)
+    assert [row[0] for row in delta['entities']['area']['rows']] == [seed.area.id]
+    assert 'deleted' not in delta or not delta['deleted']
+
+
+def test_upload_reports_database_errors_per_entry(client, seed, monkeypatch):
+    import app.routes.sync as sync_routes
+
+    real_submit = sync_routes.submit_inspection
+
+    def flaky_submit(entry, inspector):
+        if entry['client_key'] == 'broken':
+            raise IntegrityError('INSERT', {}, Exception('constraint failed'))
+        return real_submit(entry, inspector)
+
+    monkeypatch.setattr(sync_routes, 'submit_inspection', flaky_submit)
+    login(client, seed.users['inspector'])
+    entry = {'template_id': seed.template.id, 'facility_id': seed.facility.id, 'status': 'completed',
+             'results': []}
+
+    response = client.post('/api/sync/inspections', json={'inspections': [
+        dict(entry, client_key='broken'), dict(entry, client_key='fine')]})
+
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['success'] for result in results] == [False, True]
+    assert results[0]['errors'] == ['The inspection could not be stored.']
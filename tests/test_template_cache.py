@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import select, update
+from app import db
+from app.models import ChecklistItem, InspectionTemplate
+from app.services.template_cache import compile_template, template_cache
+from conftest import login
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    # The cache is per process, and template ids repeat across test databases
+    template_cache.clear()
+    yield
+    template_cache.clear()
+
+
+def _version(template_id):
+    return db.session.execute(
+        select(InspectionTemplate.version).where(InspectionTemplate.id == template_id)).scalar()
+
+
+def _listing(compiled):
+    return [(item.id, item.item_description) for item in compiled.items]
+
+
+def _item_form(item, **changes):
+    form = {'category': item.category, 'item_description': item.item_description,
+            'scoring_type': item.scoring_type, 'weight': '1.00'}
+    form.update(changes)
+    return form
+
+
+@pytest.mark.parametrize('change', [
+    lambda client, seed: client.post(f'/templates/items/{seed.items[0].id}/edit',
+                                     data=_item_form(seed.items[0], item_description='Mop the floor')),
+    lambda client, seed: client.post(f'/templates/{seed.template.id}/items/reorder',
+                                     json={'item_id': seed.items[0].id, 'position': 4}),
+    lambda client, seed: client.post(f'/templates/items/{seed.items[0].id}/delete'),
+], ids=['edit', 'reorder', 'delete'])
+def test_item_changes_bump_the_template_version(client, seed, change):
+    login(client, seed.users['supervisor'])
+    template_id = seed.template.id
+    before = _version(template_id)
+    cached = template_cache.get(seed.template)
+
+    response = change(client, seed)
+
+    assert response.status_code in (200, 302)
+    db.session.expire_all()
+    template = db.session.get(InspectionTemplate, template_id)
+    assert template.version == before + 1
+    compiled = template_cache.get(template)
+    assert compiled.version == template.version
+    assert _listing(compiled) == _listing(compile_template(template_id, template.version))
+    assert _listing(compiled) != _listing(cached)
+
+
+def test_stale_compilation_is_not_served_after_another_process_edits(seed):
+    template = seed.template
+    assert template_cache.get(template).items[0].item_description == 'Item 0'
+
+    # Another worker edits the item; its invalidate() never reaches this cache
+    table = ChecklistItem.__table__
+    db.session.execute(update(table).where(table.c.id == seed.items[0].id)
+                       .values(item_description='Mop the floor'))
+    template.bump_version()
+    db.session.commit()
+
+    assert template_cache.get(template).items[0].item_description == 'Mop the floor'
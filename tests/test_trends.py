@@ -0,0 +1,44 @@
+from datetime import date, timedelta
+from sqlalchemy import insert
+from app import db
+from app.models import InspectionResult
+from app.services.trends import build_trend
+from conftest import add_inspections
+
+
+def _trend(category=None):
+    end = date.today() + timedelta(days=1)
+    return build_trend({'start': end - timedelta(days=7), 'end': end, 'bucket': 'day', 'points': 120,
+                        'category': category, 'filters': {}})['series']
+
+
+def test_overall_and_category_series_count_the_same_inspections(seed):
+    pass_fail = seed.items[0]
+    for status, passed in (('completed', True), ('flagged', False)):
+        inspection = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 1,
+                                     status=status)[0]
+        db.session.execute(insert(InspectionResult.__table__).values(
+            inspection_id=inspection.id, checklist_item_id=pass_fail.id, passed=passed))
+    db.session.commit()
+
+    overall = _trend()
+    category = _trend(pass_fail.category)
+
+    assert overall['count'] == category['count'] == [1]
+    assert category['score'] == [100.0]
+
+
+def test_category_count_is_of_inspections_not_results(seed):
+    inspection = add_inspections(seed.facility, seed.area, seed.template, seed.users['inspector'], 1)[0]
+    pass_fail, rating_10 = seed.items[0], seed.items[2]
+    assert pass_fail.category == rating_10.category
+    db.session.execute(insert(InspectionResult.__table__), [
+        {'inspection_id': inspection.id, 'checklist_item_id': pass_fail.id, 'passed': True, 'score': None},
+        {'inspection_id': inspection.id, 'checklist_item_id': rating_10.id, 'passed': None, 'score': 5},
+    ])
+    db.session.commit()
+
+    category = _trend(pass_fail.category)
+
+    assert category['count'] == _trend()['count'] == [1]
+    assert category['score'] == [75.0]
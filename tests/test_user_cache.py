@@ -0,0 +1,50 @@
+import pytest
+from app import db
+from app.models import User
+from app.utils.user_cache import UserCache, user_cache
+
+
+@pytest.fixture
+def workers(app, seed):
+    """The app's cache and a second one standing in for another worker."""
+    other = UserCache(app)
+    user_id = seed.users['supervisor'].id
+    for cache in (user_cache, other):
+        db.session.remove()
+        assert cache.load(User, user_id).role == 'supervisor'
+    db.session.remove()
+    return user_id, other
+
+
+def _load_fresh(cache, user_id):
+    # A new request: nothing in the session identity map
+    db.session.remove()
+    return cache.load(User, user_id)
+
+
+def test_role_change_reaches_other_workers(workers):
+    user_id, other = workers
+
+    db.session.get(User, user_id).role = 'inspector'
+    db.session.commit()
+
+    assert _load_fresh(other, user_id).role == 'inspector'
+
+
+def test_delete_reaches_other_workers(workers):
+    user_id, other = workers
+
+    db.session.delete(db.session.get(User, user_id))
+    db.session.commit()
+
+    assert _load_fresh(other, user_id) is None
+
+
+def test_cache_is_off_without_a_shared_backend(app, seed):
+    app.config['USER_CACHE_BACKEND'] = None
+    cache = UserCache(app)
+    user_id = seed.users['supervisor'].id
+
+    assert cache.ttl == 0
+    cache.load(User, user_id)
+    assert cache._get(('User', user_id)) is None